@@ -0,0 +1,166 @@
+"""
+benchmark_email_rendering.py
+
+Micro-benchmark of the rendering of the email notifications: compares the legacy json_to_html (template
+read from disk on every call, table built by string concatenation with per-cell attribute lookups) with
+the email_renderer layer (templates compiled once, rows rendered through a column plan), on synthetic
+tables of items.
+
+Usage:
+    python benchmark_email_rendering.py                # Tables of 1000 items
+    python benchmark_email_rendering.py --items 5000 --repeat 5
+"""
+
+# Standard library imports
+import os
+import argparse
+import html
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+# Local resources imports
+from email_renderer import EmailRenderer
+
+# Templates of the repository, wherever the benchmark is run from
+templates_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+content_template = "email_template_monitoring_content.html"
+# Item keys and column widths, as configured in utils
+column_widths = {"thumbnailUrl": 15, "summary": 55, "author": 5, "date": 5, "description": 30}
+keys_to_ignore = ["content", "link"]
+default_items = 1000
+default_repeat = 10
+
+# Legacy email template, with its str.replace placeholders
+legacy_template = """<!DOCTYPE html>
+<html>
+    <body style='margin: 0; padding: 0; font-family: Arial, sans-serif;'>
+        <table style='border-collapse: collapse; width: 100%;'>
+            <thead> 
+                <tr>
+                    {htmlTableHeader}
+                </tr>
+            </thead>
+            <tbody>
+                <tr>
+                    {htmlTableBody}
+                </tr>
+            </tbody>
+        </table>
+    </body>
+</html>"""
+
+
+def legacy_generate_tag_attributes(key: str, value: any, link_text: str) -> str:
+    attributes = ""
+    if key == "thumbnailUrl":
+        attributes += f" text-align: center; width: 15vw'><a href='{link_text}'><img style='max-width: 100%; height: auto;' src='{value}'></a>"
+    elif key == "summary":
+        attributes += f" text-align: left; width: 55vw'>{value}"
+    elif key == "author":
+        attributes += f" text-align: left; width: 5vw'>{value}"
+    elif key == "date":
+        attributes += f" text-align: left; width: 5vw'>{value}"
+    elif key == "description":
+        attributes += f" text-align: left; width: 30vw'>{value}"
+    else:
+        attributes += f" text-align: left; width: 10vw'>{value}"
+    return attributes
+
+def legacy_generate_header_tag_attributes(key: str, value: str) -> str:
+    attributes = ""
+    if key == "thumbnailUrl":
+        attributes += f""" width: 15vw'>{value}"""
+    elif key == "summary":
+        attributes += f""" width: 55vw'>{value}"""
+    elif key == "author":
+        attributes += f""" width: 5vw'>{value}"""
+    elif key == "date":
+        attributes += f""" width: 5vw'>{value}"""
+    elif key == "description":
+        attributes += f""" width: 30vw'>{value}"""
+    else:
+        attributes += f""" width: 10vw'>{value}"""
+    return attributes
+
+def legacy_json_to_html(json_data: List[Dict], keys_to_ignore: List[str], template_file_path: str) -> str:
+    html_table_header = ''.join(f"""
+                    <th style='padding: 0; text-align: center; border: 1px solid #ccc; background-color: #f2f2f2;\
+{legacy_generate_header_tag_attributes(key, html.escape(key))}</th>""" for key in json_data[0].keys() if key not in keys_to_ignore)
+    html_table_body = ""
+    for item in json_data:
+        html_table_body += """
+                <tr>"""
+        html_table_body += ''.join(f"""
+                    <td style='padding: 8px; border: 1px solid #ccc;\
+{legacy_generate_tag_attributes(key, value, item.get('link', [1]))}</td>""" for key, value in item.items() if key not in keys_to_ignore)
+        html_table_body += """
+                </tr>"""
+    # The legacy implementation read the template from disk on every call
+    with open(template_file_path, "r") as f:
+        template_html_file = f.read()
+    return template_html_file.\
+        replace("{htmlTableHeader}", html_table_header if html_table_header else ""). \
+            replace("{htmlTableBody}", html_table_body if html_table_body else "")
+
+def make_items(count: int) -> List[Dict]:
+    """
+    **Returns:**
+        Synthetic items shaped like the YouTube videos of the daily monitoring.
+    """
+    return [{"id": f"video{index:05d}",
+             "title": f"Video {index} - Les nouveautés de l'IA générative",
+             "author": "Channel",
+             "thumbnailUrl": f"https://i.ytimg.com/vi/video{index:05d}/hqdefault.jpg",
+             "date": "2026-10-18T08:00:00Z",
+             "link": f"https://www.youtube.com/watch?v=video{index:05d}",
+             "description": "Description of the video. " * 8,
+             "content": "Transcript of the video. " * 200,
+             "summary": "<b>Summary</b> of the video, with its key points. " * 12}
+            for index in range(count)]
+
+def time_rendering(render: Callable, repeat: int) -> float:
+    """
+    **Returns:**
+        The average duration (in milliseconds) of a rendering.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def run_benchmark(items_count: int, repeat: int) -> None:
+    """
+    Renders tables of items with both implementations, checks they produce the same email and prints their timings.
+    """
+    renderer = EmailRenderer(templates_dir = templates_dir,
+                             column_widths = column_widths,
+                             default_width = 10,
+                             image_key = "thumbnailUrl",
+                             link_key = "link")
+
+    def render_with_layer(items: List[Dict]) -> str:
+        return renderer.render(content_template,
+                               html_table_header = renderer.table_header(items, keys_to_ignore),
+                               rows = renderer.iter_rows(items, keys_to_ignore))
+
+    # A copy of the legacy template on disk, read by the legacy implementation on every call as it used to
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_template_file_path = os.path.join(tmp_dir, "benchmark_legacy_email_template.html")
+        with open(legacy_template_file_path, "w") as f:
+            f.write(legacy_template)
+        print(f"{'Items':>8} {'legacy (ms)':>12} {'layer (ms)':>12} {'speedup':>8}")
+        for count in sorted({10, 100, items_count}):
+            items = make_items(count)
+            if legacy_json_to_html(items, keys_to_ignore, legacy_template_file_path) != render_with_layer(items):
+                print(f"WARNING: the implementations render different emails for {count} items")
+            legacy_ms = time_rendering(lambda: legacy_json_to_html(items, keys_to_ignore, legacy_template_file_path), repeat)
+            layer_ms = time_rendering(lambda: render_with_layer(items), repeat)
+            print(f"{count:>8} {legacy_ms:>12.2f} {layer_ms:>12.2f} {legacy_ms / layer_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Benchmark of the rendering of the email notifications")
+    parser.add_argument("--items", type = int, default = default_items, help = "number of items of the largest table")
+    parser.add_argument("--repeat", type = int, default = default_repeat, help = "number of renderings of each table")
+    arguments = parser.parse_args()
+    run_benchmark(arguments.items, arguments.repeat)
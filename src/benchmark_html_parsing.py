@@ -0,0 +1,187 @@
+"""
+benchmark_html_parsing.py
+
+Micro-benchmark of the HTML parsing of the scrapers, on pages saved as fixtures: compares the legacy
+path (full html.parser tree, one find_all per class combination) with the html_parsing layer
+(fastest parser available, trees restricted to the relevant containers, single-pass selection), as
+run by the scraper engine of websites_specific.
+
+Usage:
+    python benchmark_html_parsing.py --save   # Download the fixture pages (listings and one article per listing)
+    python benchmark_html_parsing.py          # Run the benchmark on the saved fixtures
+"""
+
+# Standard library imports
+import os
+import argparse
+import time
+from typing import Callable, Dict, List
+
+# Third party imports
+from bs4 import BeautifulSoup
+
+# Local resources imports
+from html_parsing import HTML_PARSER, parse_html
+
+# Directory of the saved pages, named <page kind>__<name>.html
+fixtures_dir = "data/html_fixtures"
+# Number of times each page is parsed
+default_repeat = 20
+
+
+def legacy_hf_listing(markup: bytes) -> List[str]:
+    soup = BeautifulSoup(markup, "html.parser")
+    return [paper_div.find("a", class_="line-clamp-3").text.strip()
+            for paper_div in soup.find_all("div", class_="w-full") if paper_div.find("a", class_="line-clamp-3")]
+
+def layer_hf_listing(markup: bytes) -> List[str]:
+    from websites_specific import hf_listing_strainer
+    soup = parse_html(markup, parse_only = hf_listing_strainer)
+    return [paper_div.find("a", class_="line-clamp-3").text.strip()
+            for paper_div in soup.find_all("div", class_="w-full") if paper_div.find("a", class_="line-clamp-3")]
+
+def legacy_actuia_listing(markup: bytes) -> List[str]:
+    soup = BeautifulSoup(markup, "html.parser")
+    return [article_div.find("a", class_="")["href"]
+            for article_div in soup.find_all("div", class_="td_module_16 td_module_wrap td-animation-stack")
+            if article_div.find("a", class_="")]
+
+def layer_actuia_listing(markup: bytes) -> List[str]:
+    from websites_specific import scrapers, parse_listing
+    return [article_div.find("a", class_="")["href"]
+            for article_div in parse_listing(scrapers["actuia"], markup) if article_div.find("a", class_="")]
+
+def legacy_actuia_article(markup: bytes) -> str:
+    soup_article = BeautifulSoup(markup, "html.parser")
+    post_content = soup_article.find("div", class_="entry-content")
+    if not post_content:
+        post_content = soup_article.find("div", class_="tdb-block-inner td-fix-index")
+    return post_content.text.strip() if post_content else None
+
+def layer_actuia_article(markup: bytes) -> str:
+    from websites_specific import scrapers, parse_article_page
+
+    class Response:
+        status_code = 200
+        content = markup
+    return parse_article_page(scrapers["actuia"], "", Response())["content"]
+
+def legacy_insurance_times_uk_listing(markup: bytes) -> List[str]:
+    soup = BeautifulSoup(markup, "html.parser")
+    resultset = []
+    for class_set in ["spinLayout thumb onecol left item-first hasPicture",
+                      "spinLayout thumb onecol left item-first item-penultimate hasPicture",
+                      "spinLayout thumb onecol left item-first item-last hasPicture",
+                      "spinLayout thumb onecol right item-second item-last hasPicture",
+                      "spinLayout thumb onecol right item-second hasPicture",
+                      "spinLayout thumb onecol right item-second item-penultimate hasPicture"]:
+        resultset += soup.find_all("div", class_=class_set)
+    return [article_div.find("a", class_="")["href"] for article_div in resultset if article_div.find("a", class_="")]
+
+def layer_insurance_times_uk_listing(markup: bytes) -> List[str]:
+    from websites_specific import scrapers, parse_listing
+    resultset = parse_listing(scrapers["insurance.times.uk"], markup)
+    return [article_div.find("a", class_="")["href"] for article_div in resultset if article_div.find("a", class_="")]
+
+def legacy_insurance_times_uk_article(markup: bytes) -> str:
+    soup_article = BeautifulSoup(markup, "html.parser")
+    post_content_div = soup_article.find("div", class_="articleContent")
+    if not post_content_div:
+        return None
+    return "".join([p.text.strip() for p in post_content_div.find_all("p")
+                    if p and not p.text.startswith("<p><strong>Read:") and not p.text.startswith("<p><strong>Explore")])
+
+def layer_insurance_times_uk_article(markup: bytes) -> str:
+    from websites_specific import scrapers, parse_article_page
+
+    class Response:
+        status_code = 200
+        content = markup
+    return parse_article_page(scrapers["insurance.times.uk"], "", Response())["content"]
+
+# Page kind -> (legacy implementation, html_parsing layer implementation)
+implementations: Dict[str, tuple] = {
+    "hf_listing": (legacy_hf_listing, layer_hf_listing),
+    "actuia_listing": (legacy_actuia_listing, layer_actuia_listing),
+    "actuia_article": (legacy_actuia_article, layer_actuia_article),
+    "insurance_times_uk_listing": (legacy_insurance_times_uk_listing, layer_insurance_times_uk_listing),
+    "insurance_times_uk_article": (legacy_insurance_times_uk_article, layer_insurance_times_uk_article),
+}
+
+def time_parsing(parse: Callable, markup: bytes, repeat: int) -> float:
+    """
+    **Returns:**
+        The average duration (in milliseconds) of a parsing of the page.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(markup)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def save_fixtures() -> None:
+    """
+    Downloads the listing pages of the scrapers, and the first article of each listing, as fixtures.
+    """
+    from utils import config, http_client
+
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+    }
+    os.makedirs(fixtures_dir, exist_ok=True)
+
+    def save(kind: str, name: str, url: str) -> bytes:
+        response = http_client.get(url, headers = headers)
+        response.raise_for_status()
+        with open(os.path.join(fixtures_dir, f"{kind}__{name}.html"), "wb") as f:
+            f.write(response.content)
+        print(f"Saved {url} as a '{kind}' fixture")
+        return response.content
+
+    save("hf_listing", "papers", config["key.json.hf.url"])
+    for domain in config["actuia.list.domains"]:
+        article_urls = legacy_actuia_listing(save("actuia_listing", domain["name"],
+                                                  config["key.json.actuia.url"]+domain["name"]+"/"))
+        if article_urls:
+            save("actuia_article", domain["name"], article_urls[0])
+    for domain in config["insurance.times.uk.list.domains"]:
+        article_urls = legacy_insurance_times_uk_listing(save("insurance_times_uk_listing", domain["name"],
+                                                              domain["link"]+"/"))
+        if article_urls:
+            save("insurance_times_uk_article", domain["name"], article_urls[0])
+
+def run_benchmark(repeat: int) -> None:
+    """
+    Parses each fixture with both implementations, checks they extract the same data and prints their timings.
+    """
+    if not os.path.isdir(fixtures_dir) or not os.listdir(fixtures_dir):
+        print(f"No fixture in '{fixtures_dir}', save some first with --save")
+        return
+    print(f"Parser of the html_parsing layer: {HTML_PARSER}")
+    print(f"{'Fixture':<55} {'legacy (ms)':>12} {'layer (ms)':>12} {'speedup':>8}")
+    totals = [0.0, 0.0]
+    for file_name in sorted(os.listdir(fixtures_dir)):
+        kind = file_name.split("__")[0]
+        if kind not in implementations:
+            continue
+        with open(os.path.join(fixtures_dir, file_name), "rb") as f:
+            markup = f.read()
+        legacy, layer = implementations[kind]
+        if legacy(markup) != layer(markup):
+            print(f"WARNING: the implementations extract different data from {file_name}")
+        legacy_ms = time_parsing(legacy, markup, repeat)
+        layer_ms = time_parsing(layer, markup, repeat)
+        totals[0] += legacy_ms
+        totals[1] += layer_ms
+        print(f"{file_name:<55} {legacy_ms:>12.2f} {layer_ms:>12.2f} {legacy_ms / layer_ms:>7.1f}x")
+    if totals[1]:
+        print(f"{'Total':<55} {totals[0]:>12.2f} {totals[1]:>12.2f} {totals[0] / totals[1]:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Benchmark of the HTML parsing of the scrapers")
+    parser.add_argument("--save", action = "store_true", help = "download the fixture pages instead of running the benchmark")
+    parser.add_argument("--repeat", type = int, default = default_repeat, help = "number of parsings of each page")
+    arguments = parser.parse_args()
+    if arguments.save:
+        save_fixtures()
+    else:
+        run_benchmark(arguments.repeat)
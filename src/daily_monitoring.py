@@ -7,9 +7,20 @@ To be scheduled daily, this script aims to:
   3. Save their information in a JSON file.
 """
 
+# Standard library imports
+from concurrent.futures import ThreadPoolExecutor
+
 # Local resources imports
 from websites_specific import extract_article_details_from_websites
 from youtube_specific import extract_video_details_from_youtube_channels
+from utils import report_run_statistics
+from utils import import_ever_json_files
+from utils import create_item_pipeline
+from utils import set_item_pipeline
+from utils import start_email_outbox
+from utils import drain_email_outbox
+from utils import flush_email_digest
+from utils import recover_email_digest
 
 def extract_daily_content() -> None:
     """
@@ -19,12 +30,40 @@ def extract_daily_content() -> None:
     
     1. Extracts articles and papers details from a some websites and sends notifications.
     2. Extracts videos details from some youtube channels and sends notifications.
+    
+    Both run concurrently as producers of a pipeline, which summarizes their new items and stores and
+    notifies them while the scraping goes on.
     """
-    extract_article_details_from_websites()
+    # One-shot import of the legacy EVER_*.json data files into the item store (already imported files are skipped)
+    import_ever_json_files()
+    # Send in the background the emails queued in the outbox, starting with the ones left by a previous run
+    start_email_outbox()
+    # Queue the digest sections left by an interrupted run, before new items are notified
+    recover_email_digest()
     
-    extract_video_details_from_youtube_channels()
+    # Leaving the 'with' block waits until every submitted item has been summarized, stored and notified
+    with create_item_pipeline() as pipeline:
+        set_item_pipeline(pipeline)
+        try:
+            with ThreadPoolExecutor(max_workers = 2) as executor:
+                producers = [executor.submit(extract_article_details_from_websites),
+                             executor.submit(extract_video_details_from_youtube_channels)]
+            for producer in producers:
+                if producer.exception():
+                    print(f"🚨 An error occurred while extracting the daily content: {producer.exception()}")
+        finally:
+            set_item_pipeline(None)
     # Add functionality to convert content to voice recorder (commented out for now)
     # convert_to_voice_recorder()  # Uncomment if implemented
+    
+    # Send the daily digest of each recipient (digest mode)
+    flush_email_digest()
+    
+    # Wait for the queued emails before closing the SMTP connections
+    drain_email_outbox()
+    
+    # Print the run statistics (summary cache hits, etc.)
+    report_run_statistics()
 
 if __name__ == "__main__":
     extract_daily_content()
\ No newline at end of file
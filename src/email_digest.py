@@ -0,0 +1,129 @@
+"""
+email_digest.py
+
+Daily digest of the email notifications: the new items of every source are collected per recipient
+during the run, then sent as one grouped email per recipient and SMTP server.
+"""
+
+# Standard library imports
+import os
+import json
+import threading
+import time
+import uuid
+from typing import Dict, List, Set, Tuple
+
+
+class EmailDigest:
+    """
+    Collector of the digest sections, keyed by (recipient, SMTP server details key).
+
+    A section is the notification of one source (its title and its items), shared by all the recipients
+    of the source; `pop_digests` hands over, at the end of the run, the sections of each recipient to be
+    rendered and sent as a single email.
+
+    Each section is also spooled to `spool_dir` as it is added, one file per recipient, as its items are
+    already stored as known: the spooled files of a digest are removed by `remove_spooled` once it is queued
+    in the outbox, and the sections left by an interrupted run are loaded back by `load_spooled`.
+    """
+
+    def __init__(self, spool_dir: str) -> None:
+        """
+        **Args:**
+            spool_dir (str): The directory of the sections not yet queued in the outbox.
+        """
+        self.spool_dir = spool_dir
+        self.lock = threading.Lock()
+        # (recipient, SMTP server details key) -> [(section, spooled file)]
+        self.sections: Dict[Tuple[str, str], List[Tuple[Dict, str]]] = {}
+        self.spooled_paths: Set[str] = set()
+        self.stats: Dict[str, int] = {"sections": 0, "digests": 0, "recovered": 0}
+        os.makedirs(spool_dir, exist_ok=True)
+
+    def _collect(self, recipient: str, smtp_server_details_key: str, section: Dict, spooled_path: str) -> None:
+        # Called with the lock held
+        self.sections.setdefault((recipient, smtp_server_details_key), []).append((section, spooled_path))
+        self.spooled_paths.add(spooled_path)
+
+    def add(self, recipients: List[str], smtp_server_details_key: str, section: Dict) -> None:
+        """
+        Adds the section of a source to the digest of each of its recipients, spooling it to disk first.
+
+        **Args:**
+            recipients (List[str]): The email addresses of the recipients of the source.
+            smtp_server_details_key (str): The key of the SMTP server details the digest is sent with.
+            section (Dict): The section ("title", "items", "keys_to_ignore" of the items' table).
+        """
+        paths = []
+        for recipient in recipients:
+            # Time-ordered unique file name
+            path = os.path.join(self.spool_dir, f"{time.time_ns()}-{uuid.uuid4().hex}.json")
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as fp:
+                json.dump({"recipient": recipient,
+                           "smtp_server_details_key": smtp_server_details_key,
+                           "section": section}, fp, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            paths.append(path)
+        with self.lock:
+            for recipient, path in zip(recipients, paths):
+                self._collect(recipient, smtp_server_details_key, section, path)
+            self.stats["sections"] += 1
+
+    def load_spooled(self) -> int:
+        """
+        Loads the sections spooled by the previous runs and not sent (e.g. after a crash).
+
+        **Returns:**
+            The number of sections loaded (one per recipient).
+        """
+        loaded = 0
+        with self.lock:
+            for file_name in sorted(os.listdir(self.spool_dir)):
+                path = os.path.join(self.spool_dir, file_name)
+                if not file_name.endswith(".json") or path in self.spooled_paths:
+                    continue
+                try:
+                    with open(path) as fp:
+                        spooled = json.load(fp)
+                except (OSError, ValueError) as e:
+                    print(f"Skipping the unreadable digest section {path}: {e}")
+                    continue
+                self._collect(spooled["recipient"], spooled["smtp_server_details_key"], spooled["section"], path)
+                loaded += 1
+            self.stats["recovered"] += loaded
+        return loaded
+
+    def pop_digests(self) -> List[Tuple[str, str, List[Dict], List[str]]]:
+        """
+        Empties the collector.
+
+        **Returns:**
+            A list of (recipient, SMTP server details key, sections sorted by title, spooled files of the sections)
+            tuples, one per digest to send; the spooled files are to be removed once the digest is queued (see
+            `remove_spooled`).
+        """
+        with self.lock:
+            sections, self.sections = self.sections, {}
+            self.spooled_paths = set()
+            self.stats["digests"] += len(sections)
+        digests = []
+        for (recipient, smtp_server_details_key), recipient_sections in sorted(sections.items()):
+            recipient_sections = sorted(recipient_sections, key = lambda section_and_path: section_and_path[0]["title"])
+            digests.append((recipient, smtp_server_details_key,
+                            [section for section, _ in recipient_sections],
+                            [path for _, path in recipient_sections]))
+        return digests
+
+    def remove_spooled(self, spooled_paths: List[str]) -> None:
+        """
+        Removes the spooled files of a digest once it is queued.
+
+        **Args:**
+            spooled_paths (List[str]): The spooled files of the digest, as returned by `pop_digests`.
+        """
+        for path in spooled_paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
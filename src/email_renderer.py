@@ -0,0 +1,155 @@
+"""
+email_renderer.py
+
+Renderer of the HTML email notifications: the Jinja2 templates are compiled once per process and
+the table rows are rendered through a column plan computed once per set of columns.
+"""
+
+# Standard library imports
+import html
+import threading
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Tuple
+
+# Third party imports
+from jinja2 import Environment, FileSystemLoader, Template
+
+HEADER_CELL_STYLE = "padding: 0; text-align: center; border: 1px solid #ccc; background-color: #f2f2f2;"
+BODY_CELL_STYLE = "padding: 8px; border: 1px solid #ccc;"
+
+
+class EmailRenderer:
+    """
+    Renders the tables of items of the email notifications.
+
+    For each sequence of item keys (the items of a source share theirs), a column plan is built once:
+    the header cells, and the static segments of a row between which only the values of the item are
+    inserted. The templates are loaded and compiled on first use, then kept for the whole process;
+    `stream` yields the email in chunks as the rows are rendered, `render` joins them once.
+    """
+
+    def __init__(self, templates_dir: str, column_widths: Dict[str, int], default_width: int,
+                 image_key: str, link_key: str) -> None:
+        """
+        **Args:**
+            templates_dir (str): The directory of the Jinja2 templates.
+            column_widths (Dict[str, int]): The width (in vw) of the columns, by item key.
+            default_width (int): The width (in vw) of the other columns.
+            image_key (str): The key of the items' image URL, rendered as an image linking to the item.
+            link_key (str): The key of the items' link.
+        """
+        # Autoescape off: the item values are trusted HTML fragments (e.g. the summaries), as in the legacy rendering
+        self.environment = Environment(loader = FileSystemLoader(templates_dir),
+                                       autoescape = False,
+                                       auto_reload = False,
+                                       keep_trailing_newline = True)
+        self.column_widths = column_widths
+        self.default_width = default_width
+        self.image_key = image_key
+        self.link_key = link_key
+        self.lock = threading.Lock()
+        self.templates: Dict[str, Template] = {}
+        self.column_plans: Dict[Tuple, Tuple[str, List[str], List[str], Callable]] = {}
+
+    def get_template(self, template_name: str) -> Template:
+        """
+        **Returns:**
+            The compiled template, loaded from disk on first use only.
+        """
+        template = self.templates.get(template_name)
+        if template is None:
+            with self.lock:
+                template = self.templates.get(template_name)
+                if template is None:
+                    template = self.templates[template_name] = self.environment.get_template(template_name)
+        return template
+
+    def _column_plan(self, keys: Tuple[str, ...], keys_to_ignore: Tuple[str, ...]) -> Tuple[str, List[str], List[str], Callable]:
+        """
+        **Returns:**
+            The header cells, the static segments of a row, the keys of the values inserted between them and their getter.
+        """
+        plan = self.column_plans.get((keys, keys_to_ignore))
+        if plan is not None:
+            return plan
+        header_cells = []
+        segments = ["\n                <tr>"]
+        field_keys = []
+        for key in keys:
+            if key in keys_to_ignore:
+                continue
+            width = self.column_widths.get(key, self.default_width)
+            header_cells.append(f"\n                    <th style='{HEADER_CELL_STYLE} width: {width}vw'>{html.escape(key)}</th>")
+            if key == self.image_key:
+                segments[-1] += f"\n                    <td style='{BODY_CELL_STYLE} text-align: center; width: {width}vw'><a href='"
+                segments.append("'><img style='max-width: 100%; height: auto;' src='")
+                segments.append("'></a></td>")
+                field_keys += [self.link_key, key]
+            else:
+                segments[-1] += f"\n                    <td style='{BODY_CELL_STYLE} text-align: left; width: {width}vw'>"
+                segments.append("</td>")
+                field_keys.append(key)
+        segments[-1] += "\n                </tr>"
+        get_fields = itemgetter(*field_keys) if len(field_keys) > 1 else lambda item: tuple(item[key] for key in field_keys)
+        plan = ("".join(header_cells), segments, field_keys, get_fields)
+        with self.lock:
+            self.column_plans[(keys, keys_to_ignore)] = plan
+        return plan
+
+    def table_header(self, items: List[Dict], keys_to_ignore: List[str]) -> str:
+        """
+        **Returns:**
+            The header cells of the table of items (the columns of the first item).
+        """
+        if not items:
+            return ""
+        return self._column_plan(tuple(items[0]), tuple(keys_to_ignore))[0]
+
+    def iter_rows(self, items: List[Dict], keys_to_ignore: List[str]) -> Iterator[str]:
+        """
+        Renders the rows of the table of items, one at a time.
+
+        **Args:**
+            items (List[Dict]): The items, one row each (with the columns of its own keys).
+            keys_to_ignore (List[str]): The keys not rendered as columns.
+
+        **Returns:**
+            An iterator over the HTML rows.
+        """
+        keys_to_ignore = tuple(keys_to_ignore)
+        plan_keys, parts, field_keys, get_fields = None, None, None, None
+        for item in items:
+            keys = tuple(item)
+            if keys != plan_keys:
+                plan_keys = keys
+                _, segments, field_keys, get_fields = self._column_plan(keys, keys_to_ignore)
+                # The static segments stay in place, only the values between them are replaced
+                parts = [None] * (2 * len(segments) - 1)
+                parts[0::2] = segments
+            if self.link_key in item or self.link_key not in field_keys:
+                values = get_fields(item)
+            else:
+                # An image without link: the legacy rendering linked it to "[1]"
+                values = [item.get(key, [1]) for key in field_keys]
+            parts[1::2] = map(str, values)
+            yield "".join(parts)
+
+    def stream(self, template_name: str, **context) -> Iterator[str]:
+        """
+        Renders a template in chunks.
+
+        **Args:**
+            template_name (str): The name of the template in the templates directory.
+            **context: The variables of the template (iterators are consumed as the output is rendered).
+
+        **Returns:**
+            An iterator over the chunks of the output.
+        """
+        return self.get_template(template_name).generate(**context)
+
+    def render(self, template_name: str, **context) -> str:
+        """
+        **Returns:**
+            The whole output of a template, joined once.
+        """
+        return "".join(self.stream(template_name, **context))
@@ -0,0 +1,168 @@
+"""
+gemini_files.py
+
+Registry of the files uploaded to Gemini, so that the same PDF is uploaded only once across
+model fallbacks and runs.
+"""
+
+# Standard library imports
+import os
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+# Third party imports
+import google.generativeai as genai
+
+
+class UploadedFileRegistry:
+    """
+    Keeps the remote Gemini file handles keyed by the sha256 of the uploaded content.
+
+    A handle is reused as long as the remote file has more than `min_remaining_lifetime_seconds`
+    left before Gemini expires it. The registry is persisted to a json file so that the uploads
+    can be reused by the next runs (e.g. summarize_source.py after daily_monitoring.py).
+    """
+
+    def __init__(self, registry_file: str, min_remaining_lifetime_seconds: int,
+                 processing_timeout_seconds: float, keep_across_runs: bool = True) -> None:
+        """
+        **Args:**
+            registry_file (str): The path to the json file persisting the registry.
+            min_remaining_lifetime_seconds (int): The minimum remaining lifetime of a remote file to reuse it.
+            processing_timeout_seconds (float): The maximum time waited for Gemini to process an uploaded file.
+            keep_across_runs (bool): If False, every remote file is deleted at the end of the run.
+        """
+        self.registry_file = registry_file
+        self.min_remaining_lifetime_seconds = min_remaining_lifetime_seconds
+        self.processing_timeout_seconds = processing_timeout_seconds
+        self.keep_across_runs = keep_across_runs
+        self.lock = threading.Lock()
+        self.hash_locks: Dict[str, threading.Lock] = {}
+        # Handles obtained during this run, keyed by content hash
+        self.handles: Dict[str, object] = {}
+        # Persisted entries: content hash -> {"name": remote file name, "expires_at": epoch seconds}
+        self.entries: Dict[str, Dict] = {}
+        self.stats: Dict[str, int] = {"uploads": 0, "reuses": 0, "deletions": 0}
+        if os.path.isfile(registry_file):
+            try:
+                with open(registry_file) as fp:
+                    self.entries = json.load(fp)
+            except ValueError:
+                print(f"Ignoring the corrupted Gemini files registry '{registry_file}'")
+
+    def _save(self) -> None:
+        # Called with self.lock held
+        os.makedirs(os.path.dirname(self.registry_file) or ".", exist_ok=True)
+        tmp_path = f"{self.registry_file}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(self.entries, fp, indent=2)
+        os.replace(tmp_path, self.registry_file)
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        return entry["expires_at"] - time.time() > self.min_remaining_lifetime_seconds
+
+    @staticmethod
+    def _delete_remote(name: str, expires_at: float = None) -> bool:
+        if expires_at is not None and expires_at <= time.time():
+            # Already expired remotely
+            return False
+        try:
+            genai.delete_file(name)
+            return True
+        except Exception as e:
+            print(f"Could not delete uploaded file '{name}': {e}")
+            return False
+
+    def get_or_upload(self, path: str, content_hash: str, display_name: str):
+        """
+        Retrieves the remote handle of a file, uploading it only if no valid upload exists.
+
+        **Args:**
+            path (str): The local path to the file.
+            content_hash (str): The sha256 of the file's content.
+            display_name (str): The display name of the remote file, when uploaded.
+
+        **Returns:**
+            The Gemini file handle, to be passed to `generate_content`.
+
+        Raises:
+            RuntimeError: If Gemini failed to process the uploaded file.
+            TimeoutError: If the file is still being processed after `processing_timeout_seconds`.
+        """
+        with self.lock:
+            hash_lock = self.hash_locks.setdefault(content_hash, threading.Lock())
+        # Concurrent callers of the same content wait for a single upload
+        with hash_lock:
+            with self.lock:
+                entry = self.entries.get(content_hash)
+                handle = self.handles.get(content_hash)
+            if entry and self._is_fresh(entry):
+                if handle is None:
+                    # Uploaded by a previous run: check it still exists remotely
+                    try:
+                        handle = genai.get_file(entry["name"])
+                    except Exception as e:
+                        print(f"Uploaded file '{entry['name']}' is not available anymore: {e}")
+                        handle = None
+                if handle is not None and handle.state.name == "ACTIVE":
+                    with self.lock:
+                        self.handles[content_hash] = handle
+                        self.stats["reuses"] += 1
+                    return handle
+
+            if entry:
+                # Stale or gone: delete the previous upload before replacing its entry, so that it doesn't pile up remotely
+                if self._delete_remote(entry["name"], entry["expires_at"]):
+                    with self.lock:
+                        self.stats["deletions"] += 1
+                with self.lock:
+                    self.entries.pop(content_hash, None)
+                    self.handles.pop(content_hash, None)
+                    self._save()
+
+            handle = genai.upload_file(path = path, display_name = display_name)
+            # Wait until Gemini has processed the file before it can be used in a prompt
+            deadline = time.monotonic() + self.processing_timeout_seconds
+            while handle.state.name == "PROCESSING":
+                if time.monotonic() >= deadline:
+                    self._delete_remote(handle.name)
+                    raise TimeoutError(f"Uploaded file '{handle.name}' still processing after {self.processing_timeout_seconds}s")
+                time.sleep(1)
+                handle = genai.get_file(handle.name)
+            if handle.state.name != "ACTIVE":
+                # Not registered: the caller falls back (e.g. to its secondary model), which uploads the file again
+                self._delete_remote(handle.name)
+                raise RuntimeError(f"Gemini failed to process the uploaded file '{handle.name}' (state {handle.state.name})")
+            with self.lock:
+                self.handles[content_hash] = handle
+                self.entries[content_hash] = {"name": handle.name,
+                                              "expires_at": handle.expiration_time.timestamp()}
+                self.stats["uploads"] += 1
+                self._save()
+            return handle
+
+    def cleanup(self) -> int:
+        """
+        Deletes in bulk the remote files that won't be reused: all of them if the files are not kept
+        across runs, otherwise the ones expiring before they could be reused by the next run.
+
+        **Returns:**
+            The number of remote files deleted.
+        """
+        with self.lock:
+            to_delete = {content_hash: entry for content_hash, entry in self.entries.items()
+                         if not self.keep_across_runs or not self._is_fresh(entry)}
+
+        with ThreadPoolExecutor(max_workers = 8) as executor:
+            deleted = sum(executor.map(lambda entry: self._delete_remote(entry["name"], entry["expires_at"]),
+                                       to_delete.values()))
+        with self.lock:
+            for content_hash in to_delete:
+                self.entries.pop(content_hash, None)
+                self.handles.pop(content_hash, None)
+            self.stats["deletions"] += deleted
+            self._save()
+        return deleted
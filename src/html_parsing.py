@@ -0,0 +1,77 @@
+"""
+html_parsing.py
+
+HTML parsing layer of the scrapers: picks the fastest parser available (lxml, C-backed) and lets the
+scrapers build the tree of the relevant containers only, instead of the whole page.
+"""
+
+# Standard library imports
+import re
+from typing import List, Union
+
+# Third party imports
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+# lxml builds the tree in C, several times faster than Python's html.parser which remains the fallback
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def parse_html(markup: Union[str, bytes], parse_only: SoupStrainer = None,
+               parser: str = None) -> BeautifulSoup:
+    """
+    Parses an HTML page.
+
+    **Args:**
+        markup (Union[str, bytes]): The HTML page (e.g. `response.content`).
+        parse_only (SoupStrainer): If given, only the matching elements (and their descendants) are built.
+        parser (str): The parser to use, defaults to the fastest one available.
+
+    **Returns:**
+        The `BeautifulSoup` tree.
+    """
+    return BeautifulSoup(markup, parser or HTML_PARSER, parse_only = parse_only)
+
+
+def make_strainer(tag_names: Union[str, List[str]], class_names: List[str]) -> SoupStrainer:
+    """
+    Builds a strainer matching the given tags bearing at least one of the given classes.
+
+    **Args:**
+        tag_names (Union[str, List[str]]): The name(s) of the tags to keep (e.g. "div").
+        class_names (List[str]): The CSS classes, any of them making a tag match.
+
+    **Returns:**
+        The `SoupStrainer`, compiled once and reusable for every page.
+    """
+    # At parsing time the class attribute may still be the raw, space-separated string: match whole class names in it
+    class_pattern = re.compile(rf"(?:^|\s)(?:{'|'.join(re.escape(class_name) for class_name in class_names)})(?:\s|$)")
+    return SoupStrainer(tag_names, class_ = class_pattern)
+
+
+def select_by_class_sets(soup: Union[BeautifulSoup, Tag], tag_name: str,
+                         class_sets: List[str]) -> List[Tag]:
+    """
+    Collects in a single pass the tags whose class attribute is exactly one of the given ones, the
+    equivalent of one `find_all(tag_name, class_=class_set)` call per class set, with the results merged.
+
+    **Args:**
+        soup (Union[BeautifulSoup, Tag]): The tree to search.
+        tag_name (str): The name of the tags (e.g. "div").
+        class_sets (List[str]): The class attributes to match (e.g. "spinLayout thumb onecol left").
+
+    **Returns:**
+        The matching tags grouped by class set, in the order of `class_sets` (in document order within a group).
+    """
+    class_set_ranks = {class_set: rank for rank, class_set in enumerate(class_sets)}
+    matches = []
+    for tag in soup.find_all(tag_name, class_ = True):
+        rank = class_set_ranks.get(" ".join(tag["class"]))
+        if rank is not None:
+            matches.append((rank, tag))
+    # Stable sort: the document order is kept within each group
+    matches.sort(key = lambda match: match[0])
+    return [tag for _, tag in matches]
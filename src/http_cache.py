@@ -0,0 +1,111 @@
+"""
+http_cache.py
+
+Persistent store of the HTTP validators (ETag / Last-Modified) of the listing pages, used to send
+conditional GET requests and skip the pages that did not change since the last run.
+"""
+
+# Standard library imports
+import os
+import json
+import threading
+from typing import Dict
+
+# Third party imports
+import requests
+
+
+class ConditionalGetCache:
+    """
+    Stores the ETag and Last-Modified validators per URL in a json file.
+
+    The validators of a response are first kept as pending, and only committed (and saved to disk)
+    once the page's items have been fully processed. This way, a run that fails after fetching a
+    page doesn't make the next run skip it.
+    """
+
+    def __init__(self, file_path: str, enabled: bool = True) -> None:
+        """
+        **Args:**
+            file_path (str): The path to the json file storing the validators.
+            enabled (bool): If False, no conditional header is ever sent.
+        """
+        self.file_path = file_path
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.validators: Dict[str, Dict[str, str]] = {}
+        self.pending: Dict[str, Dict[str, str]] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        if os.path.isfile(file_path):
+            try:
+                with open(file_path) as fp:
+                    self.validators = json.load(fp)
+            except ValueError:
+                print(f"Ignoring the corrupted HTTP cache file '{file_path}'")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        **Args:**
+            url (str): The URL about to be requested.
+
+        **Returns:**
+            The If-None-Match / If-Modified-Since headers to send for the URL (empty if unknown).
+        """
+        if not self.enabled:
+            return {}
+        with self.lock:
+            url_validators = self.validators.get(url, {})
+        headers = {}
+        if url_validators.get("etag"):
+            headers["If-None-Match"] = url_validators["etag"]
+        if url_validators.get("last_modified"):
+            headers["If-Modified-Since"] = url_validators["last_modified"]
+        return headers
+
+    def record_response(self, url: str, response: requests.Response) -> bool:
+        """
+        Records the outcome of a conditional request and keeps the new validators as pending.
+
+        **Args:**
+            url (str): The requested URL.
+            response (requests.Response): The response to the conditional request.
+
+        **Returns:**
+            True if the page is unchanged since the last run (304 Not Modified), False otherwise.
+        """
+        unchanged = response.status_code == 304
+        with self.lock:
+            url_stats = self.stats.setdefault(url, {"unchanged": 0, "changed": 0})
+            url_stats["unchanged" if unchanged else "changed"] += 1
+            if not unchanged and response.status_code == 200:
+                url_validators = {"etag": response.headers.get("ETag"),
+                                  "last_modified": response.headers.get("Last-Modified")}
+                if url_validators["etag"] or url_validators["last_modified"]:
+                    self.pending[url] = url_validators
+        return unchanged
+
+    def commit(self, url: str) -> None:
+        """
+        Commits the pending validators of a URL once its items have been processed, and saves the cache.
+
+        **Args:**
+            url (str): The URL whose page has been fully processed.
+        """
+        with self.lock:
+            if url not in self.pending:
+                return
+            self.validators[url] = self.pending.pop(url)
+            tmp_path = f"{self.file_path}.tmp"
+            with open(tmp_path, "w") as fp:
+                json.dump(self.validators, fp, indent=2)
+            os.replace(tmp_path, self.file_path)
+
+    def report(self) -> str:
+        """
+        **Returns:**
+            A printable report of the URLs skipped because they were unchanged.
+        """
+        with self.lock:
+            lines = [f"   {url}: unchanged, skipped" if url_stats["unchanged"] else f"   {url}: changed"
+                     for url, url_stats in sorted(self.stats.items())]
+        return "\n".join(lines)
@@ -0,0 +1,229 @@
+"""
+http_client.py
+
+Shared HTTP client of the scrapers: pooled keep-alive connections, timeouts, retries with backoff
+and per-host statistics.
+"""
+
+# Standard library imports
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Iterator, Tuple
+from urllib.parse import urlparse
+
+# Third party imports
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+# Lists the encodings urllib3 is able to decode (brotli is included when the 'brotli' package is installed)
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Local resources imports
+from http_cache import ConditionalGetCache
+
+
+class HttpClient:
+    """
+    A `requests.Session` wrapper shared by all the scrapers.
+
+    Connections are pooled and kept alive per host, every request gets a default timeout, and
+    requests failing with 429 or 5xx status codes are retried with an exponential backoff
+    (honouring the Retry-After header). The number of requests, errors and the latency are
+    recorded per host.
+    """
+
+    def __init__(self, connect_timeout: float, read_timeout: float, retries: int,
+                 backoff_factor: float, pool_maxsize: int) -> None:
+        """
+        **Args:**
+            connect_timeout (float): The default timeout (in seconds) to establish a connection.
+            read_timeout (float): The default timeout (in seconds) to wait for the server's response.
+            retries (int): The number of retries on connection errors and 429/5xx status codes.
+            backoff_factor (float): The backoff factor between retries (sleeps factor * 2^(retry - 1) seconds).
+            pool_maxsize (int): The maximum number of connections kept alive per host.
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(total = retries,
+                      backoff_factor = backoff_factor,
+                      status_forcelist = (429, 500, 502, 503, 504),
+                      allowed_methods = frozenset(["GET", "HEAD"]),
+                      respect_retry_after_header = True,
+                      # Return the last response instead of raising, the callers check the status code
+                      raise_on_status = False)
+        adapter = HTTPAdapter(pool_connections = pool_maxsize,
+                              pool_maxsize = pool_maxsize,
+                              max_retries = retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.stats_lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _record(self, url: str, latency: float, error: bool) -> None:
+        host = urlparse(url).netloc
+        with self.stats_lock:
+            host_stats = self.stats.setdefault(host, {"requests": 0, "errors": 0, "latency": 0.0})
+            host_stats["requests"] += 1
+            host_stats["latency"] += latency
+            if error:
+                host_stats["errors"] += 1
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends an HTTP request through the pooled session.
+
+        **Args:**
+            method (str): The HTTP method (e.g. "GET").
+            url (str): The URL to request.
+            **kwargs: Any argument accepted by `requests.Session.request` (headers, stream, timeout, etc.).
+
+        **Returns:**
+            The `requests.Response` object.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self._record(url, time.perf_counter() - start, error = True)
+            raise
+        self._record(url, time.perf_counter() - start, error = response.status_code >= 400)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a GET request (see `request`).
+        """
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a HEAD request (see `request`).
+        """
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("HEAD", url, **kwargs)
+
+    def get_conditional(self, url: str, cache: ConditionalGetCache,
+                        **kwargs) -> Tuple[requests.Response, bool]:
+        """
+        Sends a conditional GET request, using the ETag / Last-Modified validators stored in the cache.
+
+        **Args:**
+            url (str): The URL to request.
+            cache (ConditionalGetCache): The cache of the validators.
+            **kwargs: Any argument accepted by `requests.Session.request` (headers, timeout, etc.).
+
+        **Returns:**
+            A tuple (response, True if the page is unchanged since the last run).
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(cache.conditional_headers(url))
+        response = self.get(url, headers = headers, **kwargs)
+        return response, cache.record_response(url, response)
+
+    def download(self, url: str, save_path: str, chunk_size: int = 1024 * 1024) -> bool:
+        """
+        Streams a file to disk by chunks.
+
+        The file is written to `<save_path>.part` then atomically renamed to `save_path` once complete.
+        A file already present with the size announced by the server is not downloaded again, and a
+        partial download left by a previous attempt is resumed with a Range request.
+
+        **Args:**
+            url (str): The URL of the file.
+            save_path (str): The path where the file will be saved.
+            chunk_size (int): The size of the chunks written to disk.
+
+        **Returns:**
+            True if the file is complete on disk, False otherwise (a partial file is kept for the next attempt).
+        """
+        # Ask for the raw bytes, so that sizes and ranges match the file on disk
+        headers = {"Accept-Encoding": "identity"}
+        if os.path.isfile(save_path):
+            try:
+                response = self.head(url, headers = headers)
+            except requests.RequestException as e:
+                print(f"Size check of '{url}' failed: {e}")
+                return False
+            expected_size = response.headers.get("Content-Length")
+            if response.status_code == 200 and expected_size and int(expected_size) == os.path.getsize(save_path):
+                return True
+
+        part_path = f"{save_path}.part"
+        resume_from = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+        if resume_from:
+            headers["Range"] = f"bytes={resume_from}-"
+        try:
+            with self.get(url, headers = headers, stream = True) as response:
+                if response.status_code == 206:
+                    # The server resumes the download where the previous attempt stopped
+                    mode = "ab"
+                    content_range = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+                    expected_size = int(content_range.group(1)) if content_range else None
+                elif response.status_code == 200:
+                    # The server sends the whole file (no partial download, or Range not supported)
+                    mode = "wb"
+                    content_length = response.headers.get("Content-Length")
+                    expected_size = int(content_length) if content_length else None
+                else:
+                    if response.status_code == 416:
+                        # The partial file doesn't match the remote one anymore, start over next time
+                        os.remove(part_path)
+                    return False
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size = chunk_size):
+                        f.write(chunk)
+        except requests.RequestException as e:
+            print(f"Download of '{url}' interrupted: {e}")
+            return False
+
+        if expected_size is not None and os.path.getsize(part_path) != expected_size:
+            return False
+        os.replace(part_path, save_path)
+        return True
+
+    def get_many(self, urls: List[str], max_workers: int, max_per_host: int,
+                 **kwargs) -> Iterator[Tuple[int, requests.Response, Exception]]:
+        """
+        Sends GET requests for a list of URLs concurrently, with at most `max_per_host`
+        requests in flight to the same host.
+
+        The results are yielded as soon as each response lands, i.e. not in the order of the URLs.
+
+        **Args:**
+            urls (List[str]): The URLs to request.
+            max_workers (int): The maximum number of requests in flight.
+            max_per_host (int): The maximum number of requests in flight to the same host.
+            **kwargs: Any argument accepted by `requests.Session.request` (headers, timeout, etc.).
+
+        **Returns:**
+            An iterator of tuples (index of the URL in `urls`, response or None, exception or None).
+        """
+        host_semaphores = {urlparse(url).netloc: threading.BoundedSemaphore(max_per_host) for url in urls}
+
+        def get_with_host_cap(url: str) -> requests.Response:
+            with host_semaphores[urlparse(url).netloc]:
+                return self.get(url, **kwargs)
+
+        with ThreadPoolExecutor(max_workers = max(1, max_workers)) as executor:
+            futures = {executor.submit(get_with_host_cap, url): index for index, url in enumerate(urls)}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+
+    def report(self) -> str:
+        """
+        **Returns:**
+            A printable report of the number of requests, errors and the average latency per host.
+        """
+        with self.stats_lock:
+            lines = [f"   {host}: {host_stats['requests']} requests, {host_stats['errors']} errors, "
+                     f"{host_stats['latency'] / host_stats['requests']:.3f}s average latency"
+                     for host, host_stats in sorted(self.stats.items())]
+        return "\n".join(lines)
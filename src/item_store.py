@@ -0,0 +1,213 @@
+"""
+item_store.py
+
+SQLite storage of the items (papers, articles, videos) already processed for each source.
+"""
+
+# Standard library imports
+import os
+import json
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Iterable
+
+
+class ItemStore:
+    """
+    Indexed store of the processed items, backed by SQLite in WAL mode.
+
+    Items are identified by the pair (source, item key), e.g. ("EVER_actuia_articles-assurance", <article URL>),
+    which is covered by a unique index: checking whether an item is known is a single index lookup, and new
+    items are appended without rewriting the history.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        """
+        **Args:**
+            db_path (str): The path to the SQLite database file (created if it doesn't exist).
+        """
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        # The connection is shared by the worker threads and serialized by the lock
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    inserted_at REAL NOT NULL
+                )""")
+            self.connection.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS items_source_item_key ON items (source, item_key)")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS imported_files (
+                    path TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    items INTEGER NOT NULL,
+                    imported_at REAL NOT NULL
+                )""")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )""")
+
+    def is_known(self, source: str, item_key: str) -> bool:
+        """
+        Checks whether an item is already stored for a given source.
+
+        **Args:**
+            source (str): The name of the source.
+            item_key (str): The unique key of the item (e.g. its link or its ID).
+
+        **Returns:**
+            True if the item is already stored, False otherwise.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM items WHERE source = ? AND item_key = ?",
+                (source, item_key)).fetchone()
+        return row is not None
+
+    def get_known_keys(self, source: str, item_keys: Iterable[str]) -> set:
+        """
+        Returns the subset of the given item keys that are already stored for a source.
+
+        **Args:**
+            source (str): The name of the source.
+            item_keys (Iterable[str]): The keys of the items to look up.
+
+        **Returns:**
+            A set with the keys of the items already stored.
+        """
+        known_keys = set()
+        with self.lock:
+            for item_key in item_keys:
+                if self.connection.execute(
+                        "SELECT 1 FROM items WHERE source = ? AND item_key = ?",
+                        (source, item_key)).fetchone():
+                    known_keys.add(item_key)
+        return known_keys
+
+    def count(self, source: str) -> int:
+        """
+        **Args:**
+            source (str): The name of the source.
+
+        **Returns:**
+            The number of items stored for the source.
+        """
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM items WHERE source = ?", (source,)).fetchone()[0]
+
+    def add_items(self, source: str, key_field: str, items: List[Dict]) -> int:
+        """
+        Stores new items for a source in a single transaction. Items already stored are ignored.
+
+        **Args:**
+            source (str): The name of the source.
+            key_field (str): The json key holding the unique key of each item.
+            items (List[Dict]): The items to store, latest first (as in the EVER_* json files).
+
+        **Returns:**
+            The number of items actually inserted.
+        """
+        now = time.time()
+        # Insert the oldest items first, so that the row IDs follow the chronological order
+        rows = [(source, item[key_field], json.dumps(item, ensure_ascii=False), now)
+                for item in reversed(items) if item.get(key_field)]
+        with self.lock, self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO items (source, item_key, payload, inserted_at) VALUES (?, ?, ?, ?)",
+                rows)
+            return self.connection.total_changes - before
+
+    def get_items(self, source: str, limit: int = None) -> List[Dict]:
+        """
+        Retrieves the items stored for a source, latest first.
+
+        **Args:**
+            source (str): The name of the source.
+            limit (int): The maximum number of items to retrieve (None for all of them).
+
+        **Returns:**
+            A list of dictionaries, one per item.
+        """
+        query = "SELECT payload FROM items WHERE source = ? ORDER BY id DESC"
+        parameters = (source,)
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters = (source, limit)
+        with self.lock:
+            rows = self.connection.execute(query, parameters).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def import_json_file(self, source: str, json_file_path: str, key_field: str) -> int:
+        """
+        Imports the items of a legacy EVER_*.json data file, once.
+
+        **Args:**
+            source (str): The name of the source to import the items into.
+            json_file_path (str): The path to the json data file (a list of items, latest first).
+            key_field (str): The json key holding the unique key of each item.
+
+        **Returns:**
+            The number of items imported (0 if the file was already imported).
+        """
+        absolute_path = os.path.abspath(json_file_path)
+        with self.lock:
+            if self.connection.execute("SELECT 1 FROM imported_files WHERE path = ?",
+                                       (absolute_path,)).fetchone():
+                return 0
+        with open(json_file_path) as fp:
+            items = json.load(fp)
+        imported = self.add_items(source, key_field, items)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO imported_files (path, source, items, imported_at) VALUES (?, ?, ?, ?)",
+                (absolute_path, source, imported, time.time()))
+        return imported
+
+    def get_state(self, key: str, default = None):
+        """
+        Retrieves a value persisted across runs (e.g. a channel's uploads playlist ID).
+
+        **Args:**
+            key (str): The key of the value.
+            default: The value returned if the key is unknown.
+
+        **Returns:**
+            The stored value (json decoded), or `default`.
+        """
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key: str, value) -> None:
+        """
+        Persists a value across runs.
+
+        **Args:**
+            key (str): The key of the value.
+            value: Any json serializable value.
+        """
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO state (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time()))
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+        with self.lock:
+            self.connection.close()
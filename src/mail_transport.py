@@ -0,0 +1,137 @@
+"""
+mail_transport.py
+
+Mail transport keeping one authenticated SMTP connection per server for the whole run.
+"""
+
+# Standard library imports
+import smtplib
+import ssl
+import threading
+from typing import Callable, Dict, List, Set, Tuple
+
+# Errors after which the connection is considered lost and is opened again
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError, ssl.SSLError)
+
+
+class SmtpConnectionPool:
+    """
+    Pool of SMTP connections, keyed by (SMTP server, port, sender).
+
+    A connection is opened (TLS handshake and login) the first time a sender sends an email, then
+    reused by the following emails of the run. A connection closed by the server is transparently
+    opened again. Each message is serialized once by the caller and, when `single_transaction` is
+    True, sent to all its recipients in a single SMTP transaction.
+    """
+
+    def __init__(self, single_transaction: bool = True, max_attempts: int = 2) -> None:
+        """
+        **Args:**
+            single_transaction (bool): If True, a message is sent to all its recipients with one `sendmail` call,
+                otherwise with one call per recipient.
+            max_attempts (int): The number of connections tried for a message before giving up.
+        """
+        self.single_transaction = single_transaction
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.connections: Dict[Tuple, smtplib.SMTP] = {}
+        self.connection_locks: Dict[Tuple, threading.Lock] = {}
+        # Keys connected at least once: opening their connection again is a reconnection
+        self.connected_keys: Set[Tuple] = set()
+        self.stats: Dict[str, int] = {"connections": 0, "reconnections": 0, "messages": 0, "transactions": 0, "refused": 0}
+
+    def send(self, smtp_server_details: Dict, connect: Callable, recipients: List[str], message: str,
+             delivered: List[str] = None) -> Dict[str, Tuple]:
+        """
+        Sends a serialized message through the pooled connection of its sender.
+
+        **Args:**
+            smtp_server_details (Dict): The SMTP server details ("smtp.server", "smtp.port", "sender", "sender.password").
+            connect (Callable): A function (smtp_server_details) -> logged in `smtplib.SMTP` connection.
+            recipients (List[str]): The email addresses of the recipients.
+            message (str): The message, serialized once (e.g. `msg.as_string()`).
+            delivered (List[str]): The recipients the message was already delivered to, skipped. The recipients it is
+                delivered to are appended to it, so that a caller retrying after an error only sends to the other ones.
+
+        **Returns:**
+            The recipients refused by the server, with their (SMTP code, error message).
+
+        Raises:
+            smtplib.SMTPException: If the message could not be sent.
+        """
+        key = (smtp_server_details["smtp.server"], smtp_server_details["smtp.port"], smtp_server_details["sender"])
+        with self.lock:
+            connection_lock = self.connection_locks.setdefault(key, threading.Lock())
+        if delivered is None:
+            delivered = []
+        pending_recipients = [recipient for recipient in recipients if recipient not in delivered]
+        if self.single_transaction:
+            transactions = [pending_recipients] if pending_recipients else []
+        else:
+            transactions = [[recipient] for recipient in pending_recipients]
+
+        refused: Dict[str, Tuple] = {}
+        with connection_lock:
+            sent_transactions = 0
+            for attempt in range(1, self.max_attempts + 1):
+                connection = self.connections.get(key)
+                if connection is None:
+                    connection = connect(smtp_server_details)
+                    self.connections[key] = connection
+                    with self.lock:
+                        self.stats["reconnections" if key in self.connected_keys else "connections"] += 1
+                        self.connected_keys.add(key)
+                try:
+                    # On a retry, the transactions already sent are not sent again
+                    for transaction_recipients in transactions[sent_transactions:]:
+                        try:
+                            transaction_refused = connection.sendmail(smtp_server_details["sender"], transaction_recipients, message)
+                        except smtplib.SMTPRecipientsRefused as e:
+                            # Raised when every recipient of the transaction is refused
+                            transaction_refused = e.recipients
+                        sent_transactions += 1
+                        with self.lock:
+                            self.stats["transactions"] += 1
+                        refused.update(transaction_refused)
+                        for recipient in transaction_recipients:
+                            if recipient in transaction_refused:
+                                code, error = transaction_refused[recipient]
+                                print(f"🚨 Email refused for '{recipient}': {code} {error!r}")
+                            else:
+                                delivered.append(recipient)
+                                print(f"Email sent successfully to: '{recipient}'")
+                    break
+                except CONNECTION_ERRORS as e:
+                    print(f"SMTP connection to {key[0]} lost ({e}), attempt {attempt} of {self.max_attempts}")
+                    self._drop(key)
+                    if attempt == self.max_attempts:
+                        raise
+            with self.lock:
+                self.stats["messages"] += 1
+                self.stats["refused"] += len(refused)
+        return refused
+
+    def _drop(self, key: Tuple) -> None:
+        # Called with the key's connection lock held
+        connection = self.connections.pop(key, None)
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection (to be called at the end of the run).
+        """
+        with self.lock:
+            keys = list(self.connections)
+        for key in keys:
+            with self.connection_locks[key]:
+                connection = self.connections.pop(key, None)
+                if connection is None:
+                    continue
+                try:
+                    connection.quit()
+                except Exception:
+                    connection.close()
@@ -0,0 +1,86 @@
+"""
+model_pool.py
+
+Pool of the generative model clients: each model is instantiated once per process and shared by all
+the summarization workers, which call it through the pool to collect per-model latency and errors.
+"""
+
+# Standard library imports
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+
+class ModelClientPool:
+    """
+    Model clients keyed by model name, created on first use.
+
+    The clients are stateless between calls (the HTTP/gRPC transport underneath is thread-safe), so a
+    single instance per model serves every worker thread.
+    """
+
+    def __init__(self, create_model: Callable) -> None:
+        """
+        **Args:**
+            create_model (Callable): A function (model_name) -> model client (e.g. `genai.GenerativeModel`).
+        """
+        self.create_model = create_model
+        self.lock = threading.Lock()
+        self.models: Dict[str, Any] = {}
+        # Model name -> {"calls", "errors", "latency.total", "latency.max"}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def get(self, model_name: str) -> Any:
+        """
+        **Returns:**
+            The client of the model, created on the first call.
+        """
+        model = self.models.get(model_name)
+        if model is None:
+            with self.lock:
+                model = self.models.get(model_name)
+                if model is None:
+                    model = self.models[model_name] = self.create_model(model_name)
+                    self.stats[model_name] = {"calls": 0, "errors": 0, "latency.total": 0.0, "latency.max": 0.0}
+        return model
+
+    def generate_content(self, model_name: str, contents: List[Any]) -> Any:
+        """
+        Calls `generate_content` on the shared client of a model, measuring the call.
+
+        **Args:**
+            model_name (str): The name of the model.
+            contents (List[Any]): The contents of the request (prompt, uploaded files...).
+
+        **Returns:**
+            The response of the model.
+
+        Raises:
+            Exception: The error raised by the model client, counted in the model's errors.
+        """
+        model = self.get(model_name)
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = model.generate_content(contents)
+            failed = False
+            return response
+        finally:
+            latency = time.perf_counter() - start
+            with self.lock:
+                stats = self.stats[model_name]
+                stats["calls"] += 1
+                stats["errors"] += failed
+                stats["latency.total"] += latency
+                stats["latency.max"] = max(stats["latency.max"], latency)
+
+    def report(self) -> str:
+        """
+        **Returns:**
+            One line per model used: calls, errors, average and maximum latency.
+        """
+        with self.lock:
+            return "\n".join(f"   {model_name}: {stats['calls']} calls, {stats['errors']} errors, "
+                             f"{stats['latency.total'] / stats['calls'] if stats['calls'] else 0:.1f}s average, "
+                             f"{stats['latency.max']:.1f}s max"
+                             for model_name, stats in sorted(self.stats.items()))
@@ -0,0 +1,176 @@
+"""
+outbox.py
+
+On-disk outbox of the email notifications, drained by a background sender with retries and
+exponential backoff.
+"""
+
+# Standard library imports
+import os
+import json
+import threading
+import time
+import uuid
+from typing import Callable, Dict
+
+
+class Outbox:
+    """
+    Queue of messages persisted as json files in `outbox_dir`, one file per message.
+
+    `enqueue` only writes the message to disk and returns: a background thread sends the messages in
+    their enqueuing order. A message that fails is retried after an exponential backoff, and moved to
+    `outbox_dir/failed` after `max_attempts` attempts. The messages still pending at the end of a run
+    (or after a crash) are sent by the next run, as soon as the outbox is started.
+    """
+
+    def __init__(self, outbox_dir: str, send: Callable, max_attempts: int,
+                 backoff_base_seconds: float, backoff_max_seconds: float) -> None:
+        """
+        **Args:**
+            outbox_dir (str): The directory of the pending messages.
+            send (Callable): A function (message, delivered) -> None sending a message, raising an exception on failure.
+                `delivered` is the list of the recipients already delivered by the previous attempts, to which the
+                function appends the recipients it delivers: it is persisted with the message, so that a retry after
+                a partial send skips them.
+            max_attempts (int): The number of attempts before a message is given up.
+            backoff_base_seconds (float): The delay before the first retry, doubled at each attempt.
+            backoff_max_seconds (float): The maximum delay between two attempts.
+        """
+        self.outbox_dir = outbox_dir
+        self.failed_dir = os.path.join(outbox_dir, "failed")
+        self.send = send
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.condition = threading.Condition()
+        # Pending messages: file path -> time of their next attempt
+        self.pending: Dict[str, float] = {}
+        self.stopping = False
+        self.sender: threading.Thread = None
+        self.stats: Dict[str, int] = {"enqueued": 0, "sent": 0, "retries": 0, "failed": 0}
+        os.makedirs(self.failed_dir, exist_ok=True)
+
+    def _write(self, path: str, envelope: Dict) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(envelope, fp, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def start(self) -> None:
+        """
+        Loads the messages left pending by the previous runs and starts the background sender.
+        """
+        with self.condition:
+            for file_name in os.listdir(self.outbox_dir):
+                if file_name.endswith(".json"):
+                    # Left by a previous run: due now
+                    self.pending[os.path.join(self.outbox_dir, file_name)] = 0.0
+            if self.pending:
+                print(f"=> Outbox: {len(self.pending)} emails left pending by a previous run")
+            self.stopping = False
+        self.sender = threading.Thread(target = self._send_pending, name = "outbox-sender", daemon = True)
+        self.sender.start()
+
+    def is_running(self) -> bool:
+        """
+        **Returns:**
+            True if the background sender is running.
+        """
+        return self.sender is not None and self.sender.is_alive()
+
+    def enqueue(self, message: Dict) -> None:
+        """
+        Persists a message to be sent by the background sender.
+
+        **Args:**
+            message (Dict): A json serializable message, passed to the `send` function.
+        """
+        # The file names sort in the enqueuing order
+        path = os.path.join(self.outbox_dir, f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.json")
+        self._write(path, {"attempts": 0, "message": message})
+        with self.condition:
+            self.pending[path] = time.time()
+            self.stats["enqueued"] += 1
+            self.condition.notify()
+
+    def _send_pending(self) -> None:
+        while True:
+            with self.condition:
+                while True:
+                    if self.stopping:
+                        return
+                    now = time.time()
+                    due_paths = sorted(path for path, next_attempt_at in self.pending.items() if next_attempt_at <= now)
+                    if due_paths:
+                        path = due_paths[0]
+                        break
+                    # Sleep until the next retry, or until a new message is enqueued
+                    timeout = min(self.pending.values()) - now if self.pending else None
+                    self.condition.wait(timeout)
+
+            try:
+                with open(path) as fp:
+                    envelope = json.load(fp)
+            except (OSError, ValueError) as e:
+                print(f"Unreadable outbox message '{path}' moved to {self.failed_dir}: {e}")
+                self._give_up(path)
+                continue
+
+            try:
+                self.send(envelope["message"], envelope.setdefault("delivered", []))
+            except Exception as e:
+                envelope["attempts"] += 1
+                envelope["last_error"] = str(e)
+                if envelope["attempts"] >= self.max_attempts:
+                    print(f"🚨 Email given up after {envelope['attempts']} attempts, kept in {self.failed_dir}: {e}")
+                    self._write(path, envelope)
+                    self._give_up(path)
+                    continue
+                delay = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (envelope["attempts"] - 1))
+                print(f"Email sending failed (attempt {envelope['attempts']} of {self.max_attempts}), retrying in {delay:.0f}s: {e}")
+                self._write(path, envelope)
+                with self.condition:
+                    self.pending[path] = time.time() + delay
+                    self.stats["retries"] += 1
+                    self.condition.notify_all()
+                continue
+
+            os.remove(path)
+            with self.condition:
+                self.pending.pop(path, None)
+                self.stats["sent"] += 1
+                self.condition.notify_all()
+
+    def _give_up(self, path: str) -> None:
+        try:
+            os.replace(path, os.path.join(self.failed_dir, os.path.basename(path)))
+        except OSError:
+            pass
+        with self.condition:
+            self.pending.pop(path, None)
+            self.stats["failed"] += 1
+            self.condition.notify_all()
+
+    def drain(self, timeout: float) -> int:
+        """
+        Waits until every pending message is sent (or given up), at most `timeout` seconds, then stops
+        the background sender. The messages still pending remain on disk for the next run.
+
+        **Args:**
+            timeout (float): The maximum number of seconds to wait.
+
+        **Returns:**
+            The number of messages still pending.
+        """
+        deadline = time.time() + timeout
+        with self.condition:
+            while self.pending and self.is_running() and time.time() < deadline:
+                self.condition.wait(deadline - time.time())
+            self.stopping = True
+            self.condition.notify_all()
+            still_pending = len(self.pending)
+        if self.sender is not None:
+            # An email being sent is finished before stopping
+            self.sender.join()
+        return still_pending
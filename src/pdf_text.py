@@ -0,0 +1,180 @@
+"""
+pdf_text.py
+
+Text of the PDF files: the pages are extracted in parallel from a memory-mapped file by a pool of
+processes, and the text of each file is cached on disk per content hash.
+"""
+
+# Standard library imports
+import os
+import re
+import mmap
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+# Third party imports
+import PyPDF2
+
+# Headings of the sections of a paper, alone on their line, numbered ("1 Introduction", "2.3. Results", "IV. Discussion")
+# or not ("Abstract", "References")
+SECTION_HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?[ \t]+[A-Z][A-Za-z][^\n.]{0,60}"
+    r"|(?i:Abstract|Introduction|Related Work|Background|Conclusions?|Concluding Remarks|Discussion|References|Bibliography"
+    r"|Acknowledge?ments|Appendix)\b[^\n.]{0,40})[ \t]*$",
+    re.MULTILINE)
+# Sections kept by `select_sections`, by the first word of their title
+SELECTED_SECTIONS = ("abstract", "introduction", "conclusion", "conclusions", "concluding", "discussion")
+
+
+def extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """
+    Extracts the text of a range of pages of a PDF file, memory-mapped instead of read into memory.
+
+    **Args:**
+        pdf_path (str): The path of the PDF file.
+        start (int): The index of the first page.
+        stop (int): The index after the last page (None for the last page of the file).
+
+    **Returns:**
+        The text of each page of the range.
+    """
+    with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mapped_file:
+        reader = PyPDF2.PdfReader(mapped_file)
+        return read_pages(reader, start, stop)
+
+
+def read_pages(reader: PyPDF2.PdfReader, start: int, stop: int) -> List[str]:
+    """
+    **Returns:**
+        The text of the pages `start` to `stop` (excluded, None for the last page) of an open PDF file.
+    """
+    page_count = len(reader.pages)
+    stop = page_count if stop is None else min(stop, page_count)
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def select_sections(text: str) -> str:
+    """
+    Keeps the front matter (title, authors, abstract), the introduction and the conclusion of a paper.
+
+    **Args:**
+        text (str): The text of the paper.
+
+    **Returns:**
+        The selected sections, or the whole text if its introduction and conclusion cannot be located.
+    """
+    headings = list(SECTION_HEADING_PATTERN.finditer(text))
+    if not headings:
+        return text
+    # The front matter, before the first heading, holds the title, the authors and often an unlabelled abstract
+    parts = [text[:headings[0].start()]]
+    found = False
+    for index, heading in enumerate(headings):
+        title = re.sub(r"^[\d.IVX]+\s+", "", heading.group().strip())
+        if title.split(" ")[0].lower().rstrip(":") in SELECTED_SECTIONS:
+            end = headings[index + 1].start() if index + 1 < len(headings) else len(text)
+            parts.append(text[heading.start():end])
+            found = found or not title.lower().startswith("abstract")
+    return "\n".join(part.strip() for part in parts) if found else text
+
+
+class PdfTextExtractor:
+    """
+    Extracts the text of PDF files, splitting the pages of the large ones between a pool of processes
+    (the text extraction of PyPDF2 is pure Python, so threads would not run in parallel).
+
+    The text of a file is cached as `<cache_dir>/<content hash>.txt`, so that a paper listed again or
+    summarized again with another model is parsed once.
+    """
+
+    def __init__(self, cache_dir: str, max_workers: int, min_pages_per_worker: int) -> None:
+        """
+        **Args:**
+            cache_dir (str): The directory of the cached texts.
+            max_workers (int): The maximum number of processes extracting the pages of a file.
+            min_pages_per_worker (int): The minimum number of pages given to a process (smaller files are extracted in process).
+        """
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.min_pages_per_worker = min_pages_per_worker
+        self.lock = threading.Lock()
+        self.executor: ProcessPoolExecutor = None
+        self.stats: Dict[str, int] = {"hits": 0, "extractions": 0, "pages": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def extract(self, pdf_path: str, content_hash: str = None) -> str:
+        """
+        **Args:**
+            pdf_path (str): The path of the PDF file.
+            content_hash (str): The hash of the file's content, the key of the cached text (None to skip the cache).
+
+        **Returns:**
+            The text of the file, its pages separated by line breaks.
+        """
+        cache_path = os.path.join(self.cache_dir, f"{content_hash}.txt") if content_hash else None
+        if cache_path is not None:
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                with self.lock:
+                    self.stats["hits"] += 1
+                return text
+            except OSError:
+                pass
+
+        pages = self.extract_pages(pdf_path)
+        # One join of all the pages (instead of concatenating them one by one)
+        text = "\n".join(pages)
+        with self.lock:
+            self.stats["extractions"] += 1
+            self.stats["pages"] += len(pages)
+
+        if cache_path is not None:
+            tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+        return text
+
+    def extract_pages(self, pdf_path: str) -> List[str]:
+        """
+        **Args:**
+            pdf_path (str): The path of the PDF file.
+
+        **Returns:**
+            The text of each page of the file, in order.
+        """
+        with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mapped_file:
+            reader = PyPDF2.PdfReader(mapped_file)
+            page_count = len(reader.pages)
+            workers = min(self.max_workers, page_count // max(1, self.min_pages_per_worker))
+            if workers <= 1:
+                return read_pages(reader, 0, None)
+
+        # Contiguous ranges of pages, one per process, each process parsing the file on its own
+        range_size = -(-page_count // workers)
+        starts = range(0, page_count, range_size)
+        futures = [self._get_executor().submit(extract_page_range, pdf_path, start, start + range_size) for start in starts]
+        return [page for future in futures for page in future.result()]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                # The pool is created from a worker thread of a multi-threaded process (pipeline, outbox sender, open
+                # sockets...), which must not be forked: the processes are started by a fork server instead, which
+                # preloads only this module (not the main module and its clients, threads and configuration)
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(["pdf_text"])
+                self.executor = ProcessPoolExecutor(max_workers = max(1, self.max_workers), mp_context = context)
+            return self.executor
+
+    def close(self) -> None:
+        """
+        Stops the extraction processes.
+        """
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait = True)
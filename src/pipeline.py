@@ -0,0 +1,124 @@
+"""
+pipeline.py
+
+Staged producer/consumer pipeline of the daily run: the scrapers submit their new items as soon as
+a source is parsed, summarizer workers consume them, and a writer persists the results, so that the
+network I/O, the LLM latency and the disk writes overlap.
+"""
+
+# Standard library imports
+import queue
+import threading
+from typing import Callable, Dict, List
+
+
+class Pipeline:
+    """
+    Pipeline made of bounded queues: scrapers -> summarizer workers -> writer.
+
+    The items are submitted by batch (the new items of a source, which share one email notification).
+    Each item is summarized on its own by the next free summarizer worker; once the last item of a
+    batch is summarized, the batch is handed over to the writer. Both queues are bounded: a scraper
+    submitting items while the summarizers are busy blocks until there is room (backpressure), so the
+    memory stays flat on large backlogs.
+    """
+
+    def __init__(self, summarize_item: Callable, write_batch: Callable,
+                 summarizer_workers: int, queue_size: int) -> None:
+        """
+        **Args:**
+            summarize_item (Callable): A function (batch, item) -> summary, called by the summarizer workers.
+            write_batch (Callable): A function (batch, items, summaries) -> None, called by the writer.
+            summarizer_workers (int): The number of summarizer worker threads.
+            queue_size (int): The maximum number of items (and of batches) waiting in each queue.
+        """
+        self.summarize_item = summarize_item
+        self.write_batch = write_batch
+        self.items_queue: queue.Queue = queue.Queue(maxsize = queue_size)
+        self.batches_queue: queue.Queue = queue.Queue(maxsize = queue_size)
+        self.summarizers = [threading.Thread(target = self._summarize_items, name = f"summarizer-{index}", daemon = True)
+                            for index in range(max(1, summarizer_workers))]
+        self.writer = threading.Thread(target = self._write_batches, name = "writer", daemon = True)
+        self.stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"batches": 0, "items": 0, "errors": 0}
+
+    def __enter__(self) -> "Pipeline":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Starts the summarizer workers and the writer.
+        """
+        for summarizer in self.summarizers:
+            summarizer.start()
+        self.writer.start()
+
+    def submit(self, batch: Dict, items: List[Dict], summarize: bool = True) -> None:
+        """
+        Submits the new items of a source. Blocks while the queue is full.
+
+        **Args:**
+            batch (Dict): The context of the items, passed back to `summarize_item` and `write_batch`.
+            items (List[Dict]): The items.
+            summarize (bool): If False, the batch goes straight to the writer (with None summaries).
+        """
+        batch_state = {"batch": batch,
+                       "items": items,
+                       "summaries": [None] * len(items),
+                       "remaining": len(items),
+                       "lock": threading.Lock()}
+        with self.stats_lock:
+            self.stats["batches"] += 1
+            self.stats["items"] += len(items)
+        if not summarize or not items:
+            self.batches_queue.put(batch_state)
+            return
+        for item_index in range(len(items)):
+            self.items_queue.put((batch_state, item_index))
+
+    def _summarize_items(self) -> None:
+        while True:
+            work = self.items_queue.get()
+            if work is None:
+                break
+            batch_state, item_index = work
+            try:
+                summary = self.summarize_item(batch_state["batch"], batch_state["items"][item_index])
+            except Exception as e:
+                print(f"🚨 An error occurred while summarizing an item: {e}")
+                with self.stats_lock:
+                    self.stats["errors"] += 1
+                summary = None
+            with batch_state["lock"]:
+                batch_state["summaries"][item_index] = summary
+                batch_state["remaining"] -= 1
+                batch_complete = batch_state["remaining"] == 0
+            if batch_complete:
+                self.batches_queue.put(batch_state)
+
+    def _write_batches(self) -> None:
+        while True:
+            batch_state = self.batches_queue.get()
+            if batch_state is None:
+                break
+            try:
+                self.write_batch(batch_state["batch"], batch_state["items"], batch_state["summaries"])
+            except Exception as e:
+                print(f"🚨 An error occurred while writing a batch of items: {e}")
+                with self.stats_lock:
+                    self.stats["errors"] += 1
+
+    def close(self) -> None:
+        """
+        Waits until every submitted item has been summarized and written, then stops the threads.
+        """
+        for _ in self.summarizers:
+            self.items_queue.put(None)
+        for summarizer in self.summarizers:
+            summarizer.join()
+        self.batches_queue.put(None)
+        self.writer.join()
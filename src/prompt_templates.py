@@ -0,0 +1,115 @@
+"""
+prompt_templates.py
+
+Registry of the prompt templates: each template file is read and parsed once into a list of segments,
+then rendered in a single pass, and read again only when it is modified on disk.
+"""
+
+# Standard library imports
+import os
+import re
+import threading
+from typing import Dict, List, Tuple
+
+# Placeholders of the templates, e.g. {title}
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class PromptTemplate:
+    """
+    A prompt template parsed into its literal text segments and its placeholders.
+    """
+
+    def __init__(self, text: str) -> None:
+        """
+        **Args:**
+            text (str): The text of the template, with {placeholder} fields.
+        """
+        # Alternating segments: literal text at even indexes, placeholder names at odd indexes
+        self.segments: List[str] = PLACEHOLDER_PATTERN.split(text)
+        self.placeholders = set(self.segments[1::2])
+
+    def render(self, **values: str) -> str:
+        """
+        Fills the placeholders in one pass: the values are inserted as is, never scanned for placeholders
+        themselves (e.g. a transcript containing "{title}"). Placeholders without value are left untouched.
+
+        **Args:**
+            **values (str): The value of each placeholder (None renders as an empty string).
+
+        **Returns:**
+            The rendered prompt.
+        """
+        parts = self.segments.copy()
+        for index in range(1, len(parts), 2):
+            name = parts[index]
+            if name in values:
+                parts[index] = values[name] or ""
+            else:
+                parts[index] = f"{{{name}}}"
+        return "".join(parts)
+
+
+class PromptTemplateRegistry:
+    """
+    Prompt templates of a directory, keyed by their path (e.g. "templates/prompt_summarize_HF_paper_template.md").
+
+    `preload` parses every template file of the directory at startup; afterwards `get` costs a `stat`
+    of the file, which is read and parsed again only if its modification time changed.
+    """
+
+    def __init__(self, templates_dir: str, suffix: str) -> None:
+        """
+        **Args:**
+            templates_dir (str): The directory of the templates.
+            suffix (str): The suffix of the template files (e.g. ".md").
+        """
+        self.templates_dir = templates_dir
+        self.suffix = suffix
+        self.lock = threading.Lock()
+        # Normalized path -> (modification time, parsed template)
+        self.templates: Dict[str, Tuple[int, PromptTemplate]] = {}
+        self.stats: Dict[str, int] = {"loads": 0, "reloads": 0}
+
+    def preload(self) -> None:
+        """
+        Parses every template file of the templates directory.
+        """
+        if not os.path.isdir(self.templates_dir):
+            return
+        for file_name in sorted(os.listdir(self.templates_dir)):
+            if file_name.endswith(self.suffix):
+                self.get(os.path.join(self.templates_dir, file_name))
+
+    def get(self, template_path: str) -> PromptTemplate:
+        """
+        **Args:**
+            template_path (str): The path of the template file.
+
+        **Returns:**
+            The parsed template, up to date with the file.
+
+        Raises:
+            OSError: If the template file cannot be read.
+        """
+        path = os.path.normpath(template_path)
+        modified_at = os.stat(path).st_mtime_ns
+        cached = self.templates.get(path)
+        if cached is not None and cached[0] == modified_at:
+            return cached[1]
+        with self.lock:
+            cached = self.templates.get(path)
+            if cached is not None and cached[0] == modified_at:
+                return cached[1]
+            with open(path, "r") as f:
+                template = PromptTemplate(f.read())
+            self.templates[path] = (modified_at, template)
+            self.stats["reloads" if cached is not None else "loads"] += 1
+        return template
+
+    def render(self, template_path: str, **values: str) -> str:
+        """
+        **Returns:**
+            The rendered prompt of the template file (see `PromptTemplate.render`).
+        """
+        return self.get(template_path).render(**values)
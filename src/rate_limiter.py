@@ -0,0 +1,99 @@
+"""
+rate_limiter.py
+
+Token-bucket rate limiters used to share the Gemini quota (requests and tokens
+per minute) between the summarization workers.
+"""
+
+# Standard library imports
+import threading
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    The bucket holds at most `capacity` tokens and is refilled continuously at
+    `refill_per_second` tokens per second. Callers block in `acquire` until enough
+    tokens are available.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float) -> None:
+        """
+        **Args:**
+            capacity (float): The maximum number of tokens the bucket can hold.
+            refill_per_second (float): The number of tokens added to the bucket every second.
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.last_refill) * self.refill_per_second)
+        self.last_refill = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Takes `amount` tokens from the bucket, waiting until they are available.
+
+        A request bigger than the bucket's capacity is capped to the capacity so that it
+        can still go through once the bucket is full.
+
+        **Args:**
+            amount (float): The number of tokens to take from the bucket.
+
+        **Returns:**
+            The number of seconds spent waiting for the tokens.
+        """
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                wait_time = (amount - self.tokens) / self.refill_per_second
+            time.sleep(wait_time)
+            waited += wait_time
+
+
+class ModelRateLimiter:
+    """
+    Rate limiter for one LLM model, combining a requests-per-minute (RPM) bucket and
+    an optional tokens-per-minute (TPM) bucket.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int = None) -> None:
+        """
+        **Args:**
+            requests_per_minute (int): The number of requests allowed per minute.
+            tokens_per_minute (int): The number of input tokens allowed per minute (None for no limit).
+        """
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = None
+        if tokens_per_minute:
+            self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.stats_lock = threading.Lock()
+        self.stats: Dict[str, float] = {"requests": 0, "tokens": 0, "waited": 0.0}
+
+    def acquire(self, estimated_tokens: int = 0) -> None:
+        """
+        Blocks until one request carrying `estimated_tokens` input tokens is allowed.
+
+        **Args:**
+            estimated_tokens (int): The estimated number of input tokens of the request.
+        """
+        waited = self.requests.acquire(1)
+        if self.tokens is not None and estimated_tokens > 0:
+            waited += self.tokens.acquire(estimated_tokens)
+        with self.stats_lock:
+            self.stats["requests"] += 1
+            self.stats["tokens"] += estimated_tokens
+            self.stats["waited"] += waited
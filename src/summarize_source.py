@@ -8,13 +8,14 @@ updates the README with the summaries, and cleans up temporary files.
 # Standard library imports
 import json
 import os
-import time
 from datetime import datetime
 from typing import List, Dict
 
 # Local resources imports
 from utils import config
-from utils import summarize_from_pdf_file
+from utils import call_LLM_to_get_summary
+from utils import get_summary_models
+from utils import report_run_statistics
 
 # Data Dir containing the json file with the list of all downloaded sources for a given day
 data_dir = "data"
@@ -81,28 +82,27 @@ def main() -> None:
     with open(f"{data_dir}/{date}{hf_paper_file_suffix}.json", "r") as f:
         papers = json.load(f)
 
+    # Same models as process_list_of_items for the Hugging Face source, so that the cached summaries are shared
+    primary_model, secondary_model = get_summary_models(config["key.json.hf.source.name"])
+
     summaries = []
     for paper in papers:
         try:
-            summary = summarize_from_pdf_file(
-                title      = paper[config["key.json.title"]],
-                authors    = paper[config["key.json.authors"]],
-                pdf_path   = paper[config["key.json.pdf.path"]],
-                # model_name = config["gemini.api.service.version.1.5.pro.002"]
-                model_name=config["gemini.api.service.version.1.5.flash.002"]
+            # Go through the summary cache, as the paper might have been summarized by process_hf_daily already
+            summary = call_LLM_to_get_summary(
+                item          = paper,
+                source_format = config["key.json.source.format.pdf"],
+                model_name    = primary_model
             )
             summaries.append({**paper, config["key.json.summary"]: summary})
-            # time.sleep(60) # Sleep for 1 minute to avoid rate limiting
-            time.sleep(10) # Sleep for 10 seconds to avoid rate limiting
+            # No sleep needed: the models' rate limiters pace the calls, and cache hits don't call the model
         except Exception:
             try:
                 print(f"Failed to summarize paper {paper[config["key.json.title"]]}. Trying with a different model.")
-                summary = summarize_from_pdf_file(
-                    title    = paper[config["key.json.title"]],
-                    authors  = paper[config["key.json.authors"]],
-                    pdf_path = paper[config["key.json.pdf.path"]],
-                    # model_name=config["gemini.api.service.version.1.5.flash.002"]
-                    model_name=config["gemini.api.service.version.1.5.flash"]
+                summary = call_LLM_to_get_summary(
+                    item          = paper,
+                    source_format = config["key.json.source.format.pdf"],
+                    model_name    = secondary_model
                 )
                 summaries.append({**paper, config["key.json.summary"]: summary})
             except Exception as e:
@@ -124,6 +124,9 @@ def main() -> None:
         if os.path.exists(paper[config["key.json.pdf.path"]]):
             os.remove(paper[config["key.json.pdf.path"]])
 
+    # Print the run statistics (summary cache hits, etc.)
+    report_run_statistics()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,152 @@
+"""
+summary_cache.py
+
+Persistent, content-addressed cache of the summaries generated by the LLM.
+"""
+
+# Standard library imports
+import os
+import json
+import hashlib
+import threading
+import time
+from typing import Dict
+
+
+class SummaryCache:
+    """
+    On-disk cache of summaries, keyed by a hash of everything that determines a summary
+    (source format, model name, rendered prompt and content).
+
+    Each entry is stored as a small json file under `cache_dir/<2 first hash chars>/<hash>.json`.
+    Entries older than `max_age_seconds` are ignored and evicted, and the oldest entries are
+    evicted first when the cache grows over `max_size_bytes`.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int, max_age_seconds: int,
+                 bypass: bool = False) -> None:
+        """
+        **Args:**
+            cache_dir (str): The directory where the cache entries are stored.
+            max_size_bytes (int): The maximum size of the cache on disk.
+            max_age_seconds (int): The maximum age of an entry before it is considered stale.
+            bypass (bool): If True, the cache is never read (but still written), e.g. after a prompt template change.
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.max_age_seconds = max_age_seconds
+        self.bypass = bypass
+        self.lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(source_format: str, model_name: str, prompt: str, content_hash: str = "") -> str:
+        """
+        Computes the cache key of a summary.
+
+        **Args:**
+            source_format (str): The format of the summarized content.
+            model_name (str): The name of the LLM generating the summary.
+            prompt (str): The fully rendered prompt sent to the LLM.
+            content_hash (str): The hash of any content sent next to the prompt (e.g. a PDF file).
+
+        **Returns:**
+            The hexadecimal sha256 key of the summary.
+        """
+        digest = hashlib.sha256()
+        for part in (source_format, model_name, prompt, content_hash):
+            digest.update((part or "").encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _count(self, stat: str, value: int = 1) -> None:
+        with self.lock:
+            self.stats[stat] += value
+
+    def get(self, key: str) -> str:
+        """
+        Retrieves a summary from the cache.
+
+        **Args:**
+            key (str): The cache key of the summary (see `make_key`).
+
+        **Returns:**
+            The cached summary, or None if it is missing, stale or if the cache is bypassed.
+        """
+        if self.bypass:
+            self._count("misses")
+            return None
+        try:
+            with open(self._entry_path(key), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+        if time.time() - entry["created_at"] > self.max_age_seconds:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return entry["summary"]
+
+    def put(self, key: str, summary: str) -> None:
+        """
+        Stores a summary in the cache. The entry is written to a temporary file then renamed,
+        so that concurrent readers never see a partial entry.
+
+        **Args:**
+            key (str): The cache key of the summary (see `make_key`).
+            summary (str): The summary to store.
+        """
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        tmp_path = f"{entry_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"created_at": time.time(), "summary": summary}, f)
+        os.replace(tmp_path, entry_path)
+        self._count("writes")
+
+    def evict(self) -> int:
+        """
+        Removes the stale entries, then the oldest ones until the cache fits in its maximum size.
+
+        **Returns:**
+            The number of evicted entries.
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        # Oldest entries first
+        entries.sort()
+        total_size = sum(size for _, size, _ in entries)
+        now = time.time()
+        evicted = 0
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age_seconds and total_size <= self.max_size_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            evicted += 1
+        self._count("evictions", evicted)
+        return evicted
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+        for root, _, files in os.walk(self.cache_dir):
+            for file_name in files:
+                os.remove(os.path.join(root, file_name))
@@ -0,0 +1,129 @@
+"""
+token_budget.py
+
+Input token budget of the summarization prompts: measures the rendered prompts, splits the texts too
+long for one prompt into chunks and runs the map step of a map-reduce summarization in parallel.
+"""
+
+# Standard library imports
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+# Boundaries a chunk is preferably cut at, from the strongest to the weakest
+SPLIT_PATTERNS = [re.compile(r"\n\s*\n"), re.compile(r"\n"), re.compile(r"(?<=[.!?])\s+"), re.compile(r"\s+")]
+
+
+class TokenBudget:
+    """
+    Maximum number of input tokens of a prompt, and the chunking of the texts exceeding it.
+
+    The prompts are measured with a cheap estimate; only the ones whose estimate is close to the budget
+    (within `exact_margin`) are measured exactly with `count_exact` (e.g. a model's token counting API).
+    """
+
+    def __init__(self, max_input_tokens: int, chunk_tokens: int, estimate: Callable,
+                 exact_margin: float = 0.2) -> None:
+        """
+        **Args:**
+            max_input_tokens (int): The maximum number of tokens of a prompt summarized at once.
+            chunk_tokens (int): The target number of tokens of a chunk.
+            estimate (Callable): A function (text) -> estimated number of tokens.
+            exact_margin (float): The relative distance to the budget under which a prompt is measured exactly.
+        """
+        self.max_input_tokens = max_input_tokens
+        self.chunk_tokens = chunk_tokens
+        self.estimate = estimate
+        self.exact_margin = exact_margin
+
+    def count(self, prompt: str, count_exact: Callable = None) -> int:
+        """
+        **Args:**
+            prompt (str): The rendered prompt.
+            count_exact (Callable): A function (text) -> exact number of tokens, called only near the budget.
+
+        **Returns:**
+            The number of tokens of the prompt (estimated, or exact near the budget).
+        """
+        tokens = self.estimate(prompt)
+        if count_exact is not None and abs(tokens - self.max_input_tokens) <= self.exact_margin * self.max_input_tokens:
+            try:
+                tokens = count_exact(prompt)
+            except Exception as e:
+                print(f"Exact token count failed, keeping the estimate ({tokens} tokens): {e}")
+        return tokens
+
+    def fits(self, tokens: int) -> bool:
+        """
+        **Returns:**
+            True if a prompt of `tokens` tokens can be summarized at once.
+        """
+        return tokens <= self.max_input_tokens
+
+    def split(self, text: str) -> List[str]:
+        """
+        Splits a text into chunks of about `chunk_tokens` tokens, cut at paragraph boundaries if possible,
+        then at line, sentence and word boundaries.
+
+        **Args:**
+            text (str): The text to split.
+
+        **Returns:**
+            The chunks, in the order of the text.
+        """
+        return [chunk for chunk in self._split(text, 0) if chunk.strip()]
+
+    def _split(self, text: str, pattern_index: int) -> List[str]:
+        if self.estimate(text) <= self.chunk_tokens:
+            return [text]
+        if pattern_index >= len(SPLIT_PATTERNS):
+            # No boundary left: hard cut, at the estimated number of characters per chunk
+            size = max(1, len(text) * self.chunk_tokens // self.estimate(text))
+            return [text[start:start + size] for start in range(0, len(text), size)]
+        chunks = []
+        current = ""
+        for piece in self._pieces(text, SPLIT_PATTERNS[pattern_index]):
+            if self.estimate(piece) > self.chunk_tokens:
+                # A piece too large on its own is split at weaker boundaries
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks += self._split(piece, pattern_index + 1)
+            elif current and self.estimate(current + piece) > self.chunk_tokens:
+                chunks.append(current)
+                current = piece
+            else:
+                current += piece
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _pieces(text: str, pattern: re.Pattern) -> List[str]:
+        # Each piece keeps the separator that follows it, so that joining the pieces gives back the text
+        pieces = []
+        start = 0
+        for match in pattern.finditer(text):
+            pieces.append(text[start:match.end()])
+            start = match.end()
+        pieces.append(text[start:])
+        return pieces
+
+
+def map_chunks(chunks: List[str], summarize_chunk: Callable, max_workers: int) -> List[str]:
+    """
+    Summarizes the chunks of a text in parallel (map step of a map-reduce summarization).
+
+    **Args:**
+        chunks (List[str]): The chunks.
+        summarize_chunk (Callable): A function (chunk index, chunk) -> summary of the chunk.
+        max_workers (int): The maximum number of chunks summarized at the same time.
+
+    **Returns:**
+        The summaries of the chunks, in their order.
+
+    Raises:
+        Exception: The first error raised while summarizing a chunk.
+    """
+    with ThreadPoolExecutor(max_workers = max(1, min(max_workers, len(chunks)))) as executor:
+        return list(executor.map(summarize_chunk, range(len(chunks)), chunks))
@@ -0,0 +1,187 @@
+"""
+transcript_service.py
+
+Transcripts of the YouTube videos, fetched in the background from the caption tracks listed in the
+player response of the watch page, and cached on disk per video.
+"""
+
+# Standard library imports
+import os
+import json
+import html
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
+# Local resources imports
+from http_client import HttpClient
+
+WATCH_URL = "https://www.youtube.com/watch?v={video_id}"
+PLAYER_RESPONSE_MARKER = "ytInitialPlayerResponse = "
+# Accept the consent interstitial served to european visitors, which has no player response
+REQUEST_COOKIES = {"CONSENT": "YES+1"}
+
+
+class TranscriptUnavailable(Exception):
+    """
+    The video has no usable caption track (cached as a negative result).
+    """
+
+
+class TranscriptService:
+    """
+    Fetches the transcripts of YouTube videos on a pool of background workers.
+
+    `prefetch` queues the videos (e.g. the new videos of a channel) and returns at once; `get` returns
+    the transcript of a video, waiting for its fetch if it is in flight. The transcripts are cached on
+    disk as `<cache_dir>/<video_id>.json`; a video without captions is cached as unavailable for
+    `negative_ttl_seconds` only, as captions are often published after the video.
+    """
+
+    def __init__(self, http_client: HttpClient, cache_dir: str, negative_ttl_seconds: float,
+                 max_workers: int, languages: List[str]) -> None:
+        """
+        **Args:**
+            http_client (HttpClient): The HTTP client used to download the pages and the caption tracks.
+            cache_dir (str): The directory of the cached transcripts.
+            negative_ttl_seconds (float): How long a video without transcript is not fetched again.
+            max_workers (int): The maximum number of videos fetched at the same time.
+            languages (List[str]): The preferred caption languages, by order of preference.
+        """
+        self.http_client = http_client
+        self.cache_dir = cache_dir
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_workers = max_workers
+        self.languages = languages
+        self.lock = threading.Lock()
+        self.executor: ThreadPoolExecutor = None
+        self.in_flight: Dict[str, Future] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "unavailable": 0, "errors": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def prefetch(self, video_ids: List[str]) -> None:
+        """
+        Queues the fetch of the transcripts of videos, without waiting for them.
+
+        **Args:**
+            video_ids (List[str]): The IDs of the videos.
+        """
+        for video_id in video_ids:
+            self._submit(video_id)
+
+    def get(self, video_id: str) -> str:
+        """
+        **Args:**
+            video_id (str): The ID of the video.
+
+        **Returns:**
+            The transcript of the video, or None if it is unavailable.
+        """
+        return self._submit(video_id).result()
+
+    def _submit(self, video_id: str) -> Future:
+        with self.lock:
+            future = self.in_flight.get(video_id)
+            if future is None:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers = max(1, self.max_workers),
+                                                       thread_name_prefix = "transcripts")
+                future = self.in_flight[video_id] = self.executor.submit(self._fetch, video_id)
+        return future
+
+    def _count(self, outcome: str) -> None:
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def _fetch(self, video_id: str) -> str:
+        cache_path = os.path.join(self.cache_dir, f"{video_id}.json")
+        try:
+            with open(cache_path) as fp:
+                cached = json.load(fp)
+            if cached["transcript"] is not None or time.time() - cached["fetched_at"] < self.negative_ttl_seconds:
+                self._count("hits")
+                return cached["transcript"]
+        except (OSError, ValueError, KeyError):
+            pass
+        self._count("misses")
+
+        try:
+            transcript = self.fetch_transcript(video_id)
+        except TranscriptUnavailable:
+            self._count("unavailable")
+            transcript = None
+        except Exception as e:
+            # Network or parsing error: not cached, the video is tried again by the next run
+            print(f"Error getting transcript for video {video_id}: {e}")
+            self._count("errors")
+            return None
+
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump({"transcript": transcript, "fetched_at": time.time()}, fp, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+        return transcript
+
+    def fetch_transcript(self, video_id: str) -> str:
+        """
+        Downloads the transcript of a video: its watch page, for the caption tracks of the player
+        response, then the preferred caption track.
+
+        **Args:**
+            video_id (str): The ID of the video.
+
+        **Returns:**
+            The transcript, one caption line per line.
+
+        Raises:
+            TranscriptUnavailable: If the video has no usable caption track.
+        """
+        response = self.http_client.get(WATCH_URL.format(video_id = video_id), cookies = REQUEST_COOKIES)
+        response.raise_for_status()
+        page = response.text
+        marker_index = page.find(PLAYER_RESPONSE_MARKER)
+        if marker_index < 0:
+            raise TranscriptUnavailable("no player response in the watch page")
+        # The player response is a JSON object assigned in an inline script, decoded up to its closing brace
+        player_response, _ = json.JSONDecoder().raw_decode(page, marker_index + len(PLAYER_RESPONSE_MARKER))
+        caption_tracks = (player_response.get("captions", {})
+                                         .get("playerCaptionsTracklistRenderer", {})
+                                         .get("captionTracks", []))
+        if not caption_tracks:
+            raise TranscriptUnavailable("no caption track")
+
+        caption_response = self.http_client.get(f"{self._pick_track(caption_tracks)['baseUrl']}&fmt=json3",
+                                                cookies = REQUEST_COOKIES)
+        caption_response.raise_for_status()
+        if not caption_response.content:
+            raise TranscriptUnavailable("empty caption track")
+        lines = []
+        for event in caption_response.json().get("events", []):
+            line = "".join(segment.get("utf8", "") for segment in event.get("segs", [])).strip()
+            if line:
+                lines.append(html.unescape(line))
+        if not lines:
+            raise TranscriptUnavailable("empty caption track")
+        return "\n".join(lines)
+
+    def _pick_track(self, caption_tracks: List[Dict]) -> Dict:
+        """
+        **Returns:**
+            The caption track in the most preferred language, a manual one rather than an automatic one.
+        """
+        def rank(track: Dict) -> tuple:
+            language = track.get("languageCode", "").split("-")[0]
+            language_rank = self.languages.index(language) if language in self.languages else len(self.languages)
+            return (language_rank, track.get("kind") == "asr")
+        return min(caption_tracks, key = rank)
+
+    def close(self) -> None:
+        """
+        Waits for the fetches in flight and stops the workers.
+        """
+        with self.lock:
+            executor, self.executor = self.executor, None
+            self.in_flight = {}
+        if executor is not None:
+            executor.shutdown(wait = True)
@@ -6,9 +6,10 @@ utils.py
 # Standard library imports
 import os
 from dotenv import load_dotenv
-import json
-import html
-import time
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 # import textwrap
 
 # Third party imports
@@ -17,8 +18,7 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import ssl
 # import yagmail
-from typing import List, Dict
-import PyPDF2
+from typing import List, Dict, Tuple, Callable
 # to speech conversion
 # import speakify
 from gtts import gTTS
@@ -27,11 +27,31 @@ from gtts import gTTS
 import google.generativeai as genai
 # from google import generativeai as genai
 
+# Local resources imports
+from rate_limiter import ModelRateLimiter
+from summary_cache import SummaryCache
+from item_store import ItemStore
+from http_client import HttpClient
+from http_cache import ConditionalGetCache
+from gemini_files import UploadedFileRegistry
+from pipeline import Pipeline
+from mail_transport import SmtpConnectionPool
+from outbox import Outbox
+from email_digest import EmailDigest
+from email_renderer import EmailRenderer
+from prompt_templates import PromptTemplateRegistry
+from model_pool import ModelClientPool
+from transcript_service import TranscriptService
+from token_budget import TokenBudget, map_chunks
+from pdf_text import PdfTextExtractor, select_sections
+
 ## CONFIGURATION
 # --- Configuration initiale ---
 load_dotenv()
 GENAI_API_KEY = os.getenv("GENAI_API_KEY")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+# Set SUMMARY_CACHE_BYPASS=1 to ignore the cached summaries (e.g. after changing a prompt template)
+SUMMARY_CACHE_BYPASS = os.getenv("SUMMARY_CACHE_BYPASS", "0") == "1"
 
 ## Local Variables
 # Technology Monitoring Category settings
@@ -72,6 +92,11 @@ smtp_server_details_gmail = {
     "smtp.server": gmail_smtp_server,
     "smtp.port": gmail_smtp_port
 }
+# SMTP server details by key: the outbox stores the key of the details, never the password
+smtp_server_details_by_key = {
+    "humbrela": smtp_server_details_humbrela,
+    "gmail": smtp_server_details_gmail
+}
 
 # ActuIA domains definition
 # actuia_domain_insurance = {
@@ -518,9 +543,120 @@ config = {
     "youtube.api.service.scopes": ["https://www.googleapis.com/auth/youtube.readonly"],
     "youtube.api.service.token.file": "token.json",
     "youtube.api.service.credentials.file": "client_secret_413915175774-jdf1o37s414ifkr4dulc8erhnjlinn89.apps.googleusercontent.com.json",
+    # Local copy of the YouTube API discovery document, refreshed when older than the max age
+    "youtube.api.discovery.cache.file": "data/youtube_discovery_document.json",
+    "youtube.api.discovery.cache.max.age.days": 30,
+    # Resolve the channels and download their playlists with batched calls instead of one channel at a time
+    "youtube.api.batch.mode": True,
+    # Maximum number of channel IDs per channels().list call and of calls per batch HTTP request
+    "youtube.api.batch.max.size": 50,
+    # Uploads playlist paging: the pages are walked back to the last video seen (the channel's high-water mark),
+    # starting with a small page when the mark is known (quiet days) and never beyond the maximum number of pages
+    "youtube.api.playlist.page.size": 50,
+    "youtube.api.playlist.first.page.size": 10,
+    "youtube.api.playlist.max.pages": 20,
+    # Poll the channels without summary ("summarize.it": False) through their public Atom feed instead of the API
+    "youtube.feeds.enabled": True,
+    # Quota units consumed by each call to the YouTube Data API methods used
+    "youtube.api.quota.costs": {"channels.list": 1, "playlistItems.list": 1},
     "genai.api.key": GENAI_API_KEY,
     "youtube.api.key": YOUTUBE_API_KEY,
-    "google.genai.sleep.time": 3,
+    # Primary and secondary (fallback) summarization models of each source, looked up by exact source name,
+    # then by the source name before " - " (e.g. "Youtube" for "Youtube - <channel>"), then "default"
+    "summary.models": {
+        "default": {"primary": "gemini-2.5-pro", "secondary": "gemini-2.5-flash"},
+        # "Youtube": {"primary": "gemini-2.5-flash", "secondary": "gemini-2.5-pro"},
+    },
+    # Number of items summarized at the same time by process_list_of_items
+    "google.genai.max.workers": 4,
+    # Quota of each Gemini model: requests per minute (rpm) and input tokens per minute (tpm)
+    "google.genai.rate.limits": {
+        "gemini-2.5-pro": {"rpm": 5, "tpm": 250000},
+        "gemini-2.5-flash": {"rpm": 10, "tpm": 250000},
+        "gemini-1.5-pro-002": {"rpm": 2, "tpm": 32000},
+        "gemini-1.5-flash": {"rpm": 15, "tpm": 1000000},
+        "gemini-1.5-flash-002": {"rpm": 15, "tpm": 1000000},
+    },
+    # Quota applied to any model missing from "google.genai.rate.limits"
+    "google.genai.rate.limit.default": {"rpm": 5, "tpm": 250000},
+    # Input token budget of the summarization prompts: a prompt estimated near the budget is measured exactly with the
+    # model's token counter; a longer transcript or article is split into chunks summarized in parallel (map), whose
+    # notes are then summarized with the source's own prompt (reduce)
+    "summary.max.input.tokens": 120000,
+    "summary.chunk.tokens": 30000,
+    "summary.chunks.max.workers": 4,
+    # How the papers' PDFs are summarized: "upload" (the file is uploaded to Gemini), "text" (the text extracted locally
+    # is sent in the prompt) or "sections" (only the abstract, introduction and conclusion are sent). A text too long
+    # for the input token budget falls back to its sections, then to the upload of the file
+    "pdf.summary.mode": "upload",
+    # Text extracted from the PDFs, cached per file content hash; the pages of the large files are split between processes
+    "pdf.text.cache.dir": "data/pdf_text",
+    "pdf.text.max.workers": 4,
+    "pdf.text.min.pages.per.worker": 8,
+    # Estimated number of input tokens of an uploaded PDF (its size is unknown before the upload)
+    "google.genai.pdf.estimated.tokens": 30000,
+    # Persistent cache of the LLM summaries
+    "summary.cache.dir": "data/summary_cache",
+    "summary.cache.max.size.bytes": 200 * 1024 * 1024,
+    "summary.cache.max.age.days": 90,
+    "summary.cache.bypass": SUMMARY_CACHE_BYPASS,
+    # SQLite store of the processed items (replaces the EVER_*.json data files)
+    "item.store.file": "data/items.sqlite3",
+    # Shared HTTP client of the scrapers (timeouts in seconds, retries on 429/5xx with an exponential backoff)
+    "http.client.connect.timeout": 10,
+    "http.client.read.timeout": 60,
+    "http.client.retries": 3,
+    "http.client.backoff.factor": 1,
+    "http.client.pool.maxsize": 10,
+    # Number of article pages fetched at the same time, in total and per host
+    "http.client.max.workers": 8,
+    "http.client.max.per.host": 4,
+    # Streaming downloads of the papers' PDFs (parallel downloads, attempts per file, chunk size in bytes)
+    "http.download.max.workers": 4,
+    "http.download.attempts": 3,
+    "http.download.chunk.size": 1024 * 1024,
+    # Transcripts of the Youtube videos (channels with "summarize.it"), fetched in the background from their caption tracks
+    "youtube.transcripts.cache.dir": "data/transcripts",
+    # A video without captions is not tried again before this delay (captions are often published later)
+    "youtube.transcripts.negative.ttl.hours": 24,
+    "youtube.transcripts.max.workers": 4,
+    "youtube.transcripts.languages": ["fr", "en"],
+    # Send an email to all its recipients in a single SMTP transaction (instead of one per recipient)
+    "smtp.single.transaction": True,
+    # On-disk outbox of the email notifications, sent in the background with retries and exponential backoff
+    "outbox.enabled": True,
+    "outbox.dir": "data/outbox",
+    "outbox.max.attempts": 6,
+    "outbox.backoff.base.seconds": 15,
+    "outbox.backoff.max.seconds": 240,
+    # Maximum time waited at the end of the run for the pending emails (the others are sent by the next run), longer than
+    # the backoff delays of all the retries of a message (15 + 30 + 60 + 120 + 240 = 465 seconds)
+    "outbox.drain.timeout.seconds": 600,
+    # Daily digest: one email per recipient (and SMTP server) grouping the new items of all the sources, sent at the end of the run
+    "email.digest.enabled": True,
+    "email.digest.subject": "[Daily Monitoring]",
+    "email.digest.template": "email_template_monitoring_digest.html",
+    # Sections of the digest spooled to disk until the digest is queued in the outbox (flushed at startup after a crash)
+    "email.digest.spool.dir": "data/digest_spool",
+    # Jinja2 templates of the email notifications, compiled once per run
+    "email.templates.dir": "./templates",
+    "email.template.content": "email_template_monitoring_content.html",
+    # Width (in vw) of the columns of the email tables, by config key of the item field (e.g. "key.json.summary");
+    # the other columns use "email.column.width.default"
+    "email.column.widths": {"key.json.thumbnail.url": 15, "key.json.summary": 55, "key.json.author": 5,
+                            "key.json.date": 5, "key.json.description": 30},
+    "email.column.width.default": 10,
+    # Pipeline of the daily run: maximum number of items (and of batches) waiting between its stages
+    "pipeline.queue.size": 16,
+    # Registry of the PDFs uploaded to Gemini (which deletes them after 48 hours)
+    "gemini.files.registry.file": "data/gemini_files.json",
+    "gemini.files.keep.across.runs": True,
+    "gemini.files.min.remaining.lifetime.hours": 12,
+    # Maximum time waited for Gemini to process an uploaded PDF before giving up (and falling back to the secondary model)
+    "gemini.files.processing.timeout.seconds": 300,
+    # Validators (ETag / Last-Modified) of the listing pages, to skip the pages unchanged since the last run
+    "http.cache.file": "data/http_cache.json",
+    "http.cache.enabled": True,
     "smtp.server.details.gmail": smtp_server_details_gmail,
     # "gmail.smtp.server": gmail_smtp_server,
     # "gmail.smtp.port": gmail_smtp_port,
@@ -567,8 +703,15 @@ config = {
     # "key.json.video.id": "videoId",
     "key.json.description": "description",
     "key.json.transcript": "transcript",
+    # Number of input tokens of the summary prompt and number of chunks it was summarized in, recorded on each item
+    "key.json.summary.input.tokens": "summaryInputTokens",
+    "key.json.summary.chunks": "summaryChunks",
     "template.file.prompt.summarize.actuia.articles": "templates/prompt_summarize_ActuIA_articles_template.md",
-    "template.file.prompt.summarize.HF.paper": "templates/prompt_summarize_HF_paper_template.md"
+    "template.file.prompt.summarize.HF.paper": "templates/prompt_summarize_HF_paper_template.md",
+    "template.file.prompt.summarize.chunk": "templates/prompt_summarize_chunk.md",
+    # Prompt templates, parsed once at startup and read again only when modified
+    "prompt.templates.dir": "templates",
+    "prompt.templates.suffix": ".md"
 }
 
 # Configure the Gemini API
@@ -576,9 +719,213 @@ genai.configure(api_key=config["genai.api.key"])
 # genai.configure(api_key=os.environ["GOOGLE_APPLICATION_CREDENTIALS"])
 # genai.init()
 
+# Gemini model clients, created once and shared by all the summarization workers
+model_pool = ModelClientPool(create_model = lambda model_name: genai.GenerativeModel(model_name = model_name))
+
+# Rate limiters shared by all the summarization workers (one per Gemini model)
+model_rate_limiters: Dict[str, ModelRateLimiter] = {}
+model_rate_limiters_lock = threading.Lock()
+
+# Input token budget of the summarization prompts (see `call_LLM_to_get_summary`)
+token_budget = TokenBudget(max_input_tokens = config["summary.max.input.tokens"],
+                           chunk_tokens = config["summary.chunk.tokens"],
+                           estimate = lambda text: estimate_tokens(text))
+
+# Text of the PDF files (papers summarized from their text, PDF to audio conversions)
+pdf_text_extractor = PdfTextExtractor(cache_dir = config["pdf.text.cache.dir"],
+                                      max_workers = config["pdf.text.max.workers"],
+                                      min_pages_per_worker = config["pdf.text.min.pages.per.worker"])
+
+# Persistent cache of the summaries, checked by call_LLM_to_get_summary before calling the model
+summary_cache = SummaryCache(cache_dir = config["summary.cache.dir"],
+                             max_size_bytes = config["summary.cache.max.size.bytes"],
+                             max_age_seconds = config["summary.cache.max.age.days"] * 24 * 3600,
+                             bypass = config["summary.cache.bypass"])
+
+# Store of the items already processed for each source
+item_store = ItemStore(db_path = config["item.store.file"])
+
+# Registry of the parsed prompt templates
+prompt_templates = PromptTemplateRegistry(templates_dir = config["prompt.templates.dir"],
+                                          suffix = config["prompt.templates.suffix"])
+prompt_templates.preload()
+# Prompt template of each Youtube channel, by channel name
+channel_prompt_templates: Dict[str, str] = {channel["name"]: channel["prompt.template"]
+                                            for channel in config["youtube.api.list.channels"]}
+
+# Summaries generated during this run, keyed by (source format, item key): an item listed by several
+# sources (e.g. overlapping website domains) is only summarized once and fanned out to each of them
+run_summaries: Dict[Tuple[str, str], str] = {}
+run_summaries_lock = threading.Lock()
+# Per item locks, so that concurrent sources wait for the summary of an item being summarized
+run_summaries_item_locks: Dict[Tuple[str, str], threading.Lock] = {}
+run_summaries_stats: Dict[str, int] = {"summarized": 0, "reused": 0}
+
+# SMTP connections kept open for the whole run, one per server and sender
+smtp_connection_pool = SmtpConnectionPool(single_transaction = config["smtp.single.transaction"])
+
+# Outbox of the email notifications (see `start_email_outbox`)
+email_outbox = Outbox(outbox_dir = config["outbox.dir"],
+                      send = lambda message, delivered: send_email(
+                          email_details = message["email_details"],
+                          smtp_server_details = smtp_server_details_by_key[message["smtp_server_details_key"]],
+                          delivered = delivered),
+                      max_attempts = config["outbox.max.attempts"],
+                      backoff_base_seconds = config["outbox.backoff.base.seconds"],
+                      backoff_max_seconds = config["outbox.backoff.max.seconds"])
+
+# Sections of the daily digest of each recipient (see `flush_email_digest`)
+email_digest = EmailDigest(spool_dir = config["email.digest.spool.dir"])
+
+# Renderer of the email notifications
+email_renderer = EmailRenderer(templates_dir = config["email.templates.dir"],
+                               column_widths = {config[key]: width for key, width in config["email.column.widths"].items()},
+                               default_width = config["email.column.width.default"],
+                               image_key = config["key.json.thumbnail.url"],
+                               link_key = config["key.json.link"])
+
+# Pipeline the new items are submitted to by process_list_of_items, if any (see `set_item_pipeline`)
+item_pipeline: Pipeline = None
+
+# HTTP client shared by all the scrapers (connection pooling, timeouts, retries and per-host statistics)
+http_client = HttpClient(connect_timeout = config["http.client.connect.timeout"],
+                         read_timeout = config["http.client.read.timeout"],
+                         retries = config["http.client.retries"],
+                         backoff_factor = config["http.client.backoff.factor"],
+                         pool_maxsize = config["http.client.pool.maxsize"])
+
+# Transcripts of the Youtube videos, prefetched when a channel's new videos are listed
+transcript_service = TranscriptService(http_client = http_client,
+                                       cache_dir = config["youtube.transcripts.cache.dir"],
+                                       negative_ttl_seconds = config["youtube.transcripts.negative.ttl.hours"] * 3600,
+                                       max_workers = config["youtube.transcripts.max.workers"],
+                                       languages = config["youtube.transcripts.languages"])
+
+# Validators of the listing pages, committed once a page's items have been processed
+listing_http_cache = ConditionalGetCache(file_path = config["http.cache.file"],
+                                         enabled = config["http.cache.enabled"])
+
+def get_item_store_source(data_file_path: str, key_field: str) -> str:
+    """
+    Retrieves the name of the item store source matching a (legacy) json data file.
+
+    The first time a source is used, the items of its existing json data file are imported into the store.
+
+    Args:
+        data_file_path (str): The path to the json data file of the source (e.g. data/EVER_hf_papers.json).
+        key_field (str): The json key holding the unique key of each item.
+
+    Returns:
+        str: The name of the source in the item store.
+    """
+    source = os.path.splitext(os.path.basename(data_file_path))[0]
+    if os.path.isfile(data_file_path):
+        imported_items = item_store.import_json_file(source = source,
+                                                     json_file_path = data_file_path,
+                                                     key_field = key_field)
+        if imported_items:
+            print(f"=> Imported {imported_items} items from '{data_file_path}' into the item store")
+    return source
+
+def import_ever_json_files(data_dir: str = config["json.key.data.dir"]) -> None:
+    """
+    One-shot import of all the EVER_*.json data files of a directory into the item store.
+
+    Videos are identified by their ID, every other item by its link. Files already imported are skipped.
+
+    Args:
+        data_dir (str): The directory containing the EVER_*.json data files.
+    """
+    if not os.path.isdir(data_dir):
+        return
+    for file_name in sorted(os.listdir(data_dir)):
+        if not (file_name.startswith("EVER") and file_name.endswith(".json")):
+            continue
+        key_field = config["key.json.id"] if file_name.endswith("_videos.json") else config["key.json.link"]
+        get_item_store_source(data_file_path = os.path.join(data_dir, file_name),
+                              key_field = key_field)
+
+# Registry of the files uploaded to Gemini, reused across model fallbacks and runs
+gemini_file_registry = UploadedFileRegistry(
+    registry_file = config["gemini.files.registry.file"],
+    min_remaining_lifetime_seconds = config["gemini.files.min.remaining.lifetime.hours"] * 3600,
+    processing_timeout_seconds = config["gemini.files.processing.timeout.seconds"],
+    keep_across_runs = config["gemini.files.keep.across.runs"])
+
+def report_run_statistics() -> None:
+    """
+    Prints the statistics collected during the run and performs the end of run housekeeping.
+    """
+    summary_cache.evict()
+    print(f"=> Summary cache: {summary_cache.stats['hits']} hits, {summary_cache.stats['misses']} misses, "
+          f"{summary_cache.stats['writes']} writes, {summary_cache.stats['evictions']} evictions")
+    print(f"=> HTTP requests per host:\n{http_client.report()}")
+    print(f"=> Listing pages:\n{listing_http_cache.report()}")
+    print(f"=> Items summarized: {run_summaries_stats['summarized']}, "
+          f"summaries reused from another source: {run_summaries_stats['reused']}")
+    smtp_connection_pool.close()
+    print(f"=> Emails: {smtp_connection_pool.stats['messages']} messages in {smtp_connection_pool.stats['transactions']} SMTP transactions, "
+          f"{smtp_connection_pool.stats['connections']} connections, {smtp_connection_pool.stats['reconnections']} reconnections, "
+          f"{smtp_connection_pool.stats['refused']} recipients refused")
+    transcript_service.close()
+    print(f"=> Transcripts: {transcript_service.stats['hits']} cached, {transcript_service.stats['misses']} fetched, "
+          f"{transcript_service.stats['unavailable']} unavailable, {transcript_service.stats['errors']} errors")
+    print(f"=> Gemini models:\n{model_pool.report()}")
+    pdf_text_extractor.close()
+    print(f"=> PDF texts: {pdf_text_extractor.stats['hits']} cached, {pdf_text_extractor.stats['extractions']} extracted "
+          f"({pdf_text_extractor.stats['pages']} pages)")
+    gemini_file_registry.cleanup()
+    print(f"=> Gemini files: {gemini_file_registry.stats['uploads']} uploads, {gemini_file_registry.stats['reuses']} reuses, "
+          f"{gemini_file_registry.stats['deletions']} deletions")
+
+def get_summary_models(source_name: str) -> Tuple[str, str]:
+    """
+    Retrieves the summarization models configured for a source in "summary.models".
+
+    Args:
+        source_name (str): The name of the source (e.g. "Youtube - <channel name>").
+
+    Returns:
+        Tuple[str, str]: The primary model and the secondary model, used if the primary one fails.
+    """
+    summary_models = config["summary.models"]
+    models = summary_models.get(source_name) or summary_models.get(source_name.split(" - ")[0]) or summary_models["default"]
+    return models["primary"], models["secondary"]
+
+def get_model_rate_limiter(model_name: str) -> ModelRateLimiter:
+    """
+    Retrieves the rate limiter of a given Gemini model, creating it from the configured quota on first use.
+
+    Args:
+        model_name (str): The name of the Gemini model.
+
+    Returns:
+        ModelRateLimiter: The rate limiter shared by every caller of the model.
+    """
+    with model_rate_limiters_lock:
+        if model_name not in model_rate_limiters:
+            limits = config["google.genai.rate.limits"].get(model_name,
+                                                            config["google.genai.rate.limit.default"])
+            model_rate_limiters[model_name] = ModelRateLimiter(
+                requests_per_minute = limits["rpm"],
+                tokens_per_minute = limits.get("tpm"))
+        return model_rate_limiters[model_name]
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimates the number of tokens of a text (about 4 characters per token).
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    return len(text) // 4 + 1 if text else 0
+
 def download_pdf(arxiv_id: str, save_path: str) -> bool:
     """
-    Downloads the PDF of a paper from arXiv given its ID.
+    Downloads the PDF of a paper from arXiv given its ID, streaming it to disk (see `HttpClient.download`).
 
     Args:
         arxiv_id (str): The arXiv ID of the paper.
@@ -588,13 +935,25 @@ def download_pdf(arxiv_id: str, save_path: str) -> bool:
         bool: True if the download was successful, False otherwise.
     """
     url = f"https://arxiv.org/pdf/{arxiv_id}.pdf"
-    response = requests.get(url)
-    if response.status_code == 200:
-        with open(save_path, "wb") as f:
-            f.write(response.content)
-        return True
+    # Each attempt resumes the partial download left by the previous one
+    for _ in range(config["http.download.attempts"]):
+        if http_client.download(url, save_path, chunk_size = config["http.download.chunk.size"]):
+            return True
     return False
 
+def download_pdfs(downloads: List[Tuple[str, str]]) -> List[bool]:
+    """
+    Downloads the PDFs of several papers from arXiv in parallel, with a bounded pool of workers.
+
+    Args:
+        downloads (List[Tuple[str, str]]): A list of tuples (arXiv ID of the paper, path where the PDF will be saved).
+
+    Returns:
+        List[bool]: For each download, True if it was successful, False otherwise.
+    """
+    with ThreadPoolExecutor(max_workers = config["http.download.max.workers"]) as executor:
+        return list(executor.map(lambda download: download_pdf(*download), downloads))
+
 def extract_node_values(json_data: dict, json_key: str) -> set:
     """Extracts values stored in a given node name from JSON data.
 
@@ -640,78 +999,6 @@ def get_value2_on_key2_from_value1_on_key1_in_channels_list(key1: str,
     if channel[key1] == value1:
       return channel.get(key2)
   return None
-import requests
-from bs4 import BeautifulSoup
-
-# Function to generate tag attributes (assumed to be defined elsewhere)
-def generate_tag_attributes(key: str, value: any, link_text: str) -> str:
-    """Generates HTML attributes based on the given key and value.
-
-    Args:
-        key: The JSON key to generate attributes for.
-        value: The JSON value associated with the key.
-
-    Returns:
-        A string containing the HTML attributes.
-    """
-
-    attributes = ""
-    if key == config["key.json.thumbnail.url"]:
-        # Set the width attribute for image URLs to 15vw and include the image tag
-        attributes += f" text-align: center; width: 15vw'><a href='{link_text}'><img style='max-width: 100%; height: auto;' src='{value}'></a>"
-    elif key == config["key.json.summary"]:
-        # Set the width attribute for summary content to 55vw
-        attributes += f" text-align: left; width: 55vw'>{value}"
-    elif key == config["key.json.author"]:
-        # Set the width attribute for summary author to 5vw
-        attributes += f" text-align: left; width: 5vw'>{value}"
-    elif key == config["key.json.date"]:
-        # Set the width attribute for summary date to 5vw
-        attributes += f" text-align: left; width: 5vw'>{value}"
-    elif key == config["key.json.description"]:
-        # Set the width attribute for summary description to 30vw
-        attributes += f" text-align: left; width: 30vw'>{value}"
-    else:
-        # Set the width attribute for any other content to 10vw
-        attributes += f" text-align: left; width: 10vw'>{value}"
-    
-    # Return a string containing the HTML attributes.
-    return attributes
-
-# Function to generate header tag attributes (assumed to be defined elsewhere)
-def generate_header_tag_attributes(key: str, value: str) -> str:
-    """Generates HTML attributes based on the given key and value.
-
-    Args:
-        key: The JSON key to generate attributes for.
-        value: The JSON value associated with the key.
-
-    Returns:
-        A string containing the HTML attributes.
-    """
-
-    attributes = ""
-    if key == config["key.json.thumbnail.url"]:
-        # Set the width attribute for image URLs to 15vw and include the image tag
-        attributes += f""" width: 15vw'>{value}"""
-    elif key == config["key.json.summary"]:
-        # Set the width attribute for summary content to 55vw
-        attributes += f""" width: 55vw'>{value}"""
-    elif key == config["key.json.author"]:
-        # Set the width attribute for summary author to 5vw
-        attributes += f""" width: 5vw'>{value}"""
-    elif key == config["key.json.date"]:
-        # Set the width attribute for summary date to 5vw
-        attributes += f""" width: 5vw'>{value}"""
-    elif key == config["key.json.description"]:
-        # Set the width attribute for summary description to 30vw
-        attributes += f""" width: 30vw'>{value}"""
-    else:
-        # Set the width attribute for any other content to 10vw
-        attributes += f""" width: 10vw'>{value}"""
-    
-    # Return a string containing the HTML attributes.
-    return attributes
 
 def json_to_html(json_data: dict, keys_to_ignore: list[str]) -> str:
     """Converts a JSON object into an HTML table.
@@ -769,36 +1056,10 @@ def json_to_html(json_data: dict, keys_to_ignore: list[str]) -> str:
 #     </body>
 # </html>"""
     
-    # Build HTML table header
-    html_table_header = ''.join(f"""
-                    <th style='padding: 0; text-align: center; border: 1px solid #ccc; background-color: #f2f2f2;\
-{generate_header_tag_attributes(key, html.escape(key))}</th>""" for key in json_data[0].keys() if key not in keys_to_ignore)
-    # print(f"html_table_header: {html_table_header}") # For Debug Only
-
-    # Build HTML table body
-    # print(f"==============> Items in json_data list: {''.join(f'{', '.join(f'{key + ', ' + value}' for key, value in item.items())}' for item in json_data)}") # For Debug Only
-    html_table_body = ""
-    for item in json_data:
-        # print(f"==============> Key, value in current item: {', '.join(f'{key + ', ' + value}' for key, value in item.items())}") # For Debug Only
-        html_table_body += """
-                <tr>"""
-        html_table_body += ''.join(f"""
-                    <td style='padding: 8px; border: 1px solid #ccc;\
-{generate_tag_attributes(key, value, item.get(config.get('key.json.link'), [1]))}</td>""" for key, value in item.items() if key not in keys_to_ignore)
-        html_table_body += """
-                </tr>"""
-    # print(f"html_table_body: {html_table_body}") # For Debug Only
-    
-    # Initiate template_html_file variable
-    template_html_file_path = "./templates/email_template_monitoring_content.html"
-    # Load the prompt template for summarizing videos from the specific channel
-    with open(template_html_file_path, "r") as f:
-        template_html_file = f.read()
-
-    # Format the prompt by replacing placeholders with actual video information
-    html_content = template_html_file.\
-        replace("{htmlTableHeader}", html_table_header if html_table_header else ""). \
-            replace("{htmlTableBody}", html_table_body if html_table_body else "")
+    # Render the compiled template, the rows being rendered through the column plan of the items
+    html_content = email_renderer.render(config["email.template.content"],
+                                         html_table_header = email_renderer.table_header(json_data, keys_to_ignore),
+                                         rows = email_renderer.iter_rows(json_data, keys_to_ignore))
     
     # Encode html content to utf-8
     # html_content = html_content.encode('utf-8') # Raises an error
@@ -807,75 +1068,60 @@ def json_to_html(json_data: dict, keys_to_ignore: list[str]) -> str:
     # Return the HTML table representation of the JSON data as a string.
     return html_content
 
-def send_email_via_smtplib_gmail(email_details: Dict,
-                                 smtp_server_details: Dict) -> None:
+def build_email_message(email_details: Dict, sender: str) -> str:
     """
-    Sends an email to a list of recipients using Gmail's SMTP server.
+    Builds and serializes, once, the message of an email notification.
 
     Args:
         email_details (Dict): A dictionary that contains details for the email notification to be sent (i.e.: list of recipient, subject, body)
-        smtp_server_details (Dict): A dictionary that contains SMTP server details in order to send email notification.
+        sender (str): The email address of the sender.
 
-    Raises:
-        Exception: If an error occurs during email sending.
+    Returns:
+        str: The serialized message.
     """
-    
     # Create message
     msg = MIMEMultipart('alternative')
     msg['Subject'] = email_details[config["key.json.email.detail.subject"]]
-    msg['From'] = smtp_server_details["sender"]
-    
-    # Connect to Gmail's SMTP server using SSL
-    with smtplib.SMTP_SSL(smtp_server_details["smtp.server"],
-                          smtp_server_details["smtp.port"]) as mail_server:
-        try:
-            mail_server.ehlo() # Can be omitted
-            # Login to the SMTP server using the sender's credentials.
-            mail_server.login(smtp_server_details["sender"],
-                              smtp_server_details["sender.password"])
-            
-            # Send the email. The sendmail function requires the sender's email, the list of recipients, and the email message as a string.
-            html_content = email_details[config["key.json.email.detail.body"]]
-            text_content = "This is an example of a plain text email."
-            
-            # Attach parts into message container.
-            msg.attach(MIMEText(text_content, 'plain'))
-            msg.attach(MIMEText(html_content, 'html'))
-            
-            # Send the email
-            for recipient in email_details[config["key.json.email.detail.recipients"]]:
-                # Add recipients to the message
-                # msg['To'] = recipient
-                # mail_server.sendmail(msg['From'], msg['To'], msg.as_string())
-                mail_server.sendmail(msg['From'], recipient, msg.as_string())
-                # mail_server.sendmail(msg['From'], msg['To'], msg.as_string())
-                print(f"Email sent successfully to: '{recipient}'")
-        except Exception as e:
-            # Print any error messages to stdout
-            print("Error sending email:", e)
-            raise e
-        finally:
-            # Ensure the SMTP server connection is closed, even if an exception occurs
-            mail_server.quit()
-
-def send_email_via_smtplib_humbrela(email_details: Dict,
-                                    smtp_server_details: Dict) -> None:
+    msg['From'] = sender
+    html_content = email_details[config["key.json.email.detail.body"]]
+    text_content = "This is an example of a plain text email."
+    # Attach parts into message container.
+    msg.attach(MIMEText(text_content, 'plain'))
+    msg.attach(MIMEText(html_content, 'html'))
+    return msg.as_string()
+
+def connect_smtp_gmail(smtp_server_details: Dict) -> smtplib.SMTP:
     """
-    Sends an email to a list of recipients using Humbrela's SMTP server.
+    Opens a connection to Gmail's SMTP server using SSL, and logs in.
 
     Args:
-        email_details (Dict): A dictionary that contains details for the email notification to be sent (i.e.: list of recipient, subject, body)
         smtp_server_details (Dict): A dictionary that contains SMTP server details in order to send email notification.
 
-    Raises:
-        Exception: If an error occurs during email sending.
+    Returns:
+        smtplib.SMTP: The logged in connection.
     """
-    
-    # Create message
-    msg = MIMEMultipart('alternative')
-    msg['Subject'] = email_details[config["key.json.email.detail.subject"]]
-    msg['From'] = humbrela_sender_email
+    mail_server = smtplib.SMTP_SSL(smtp_server_details["smtp.server"],
+                                   smtp_server_details["smtp.port"])
+    try:
+        mail_server.ehlo() # Can be omitted
+        # Login to the SMTP server using the sender's credentials.
+        mail_server.login(smtp_server_details["sender"],
+                          smtp_server_details["sender.password"])
+    except Exception:
+        mail_server.close()
+        raise
+    return mail_server
+
+def connect_smtp_humbrela(smtp_server_details: Dict) -> smtplib.SMTP:
+    """
+    Opens a connection to Humbrela's SMTP server, starts TLS and logs in.
 
+    Args:
+        smtp_server_details (Dict): A dictionary that contains SMTP server details in order to send email notification.
+
+    Returns:
+        smtplib.SMTP: The logged in connection.
+    """
     # Create a secure SSL context with certificate verification disabled (adjust as needed)
     context = ssl.create_default_context()
     ## NOT SECURED ENOUGH: to accept self-signed certificates
@@ -887,36 +1133,70 @@ def send_email_via_smtplib_humbrela(email_details: Dict,
     # context.options |= ssl.OP_NO_SSLv2 | ssl.OP_NO_SSLv3 | ssl.OP_NO_TLSv1 | ssl.OP_NO_TLSv1_1
     
     # Connect to the SMTP server
-    with smtplib.SMTP(smtp_server_details["smtp.server"],
-                      smtp_server_details["smtp.port"]) as mail_server:
-        try:
-            mail_server.ehlo() # Can be omitted
-            mail_server.starttls(context=context) # Start TLS encryption if required by your provider
-            # server.ehlo() # Can be omitted
-            # Login to the SMTP server using the sender's credentials.
-            mail_server.login(smtp_server_details["sender"],
-                              smtp_server_details["sender.password"])
-            # Send the email. The sendmail function requires the sender's email, the list of recipients, and the email message as a string.
-            html_content = email_details[config["key.json.email.detail.body"]]
-            text_content = "This is an example of a plain text email."
-            # Attach parts into message container.
-            msg.attach(MIMEText(text_content, 'plain'))
-            msg.attach(MIMEText(html_content, 'html'))
-            # Send the email
-            for recipient in email_details[config["key.json.email.detail.recipients"]]:
-                # Add recipients to the message
-                # msg['To'] = recipient
-                # mail_server.sendmail(msg['From'], msg['To'], msg.as_string())
-                mail_server.sendmail(msg['From'], recipient, msg.as_string())
-                # mail_server.sendmail(msg['From'], msg['To'], msg.as_string())
-                print(f"Email sent successfully to: '{recipient}'")
-        except Exception as e:
-            # Print any error messages to stdout
-            print("Error sending email:", e)
-            raise e
-        finally:
-            # Ensure the SMTP server connection is closed, even if an exception occurs
-            mail_server.quit()
+    mail_server = smtplib.SMTP(smtp_server_details["smtp.server"],
+                               smtp_server_details["smtp.port"])
+    try:
+        mail_server.ehlo() # Can be omitted
+        mail_server.starttls(context=context) # Start TLS encryption if required by your provider
+        # Login to the SMTP server using the sender's credentials.
+        mail_server.login(smtp_server_details["sender"],
+                          smtp_server_details["sender.password"])
+    except Exception:
+        mail_server.close()
+        raise
+    return mail_server
+
+def send_email_via_smtplib_gmail(email_details: Dict,
+                                 smtp_server_details: Dict,
+                                 delivered: List[str] = None) -> None:
+    """
+    Sends an email to a list of recipients using Gmail's SMTP server, through the pooled connection of the sender.
+
+    Args:
+        email_details (Dict): A dictionary that contains details for the email notification to be sent (i.e.: list of recipient, subject, body)
+        smtp_server_details (Dict): A dictionary that contains SMTP server details in order to send email notification.
+        delivered (List[str], optional): The recipients already delivered by a previous attempt, skipped; the recipients
+            delivered are appended to it. Defaults to None.
+
+    Raises:
+        Exception: If an error occurs during email sending.
+    """
+    try:
+        smtp_connection_pool.send(smtp_server_details = smtp_server_details,
+                                  connect = connect_smtp_gmail,
+                                  recipients = email_details[config["key.json.email.detail.recipients"]],
+                                  delivered = delivered,
+                                  message = build_email_message(email_details, smtp_server_details["sender"]))
+    except Exception as e:
+        # Print any error messages to stdout
+        print("Error sending email:", e)
+        raise e
+
+def send_email_via_smtplib_humbrela(email_details: Dict,
+                                    smtp_server_details: Dict,
+                                    delivered: List[str] = None) -> None:
+    """
+    Sends an email to a list of recipients using Humbrela's SMTP server, through the pooled connection of the sender.
+
+    Args:
+        email_details (Dict): A dictionary that contains details for the email notification to be sent (i.e.: list of recipient, subject, body)
+        smtp_server_details (Dict): A dictionary that contains SMTP server details in order to send email notification.
+        delivered (List[str], optional): The recipients already delivered by a previous attempt, skipped; the recipients
+            delivered are appended to it. Defaults to None.
+
+    Raises:
+        Exception: If an error occurs during email sending.
+    """
+    try:
+        smtp_connection_pool.send(smtp_server_details = smtp_server_details,
+                                  connect = connect_smtp_humbrela,
+                                  recipients = email_details[config["key.json.email.detail.recipients"]],
+                                  delivered = delivered,
+                                  message = build_email_message(email_details, humbrela_sender_email))
+    except Exception as e:
+        # Print any error messages to stdout
+        print("Error sending email:", e)
+        raise e
 
 def send_email_via_yagmail_for_gmail(recipients: list, subject: str, body: str) -> None:
     """
@@ -952,7 +1232,8 @@ def send_email_via_yagmail_for_gmail(recipients: list, subject: str, body: str)
 
 def send_email(email_details: Dict,
                # recipients: list, subject: str, body: str,
-               smtp_server_details: Dict) -> None:
+               smtp_server_details: Dict,
+               delivered: List[str] = None) -> None:
     """
     Sends an email using the appropriate SMTP server based on the sender's email address.
 
@@ -961,22 +1242,112 @@ def send_email(email_details: Dict,
     Args:
         email_details (Dict): A dictionary that contains details for the email notification to be sent (i.e.: list of recipient, subject, body)
         smtp_server_details (Dict): A dictionary that contains SMTP server details in order to send email notification.
+        delivered (List[str], optional): The recipients already delivered by a previous attempt, skipped; the recipients
+            delivered are appended to it. Defaults to None.
     """
 
     if "gmail" in smtp_server_details["sender"]:
         # If the sender's email is a Gmail address, use the Gmail SMTP server
         send_email_via_smtplib_gmail(email_details = email_details,
-                                     smtp_server_details = smtp_server_details)
+                                     smtp_server_details = smtp_server_details,
+                                     delivered = delivered)
     elif "humbrela" in smtp_server_details["sender"]:
         # If the sender's email is a Humbrela address, use the Humbrela SMTP server
         send_email_via_smtplib_humbrela(email_details = email_details,
-                                        smtp_server_details = smtp_server_details)
+                                        smtp_server_details = smtp_server_details,
+                                        delivered = delivered)
     else:
         # If the sender's email is not associated with Gmail or Humbrela, raise an error
         raise ValueError("Sender's email address must be a Gmail or Humbrela address.")
     # send_email_via_yagmail_for_gmail(recipients, subject, body)
     # print("Do nothing")
 
+def get_smtp_server_details_key(smtp_server_details: Dict) -> str:
+    """
+    Args:
+        smtp_server_details (Dict): A dictionary that contains SMTP server details.
+
+    Returns:
+        str: The key of the SMTP server details in `smtp_server_details_by_key`, or None if they are not registered.
+    """
+    for key, registered_details in smtp_server_details_by_key.items():
+        if registered_details == smtp_server_details:
+            return key
+    return None
+
+def start_email_outbox() -> None:
+    """
+    Starts the background sender of the email outbox, which first sends the emails left pending by the previous runs.
+    """
+    if config["outbox.enabled"]:
+        email_outbox.start()
+
+def drain_email_outbox() -> None:
+    """
+    Waits for the pending emails to be sent (at most "outbox.drain.timeout.seconds") and stops the outbox's background sender.
+    """
+    if not email_outbox.is_running():
+        return
+    still_pending = email_outbox.drain(timeout = config["outbox.drain.timeout.seconds"])
+    print(f"=> Outbox: {email_outbox.stats['sent']} emails sent, {email_outbox.stats['retries']} retries, "
+          f"{email_outbox.stats['failed']} given up, {still_pending} left for the next run")
+
+def queue_email(email_details: Dict,
+                smtp_server_details: Dict) -> None:
+    """
+    Queues an email notification in the outbox, to be sent in the background. The email is sent right away
+    if the outbox is not running or if the SMTP server details are not registered.
+
+    Args:
+        email_details (Dict): A dictionary that contains details for the email notification to be sent (i.e.: list of recipient, subject, body)
+        smtp_server_details (Dict): A dictionary that contains SMTP server details in order to send email notification.
+    """
+    smtp_server_details_key = get_smtp_server_details_key(smtp_server_details)
+    if not email_outbox.is_running() or smtp_server_details_key is None:
+        send_email(email_details = email_details,
+                   smtp_server_details = smtp_server_details)
+        return
+    email_outbox.enqueue({"email_details": email_details,
+                          "smtp_server_details_key": smtp_server_details_key})
+
+def flush_email_digest() -> None:
+    """
+    Sends (through the outbox) the daily digest of each recipient: one email per recipient and SMTP server,
+    with one section per source that had new items during the run.
+    """
+    digests = email_digest.pop_digests()
+    if not digests:
+        return
+    date = datetime.now().strftime("%Y-%m-%d")
+    for recipient, smtp_server_details_key, sections, spooled_paths in digests:
+        digest_title = f"{config['email.digest.subject']} - {date} - {sum(len(section['items']) for section in sections)} new items from {len(sections)} sources"
+        # The rows of each section are rendered as the digest is streamed
+        html_content = email_renderer.render(config["email.digest.template"],
+                                             digest_title = digest_title,
+                                             sections = [{"title": section["title"],
+                                                          "items": section["items"],
+                                                          "html_table_header": email_renderer.table_header(section["items"], section["keys_to_ignore"]),
+                                                          "rows": email_renderer.iter_rows(section["items"], section["keys_to_ignore"])}
+                                                         for section in sections])
+        email_details = {config["key.json.email.detail.recipients"]: [recipient],
+                         config["key.json.email.detail.subject"]: digest_title,
+                         config["key.json.email.detail.body"]: html_content}
+        queue_email(email_details = email_details,
+                    smtp_server_details = smtp_server_details_by_key[smtp_server_details_key])
+        # This digest is now in the outbox (or sent): its sections no longer need to be spooled, even if a later one fails
+        email_digest.remove_spooled(spooled_paths)
+    print(f"=> Digest: {email_digest.stats['sections']} source notifications grouped into {len(digests)} emails")
+
+def recover_email_digest() -> None:
+    """
+    Sends (through the outbox) the digest sections spooled by a previous run that did not reach its digest flush
+    (e.g. killed or crashed), as their items are already stored as known and will not be notified again.
+    """
+    recovered = email_digest.load_spooled()
+    if recovered:
+        print(f"=> Digest: {recovered} source notifications left by a previous run")
+        flush_email_digest()
+
 def filter_unknown_items(items: list, known_items_keys: list, key: str) -> list:
     """Filters a list of items (articles, videos, etc.) to exclude known items.
     
@@ -1007,11 +1378,7 @@ def pdf_to_audio_using_speakify(pdf_file: str, language:str='en'):
     language (str): The language to use for text-to-speech (default: 'en').
   """
 
-  with open(pdf_file, 'rb') as pdf_reader:
-    reader = PyPDF2.PdfReader(pdf_reader)
-    text = ""
-    for page in reader.pages:
-      text += page.extract_text()
+  text = pdf_text_extractor.extract(pdf_file, compute_file_sha256(pdf_file))
 
   # speakify.speak(text, language=language)
 
@@ -1033,12 +1400,8 @@ def pdf_to_audio(pdf_file: str, language: str = 'en',
     """
 
     try:
-        # Extract text from the PDF
-        with open(pdf_file, 'rb') as pdf_reader:
-            reader = PyPDF2.PdfReader(pdf_reader)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
+        # Extract text from the PDF (pages extracted in parallel, text cached per file content)
+        text = pdf_text_extractor.extract(pdf_file, compute_file_sha256(pdf_file))
 
         # Create and save the audio file
         myobj = gTTS(text=text, lang=language, slow=False)
@@ -1066,6 +1429,124 @@ def convert_to_voice_recorder(tmp_raw_sources_dir: str = config["json.key.tmp.ra
     pdf_file = f"{tmp_raw_sources_dir}/BACKUP-2024.09.30-hf_pdfs/2409.17280.pdf"
     pdf_to_audio(pdf_file, language='en')
 
+def build_video_prompt(channel_name: str, title: str, description: str,
+                       date: str, transcript: str, url: str) -> str:
+    """
+    Builds the prompt to summarize a Youtube video from the prompt template of its channel.
+
+    Args:
+        channel_name (str): The name of the Youtube channel that uploaded the video.
+        title (str): The title of the Youtube video.
+        description (str): The description of the Youtube video.
+        date (str): The date the Youtube video was published.
+        transcript (str): The text transcript of the Youtube video.
+        url (str): The URL of the Youtube video.
+
+    Returns:
+        str: The rendered prompt.
+    """
+
+    # Find the appropriate prompt template based on the channel name
+    template_file = channel_prompt_templates.get(channel_name)
+    if template_file is None:
+        raise ValueError(f"No prompt template configured for the Youtube channel '{channel_name}'")
+
+    # Format the prompt by filling the placeholders with actual video information
+    return prompt_templates.render(template_file,
+                                   channelName = channel_name,
+                                   title = title,
+                                   description = description,
+                                   date = date,
+                                   transcript = transcript,
+                                   url = url)
+
+def build_text_content_prompt(title: str, author: str, date: str, content: str) -> str:
+    """
+    Builds the prompt to summarize an article.
+
+    Args:
+        title (str): The title of the article.
+        author (str): The author of the article.
+        date (str): The date of the article.
+        content (str): The text content of the article.
+
+    Returns:
+        str: The rendered prompt.
+    """
+
+    # Format the prompt for summarizing ActuIA articles by filling the placeholders with actual article information
+    return prompt_templates.render(config["template.file.prompt.summarize.actuia.articles"],
+                                   title = title,
+                                   author = author,
+                                   date = date,
+                                   content = content)
+
+def build_pdf_prompt(title: str, authors: str, content: str = None) -> str:
+    """
+    Builds the prompt sent next to the PDF file of a research paper, or with the text extracted from it.
+
+    Args:
+        title (str): The title of the paper.
+        authors (str): The authors of the paper (comma-separated list or single author).
+        content (str, optional): The text of the paper, sent in the prompt instead of the PDF file. Defaults to None.
+
+    Returns:
+        str: The rendered prompt.
+    """
+
+    # Fill the placeholders of the prompt template for summarizing Hugging Face papers with actual title and authors
+    prompt = prompt_templates.render(config["template.file.prompt.summarize.HF.paper"],
+                                     title = title,
+                                     authors = authors)
+    if content is not None:
+        prompt = f"{prompt}\nContent:\n{content}"
+    return prompt
+
+def build_summary_prompt(item: Dict, source_format: str) -> str:
+    """
+    Builds the prompt that summarizes an item, accordingly to its source format.
+
+    **Args:**
+        item (Dict): A dictionary containing the needed attributes to create a summary from.
+        source_format (str): The format of the content to be summarized. It could be a PDF file, a regular text content, or a Youtube video.
+
+    **Returns:**
+        The rendered prompt.
+    """
+    if (source_format == config["key.json.source.format.pdf"]):
+        return build_pdf_prompt(title   = item[config["key.json.title"]],
+                                authors = item[config["key.json.authors"]])
+    elif (source_format == config["key.json.source.format.text.content"]):
+        return build_text_content_prompt(title   = item[config["key.json.title"]],
+                                         author  = item[config["key.json.author"]],
+                                         date    = item[config["key.json.date"]],
+                                         content = item[config["key.json.content"]])
+    elif (source_format == config["key.json.source.format.youtube.video"]):
+        return build_video_prompt(channel_name = item[config["key.json.channel.name"]],
+                                  title        = item[config["key.json.title"]],
+                                  description  = item[config["key.json.description"]],
+                                  date         = item[config["key.json.date"]],
+                                  transcript   = item[config["key.json.transcript"]],
+                                  url          = item[config["key.json.link"]])
+    # If the source's format is not recognized, i.e. not a PDF, a regular text content or a Youtube video, raise an ValueError
+    raise ValueError("Source's format is not recognized, i.e. not a PDF, a regular text content or a Youtube video.")
+
+def compute_file_sha256(file_path: str) -> str:
+    """
+    Computes the sha256 hash of a file's content, reading it by chunks.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: The hexadecimal sha256 hash of the file.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def summarize_video_from_transcript(channel_name: str, title: str,
                                     description: str, date: str,
                                     transcript: str, url: str,
@@ -1088,33 +1569,19 @@ def summarize_video_from_transcript(channel_name: str, title: str,
         str: The generated summary of the video content, or None if an error occurs.
     """
 
-    # Initialize a GenerativeModel object using the provided model name
-    model = genai.GenerativeModel(model_name = model_name)
-
-    # Find the appropriate prompt template based on the channel name
-    template_file = get_value2_on_key2_from_value1_on_key1_in_channels_list(
-        key1 = "name",
-        value1 = channel_name,
-        key2 = "prompt.template",
-        channels = config["youtube.api.list.channels"])
-
-    # Load the prompt template for summarizing videos from the specific channel
-    with open(template_file, "r") as f:
-        prompt_template = f.read()
-
-    # Format the prompt by replacing placeholders with actual video information
-    prompt = prompt_template.replace("{channelName}", channel_name if channel_name else "") \
-        .replace("{title}", title if title else "") \
-        .replace("{description}", description if description else "") \
-        .replace("{date}", date if date else "") \
-        .replace("{transcript}", transcript if transcript else "") \
-        .replace("{url}", url if url else "")
-        
+    # Format the prompt from the channel's template with actual video information
+    prompt = build_video_prompt(channel_name = channel_name,
+                                title = title,
+                                description = description,
+                                date = date,
+                                transcript = transcript,
+                                url = url)
     # print(f"prompt: {[prompt]}") # For Debug Only
 
     try:
-        # Generate content using the formatted prompt
-        response = model.generate_content([prompt])
+        # Wait for the model's quota, then generate content using the formatted prompt
+        get_model_rate_limiter(model_name).acquire(estimate_tokens(prompt))
+        response = model_pool.generate_content(model_name, [prompt])
     except Exception as e:
         print(f"Failed to summarize video '{title}' due to {e}")
         return None
@@ -1146,18 +1613,15 @@ def summarize_from_text_content(title: str, author: str, date: str,
         str: The generated summary of the article content.
     """
 
-    # Initialize a GenerativeModel object using the provided model name
-    model = genai.GenerativeModel(model_name=model_name)
-
-    # Load the prompt template for summarizing ActuIA articles
-    with open(config["template.file.prompt.summarize.actuia.articles"], "r") as f:
-        prompt_template = f.read()
+    # Format the prompt with actual article information
+    prompt = build_text_content_prompt(title = title,
+                                       author = author,
+                                       date = date,
+                                       content = content)
 
-    # Format the prompt by replacing placeholders with actual article information
-    prompt = prompt_template.replace("{title}", title).replace("{author}", author).replace("{date}", date).replace("{content}", content)
-
-    # Generate content using the formatted prompt
-    response = model.generate_content([prompt])
+    # Wait for the model's quota, then generate content using the formatted prompt
+    get_model_rate_limiter(model_name).acquire(estimate_tokens(prompt))
+    response = model_pool.generate_content(model_name, [prompt])
 
     # Extract the text from the response object and return it as the summary
     return response.text
@@ -1179,25 +1643,75 @@ def summarize_from_pdf_file(title: str, authors: str, pdf_path: str,
         str: The generated summary of the research paper.
     """
 
-    # Initialize a GenerativeModel object using the provided model name
-    model = genai.GenerativeModel(model_name=model_name)
+    # Upload the PDF file to Gemini with a descriptive display name, unless it was already uploaded
+    pdf_file = gemini_file_registry.get_or_upload(path = pdf_path,
+                                                  content_hash = compute_file_sha256(pdf_path),
+                                                  display_name = f"paper_{title}")
+
+    # Format the prompt with actual title and authors
+    prompt = build_pdf_prompt(title = title,
+                              authors = authors)
+
+    # Wait for the model's quota, then generate content using the uploaded PDF and the formatted prompt
+    get_model_rate_limiter(model_name).acquire(
+        estimate_tokens(prompt) + config["google.genai.pdf.estimated.tokens"])
+    response = model_pool.generate_content(model_name, [pdf_file, prompt])
+
+    # Extract the text from the response object and return it as the summary
+    return response.text
+
+def summarize_from_pdf_text(title: str, authors: str, content: str,
+                            model_name: str) -> str:
+    """
+    Summarizes a research paper using the Gemini API, from the text extracted from its PDF file.
 
-    # Upload the PDF file to Gemini with a descriptive display name
-    pdf_file = genai.upload_file(path=pdf_path, display_name=f"paper_{title}")
+    Args:
+        title (str): The title of the paper.
+        authors (str): The authors of the paper (comma-separated list or single author).
+        content (str): The text of the paper (whole or selected sections, see `get_pdf_text`).
+        model_name (str): The name of the Gemini model to be used for summarization.
 
-    # Load the prompt template for summarizing Hugging Face papers
-    with open(config["template.file.prompt.summarize.HF.paper"], "r") as f:
-        prompt_template = f.read()
+    Returns:
+        str: The generated summary of the research paper.
+    """
 
-    # Replace placeholders in the prompt template with actual title and authors
-    prompt = prompt_template.replace("{title}", title).replace("{authors}", authors)
+    # Format the prompt with actual title, authors and text
+    prompt = build_pdf_prompt(title = title,
+                              authors = authors,
+                              content = content)
 
-    # Generate content using the uploaded PDF and the formatted prompt
-    response = model.generate_content([pdf_file, prompt])
+    # Wait for the model's quota, then generate content using the formatted prompt
+    get_model_rate_limiter(model_name).acquire(estimate_tokens(prompt))
+    response = model_pool.generate_content(model_name, [prompt])
 
     # Extract the text from the response object and return it as the summary
     return response.text
 
+def get_pdf_text(pdf_path: str, content_hash: str) -> str:
+    """
+    Retrieves the text of a paper to be sent in its summary prompt, accordingly to the configuration key "pdf.summary.mode".
+
+    Args:
+        pdf_path (str): The path to the PDF file of the paper.
+        content_hash (str): The sha256 hash of the PDF file.
+
+    Returns:
+        str: The whole text ("text" mode), the abstract, introduction and conclusion ("sections" mode),
+            or None if the PDF file is to be uploaded ("upload" mode).
+    """
+    mode = config["pdf.summary.mode"]
+    if mode not in ("text", "sections"):
+        return None
+    try:
+        text = pdf_text_extractor.extract(pdf_path, content_hash)
+    except Exception as e:
+        print(f"Failed to extract the text of '{pdf_path}', uploading the file instead: {e}")
+        return None
+    if not text.strip():
+        # Scanned paper without text layer
+        return None
+    return select_sections(text) if mode == "sections" else text
+
 def call_LLM_to_get_summary(item: Dict, source_format: str, model_name: str) -> str:
     """
     In order to create a content's summary, the function calls the right LLM accordingly to the source format and model name passed as parameters.
@@ -1211,10 +1725,72 @@ def call_LLM_to_get_summary(item: Dict, source_format: str, model_name: str) ->
     **Returns:**
         The summary created from the given content.
     """
-    # Initialize output summary
-    summary = None
-    # Depending on the source format, call the right function to summarize the item using the model name passed as parameter
     if (source_format == config["key.json.source.format.pdf"]):
+        # A paper is cached under its link and the prompt of its title and authors, whether its temporary PDF file
+        # still exists or not (it is deleted once the paper is notified): summarize_source reuses the summaries of
+        # process_hf_daily. The key does not depend on "pdf.summary.mode" either
+        prompt = build_pdf_prompt(title = item[config["key.json.title"]],
+                                  authors = item[config["key.json.authors"]])
+        content_hash = item[config["key.json.link"]]
+    else:
+        prompt = build_summary_prompt(item, source_format)
+        content_hash = ""
+
+    # Look for a summary of the exact same prompt and content in the cache before calling the model (or counting tokens)
+    long_text_key = get_long_text_key(source_format)
+    cache_key = summary_cache.make_key(source_format = source_format,
+                                       model_name = model_name,
+                                       prompt = prompt,
+                                       content_hash = content_hash)
+    summary = summary_cache.get(cache_key)
+    if summary is not None:
+        if long_text_key is not None:
+            # Measured with the estimate only: a cache hit doesn't call the model's token counter
+            measure_summary_prompt(item, prompt, long_text_key)
+        return summary
+
+    # Measure the prompt: a transcript or an article too long for a single prompt is summarized in chunks
+    count_exact = lambda text: model_pool.get(model_name).count_tokens(text).total_tokens
+    chunks = None
+    if long_text_key is not None:
+        chunks = measure_summary_prompt(item, prompt, long_text_key, count_exact = count_exact)
+
+    pdf_text = None
+    if (source_format == config["key.json.source.format.pdf"]) and os.path.exists(item[config["key.json.pdf.path"]]):
+        pdf_text = get_pdf_text(item[config["key.json.pdf.path"]],
+                                compute_file_sha256(item[config["key.json.pdf.path"]]))
+        if pdf_text is not None:
+            # A paper too long to be sent as text falls back to its main sections, then to the upload of its PDF file
+            prompt_tokens = token_budget.count(build_pdf_prompt(title = item[config["key.json.title"]],
+                                                                authors = item[config["key.json.authors"]],
+                                                                content = pdf_text),
+                                               count_exact = count_exact)
+            if not token_budget.fits(prompt_tokens):
+                pdf_text = select_sections(pdf_text)
+                prompt_tokens = token_budget.count(build_pdf_prompt(title = item[config["key.json.title"]],
+                                                                    authors = item[config["key.json.authors"]],
+                                                                    content = pdf_text),
+                                                   count_exact = count_exact)
+            if token_budget.fits(prompt_tokens):
+                item[config["key.json.summary.input.tokens"]] = prompt_tokens
+            else:
+                pdf_text = None
+    
+    # Depending on the source format, call the right function to summarize the item using the model name passed as parameter
+    if chunks:
+        print(f"Summarizing '{item[config['key.json.title']]}' in {len(chunks)} chunks ({item[config['key.json.summary.input.tokens']]} input tokens)")
+        summary = summarize_in_chunks(item = item,
+                                      source_format = source_format,
+                                      chunks = chunks,
+                                      model_name = model_name)
+    elif (source_format == config["key.json.source.format.pdf"]) and pdf_text is not None:
+        summary = summarize_from_pdf_text(
+            title      = item[config["key.json.title"]],
+            authors    = item[config["key.json.authors"]],
+            content    = pdf_text,
+            model_name = model_name
+        )
+    elif (source_format == config["key.json.source.format.pdf"]):
         # print("Source format: PDF file.") # For Debug Only
         summary = summarize_from_pdf_file(
             title      = item[config["key.json.title"]],
@@ -1254,9 +1830,235 @@ def call_LLM_to_get_summary(item: Dict, source_format: str, model_name: str) ->
         # If the source's format is not recognized, i.e. not a PDF, a regular text content or a Youtube video, raise an ValueError
         raise ValueError("Source's format is not recognized, i.e. not a PDF, a regular text content or a Youtube video.")
     
+    # Store the computed summary for the next identical request
+    if summary is not None:
+        summary_cache.put(cache_key, summary)
+    
     # Return the computed summary
     return summary
 
+def get_long_text_key(source_format: str) -> str:
+    """
+    **Args:**
+        source_format (str): The format of the content to be summarized.
+
+    **Returns:**
+        The key of the item's text pasted into the summary prompt (transcript or article content), or None if the
+        content is not part of the prompt (uploaded PDF file).
+    """
+    if (source_format == config["key.json.source.format.text.content"]):
+        return config["key.json.content"]
+    elif (source_format == config["key.json.source.format.youtube.video"]):
+        return config["key.json.transcript"]
+    return None
+
+def measure_summary_prompt(item: Dict, prompt: str, long_text_key: str, count_exact: Callable = None) -> List[str]:
+    """
+    Measures the summary prompt of an item and records its number of input tokens and of chunks on the item.
+
+    **Args:**
+        item (Dict): The item to be summarized.
+        prompt (str): The rendered summary prompt of the item.
+        long_text_key (str): The key of the item's text pasted into the prompt (see `get_long_text_key`).
+        count_exact (Callable): A function (text) -> exact number of tokens, called near the budget (None to only estimate).
+
+    **Returns:**
+        The chunks of the item's text if the prompt exceeds the input token budget, None otherwise.
+    """
+    prompt_tokens = token_budget.count(prompt, count_exact = count_exact)
+    chunks = None
+    if not token_budget.fits(prompt_tokens) and item.get(long_text_key):
+        chunks = token_budget.split(item[long_text_key])
+    item[config["key.json.summary.input.tokens"]] = prompt_tokens
+    item[config["key.json.summary.chunks"]] = len(chunks) if chunks else 1
+    return chunks
+
+def summarize_in_chunks(item: Dict, source_format: str, chunks: List[str], model_name: str) -> str:
+    """
+    Summarizes an item whose text is too long for a single prompt (map-reduce): each chunk of the text is summarized
+    into notes in parallel, then the item is summarized with its usual prompt, the notes replacing the text.
+
+    **Args:**
+        item (Dict): A dictionary containing the needed attributes to create a summary from.
+        source_format (str): The format of the content to be summarized (a regular text content or a Youtube video).
+        chunks (List[str]): The chunks of the item's text (see `TokenBudget.split`).
+        model_name (str): The LLM to be used to create the summary from the item's content.
+
+    **Returns:**
+        The summary created from the notes of the chunks.
+
+    Raises:
+        Exception: The error raised by the model while summarizing a chunk or the notes.
+    """
+    title = item[config["key.json.title"]]
+    rate_limiter = get_model_rate_limiter(model_name)
+
+    def summarize_chunk(index: int, chunk: str) -> str:
+        prompt = prompt_templates.render(config["template.file.prompt.summarize.chunk"],
+                                         part = str(index + 1),
+                                         parts = str(len(chunks)),
+                                         title = title,
+                                         content = chunk)
+        rate_limiter.acquire(estimate_tokens(prompt))
+        return model_pool.generate_content(model_name, [prompt]).text
+
+    # Map: notes of each chunk, in the order of the text
+    notes = map_chunks(chunks = chunks,
+                       summarize_chunk = summarize_chunk,
+                       max_workers = config["summary.chunks.max.workers"])
+    combined_notes = "\n\n".join(f"[Part {index}/{len(notes)}]\n{note}" for index, note in enumerate(notes, start = 1))
+
+    # Reduce: the source's own prompt, with the notes in place of the text (split again if still too long)
+    reduced_item = dict(item)
+    reduced_item[get_long_text_key(source_format)] = combined_notes
+    prompt = build_summary_prompt(reduced_item, source_format)
+    prompt_tokens = token_budget.count(prompt)
+    if not token_budget.fits(prompt_tokens) and len(chunks) > 1:
+        return summarize_in_chunks(item = reduced_item,
+                                   source_format = source_format,
+                                   chunks = token_budget.split(combined_notes),
+                                   model_name = model_name)
+    rate_limiter.acquire(prompt_tokens)
+    return model_pool.generate_content(model_name, [prompt]).text
+
+def summarize_item_with_fallback(item: Dict, source_format: str,
+                                 primary_model: str, secondary_model: str) -> str:
+    """
+    Summarizes an item with the primary model and falls back to the secondary model on failure.
+
+    **Args:**
+        item (Dict): A dictionary containing the needed attributes to create a summary from.
+        source_format (str): The format of the content to be summarized. It could be a PDF file, a regular text content, or a Youtube video.
+        primary_model (str): The LLM to be used first to create the summary.
+        secondary_model (str): The LLM to be used if the primary model fails.
+
+    **Returns:**
+        The summary created from the given content, or an error message if both models failed.
+    """
+    try:
+        # The transcript of a video is fetched in the background: wait for it, as it is part of the prompt
+        if source_format == config["key.json.source.format.youtube.video"] and not item.get(config["key.json.transcript"]):
+            item[config["key.json.transcript"]] = transcript_service.get(item[config["key.json.id"]])
+        # Try using primary model to summarize the item's content
+        return call_LLM_to_get_summary(item = item,
+                                       source_format = source_format,
+                                       model_name = primary_model)
+    except Exception:
+        try:
+            # Fallback to secondary model on summarization failure
+            print(f"Failed to summarize item {item[config['key.json.title']]}. Trying with a different model.")
+            return call_LLM_to_get_summary(item = item,
+                                           source_format = source_format,
+                                           model_name = secondary_model)
+        except Exception as e:
+            print(f"Failed to summarize content for the item '{item[config['key.json.title']]}' with both models.")
+            print(f"Due to {e}")
+            # If both models fail, set a specific message instead of None
+            return "ERROR: The summary could not be generated for this item."
+
+def summarize_item_once_per_run(item: Dict, source_format: str, item_key: str,
+                                primary_model: str, secondary_model: str) -> str:
+    """
+    Summarizes an item, unless it was already summarized during this run for another source.
+
+    **Args:**
+        item (Dict): The item to be summarized.
+        source_format (str): The format of the content to be summarized. It could be a PDF file, a regular text content, or a Youtube video.
+        item_key (str): The unique key of the item (e.g. its link or its ID).
+        primary_model (str): The LLM to be used first to create the summary.
+        secondary_model (str): The LLM to be used if the primary model fails.
+
+    **Returns:**
+        The summary of the item.
+    """
+    run_key = (source_format, item_key)
+    with run_summaries_lock:
+        item_lock = run_summaries_item_locks.setdefault(run_key, threading.Lock())
+    with item_lock:
+        with run_summaries_lock:
+            summary = run_summaries.get(run_key)
+            if summary is not None:
+                run_summaries_stats["reused"] += 1
+                return summary
+        summary = summarize_item_with_fallback(item = item,
+                                               source_format = source_format,
+                                               primary_model = primary_model,
+                                               secondary_model = secondary_model)
+        with run_summaries_lock:
+            run_summaries_stats["summarized"] += 1
+            # Failures are not shared, the next source will try again
+            if summary is not None and not summary.startswith("ERROR:"):
+                run_summaries[run_key] = summary
+    return summary
+
+def summarize_items_concurrently(items: List[Dict], source_format: str, known_items_json_key: str,
+                                 primary_model: str, secondary_model: str) -> List[str]:
+    """
+    Summarizes a list of items with a bounded pool of workers.
+
+    The number of workers is set by the configuration key "google.genai.max.workers". The actual
+    throughput is driven by the rate limiters of the models (see `get_model_rate_limiter`).
+
+    **Args:**
+        items (List[Dict]): The items to be summarized.
+        source_format (str): The format of the content to be summarized. It could be a PDF file, a regular text content, or a Youtube video.
+        known_items_json_key (str): The json key holding the unique key of each item.
+        primary_model (str): The LLM to be used first to create the summaries.
+        secondary_model (str): The LLM to be used if the primary model fails.
+
+    **Returns:**
+        The list of summaries, in the same order as the items.
+    """
+    with ThreadPoolExecutor(max_workers = config["google.genai.max.workers"]) as executor:
+        return list(executor.map(
+            lambda item: summarize_item_once_per_run(item = item,
+                                                     source_format = source_format,
+                                                     item_key = item[known_items_json_key],
+                                                     primary_model = primary_model,
+                                                     secondary_model = secondary_model),
+            items))
+
+def set_item_pipeline(pipeline: Pipeline) -> None:
+    """
+    Registers the pipeline the new items are submitted to by `process_list_of_items`.
+
+    **Args:**
+        pipeline (Pipeline): The started pipeline, or None to process the items inline again.
+    """
+    global item_pipeline
+    item_pipeline = pipeline
+
+def create_item_pipeline() -> Pipeline:
+    """
+    Creates the pipeline summarizing and writing the items submitted by `process_list_of_items`.
+
+    **Returns:**
+        The pipeline (not started), with "google.genai.max.workers" summarizer workers.
+    """
+    def summarize_item(batch: Dict, item: Dict) -> str:
+        return summarize_item_once_per_run(item = item,
+                                           source_format = batch["source_format"],
+                                           item_key = item[batch["known_items_json_key"]],
+                                           primary_model = batch["primary_model"],
+                                           secondary_model = batch["secondary_model"])
+
+    def write_batch(batch: Dict, items: List[Dict], summaries: List[str]) -> None:
+        finalize_processed_items(source_name = batch["source_name"],
+                                 store_source = batch["store_source"],
+                                 known_items_json_key = batch["known_items_json_key"],
+                                 new_items = items,
+                                 summaries = summaries,
+                                 smtp_server_details = batch["smtp_server_details"],
+                                 email_details = batch["email_details"],
+                                 keys_to_ignore = batch["keys_to_ignore"],
+                                 summarize_it = batch["summarize_it"],
+                                 on_processed = batch["on_processed"])
+
+    return Pipeline(summarize_item = summarize_item,
+                    write_batch = write_batch,
+                    summarizer_workers = config["google.genai.max.workers"],
+                    queue_size = config["pipeline.queue.size"])
+
 def process_list_of_items(source_name: str,
                           source_format: str,
                           data_file_path: str,
@@ -1265,7 +2067,8 @@ def process_list_of_items(source_name: str,
                           smtp_server_details: Dict,
                           email_details: Dict,
                           keys_to_ignore: list,
-                          summarize_it: bool = True) -> None:
+                          summarize_it: bool = True,
+                          on_processed: Callable = None) -> None:
                           # keys_to_ignore: list) -> List[Dict]:
     """
     This function aims to process daily a list of items (papers, articles, videos or else) by performing the following tasks:
@@ -1274,14 +2077,14 @@ def process_list_of_items(source_name: str,
     2. In the event of new items compared to a list of items stored in a json data file, do the following tasks:
         a. Iterates on the new items and compute a summary of each item's content using LLM API.
         b. If successfully computed, the summary is then added to the list of item's attributes.
-        c. Updates the json data file with new items (and their summaries).
+        c. Appends the new items (and their summaries) to the item store.
         d. Sends an email notification to a list of recipients.
     
     **Args:**
         source_name (str): The name of the source of the content to be summarized.
         source_format (str): The format of the content to be summarized. It could be a PDF file, a regular text content, or a Youtube video.
-        data_file_path (str): Json file to store processed items.
-        known_items_json_key (str): Key for known items in Json data file.
+        data_file_path (str): Json data file of the source, which identifies the source in the item store (its legacy content is imported on first use).
+        known_items_json_key (str): Key for known items in the item store.
         new_items (List[Dict]): A list of dictionaries. Each dictionary contains the following attributes:
         (Note: the items contain at least those attributes as they might be mandatory for the computation of the summary)
             * `title (str)`: The title of the article,
@@ -1301,6 +2104,10 @@ def process_list_of_items(source_name: str,
         email_details (Dict): Details of the email notification to be sent.
         keys_to_ignore (list): A list of keys to exclude from the json data to generate the HTML table.
         summarize_it (bool): Whether the summarizing function leveragin GenAI must be called or not.
+        on_processed (Callable): A function called without argument once the items are stored and notified.
+    
+    When a pipeline is registered (see `set_item_pipeline`), the new items are submitted to it and this function
+    returns as soon as they are queued: they are summarized by its workers, then stored and notified by its writer.
     
     **Returns:**
         An updated list of dictionaries. Each dictionary contains the same attributes as the input ones, plus the summary:
@@ -1324,18 +2131,13 @@ def process_list_of_items(source_name: str,
     #         json_key = known_items_json_key))}") # For Debug Only
     
     ## Local variables
-    all_items: List[Dict] = []
-    known_items_keys = list() # Set to track initially known items based on their unique key
-    # print(f"=> data_file_path: {data_file_path}") # For Debug Only
-    if os.path.isfile(data_file_path) is True:
-        # Load list of previously processed articles from the JSON file
-        # Extract and store a set of URLs from previously processed articles
-        with open(data_file_path) as fp:
-            all_items = json.load(fp)
-        known_items_keys = extract_node_values(
-            json_data = all_items,
-            json_key = known_items_json_key) # Set to track seen ActuIA articles URLs
-        # print(f"List of known items from '{data_file_path}': {', '.join(known_items_keys)}") # For Debug Only
+    # Retrieve the item store source matching the json data file (its legacy content is imported on first use)
+    store_source = get_item_store_source(data_file_path = data_file_path,
+                                         key_field = known_items_json_key)
+    # Look up the keys of the given items in the store's unique index
+    known_items_keys = item_store.get_known_keys(
+        source = store_source,
+        item_keys = [item[known_items_json_key] for item in new_items]) # Set of the given items already known
     
     # print(f"List of treated items for '{source_name}': {', '.join(extract_node_values(
     #         json_data = new_items,
@@ -1351,86 +2153,107 @@ def process_list_of_items(source_name: str,
     # If there isn't any new items, exit the function
     if len(new_items) <= 0:
         print(f"=> Number of items treated for: '{source_name}': {len(new_items)}") # For Debug Only
-        print(f"=> Number of items already known for: '{source_name}': {len(known_items_keys)}") # For Debug Only
+        print(f"=> Number of items already known for: '{source_name}': {item_store.count(store_source)}") # For Debug Only
         print(f"=> No new item to extract for: '{source_name}'")
+        if on_processed:
+            on_processed()
         return
     
-    # Initialize the ouput list of dictionaries
-    new_items_with_summary = new_items.copy()
-    
     # If there are new items, attempt to get a summary leveraging LLM,
     # then export the updated list of items to json file
-    # 2. Define primary and secondary models
-    # primary_model = config["gemini.api.service.version.1.5.flash.002"]
-    primary_model = config["gemini.api.service.version.2.5.pro"]
-    # primary_model = config["gemini.api.service.version.1.5.pro.002"]
-    # secondary_model = config["gemini.api.service.version.1.5.flash"]
-    secondary_model = config["gemini.api.service.version.2.5.flash"]
-    # secondary_model = config["gemini.api.service.version.1.5.flash.002"]
+    # 2. Define primary and secondary models, as configured for the source
+    primary_model, secondary_model = get_summary_models(source_name)
     
-    # 3. Iterate on each item (dictionary) to be summarized in the list
-    # iter_item = 1 # For Debug Only
-    for item in new_items:
-        # break
-        # for key, value in item.items():
-        #     print(f"Current item key: {key}, Value: {value}") # For Debug Only
-        summary = None
-        if not summarize_it:
-            # Update the relevant dictionary with summary = None and loop to next item
-            matching_dictionary = next(filter(lambda d: d[config["key.json.link"]] == item[config["key.json.link"]], new_items_with_summary))
-            matching_dictionary["summary"] = summary
-            continue
+    # 3. Hand the items over to the pipeline if any, otherwise summarize them concurrently,
+    #    the workers sharing the models' rate limiters
+    if item_pipeline is not None:
+        item_pipeline.submit(batch = {"source_name": source_name,
+                                      "source_format": source_format,
+                                      "store_source": store_source,
+                                      "known_items_json_key": known_items_json_key,
+                                      "primary_model": primary_model,
+                                      "secondary_model": secondary_model,
+                                      "smtp_server_details": smtp_server_details,
+                                      "email_details": email_details,
+                                      "keys_to_ignore": keys_to_ignore,
+                                      "summarize_it": summarize_it,
+                                      "on_processed": on_processed},
+                             items = new_items,
+                             summarize = summarize_it)
+        return
+    if summarize_it:
+        summaries = summarize_items_concurrently(items = new_items,
+                                                 source_format = source_format,
+                                                 known_items_json_key = known_items_json_key,
+                                                 primary_model = primary_model,
+                                                 secondary_model = secondary_model)
+    else:
+        summaries = [None] * len(new_items)
+    
+    finalize_processed_items(source_name = source_name,
+                             store_source = store_source,
+                             known_items_json_key = known_items_json_key,
+                             new_items = new_items,
+                             summaries = summaries,
+                             smtp_server_details = smtp_server_details,
+                             email_details = email_details,
+                             keys_to_ignore = keys_to_ignore,
+                             summarize_it = summarize_it,
+                             on_processed = on_processed)
+
+def finalize_processed_items(source_name: str,
+                             store_source: str,
+                             known_items_json_key: str,
+                             new_items: List[Dict],
+                             summaries: List[str],
+                             smtp_server_details: Dict,
+                             email_details: Dict,
+                             keys_to_ignore: list,
+                             summarize_it: bool = True,
+                             on_processed: Callable = None) -> None:
+    """
+    Adds their summary to the new items of a source, appends them to the item store and sends the email notification
+    (or, in digest mode, adds it to the daily digest of its recipients).
+
+    **Args:**
+        source_name (str): The name of the source of the content.
+        store_source (str): The name of the source in the item store.
+        known_items_json_key (str): Key for known items in the item store.
+        new_items (List[Dict]): The new items.
+        summaries (List[str]): The summaries of the new items, in the same order (None if not summarized).
+        smtp_server_details (Dict): Details of the SMTP server in order to send email notification.
+        email_details (Dict): Details of the email notification to be sent.
+        keys_to_ignore (list): A list of keys to exclude from the json data to generate the HTML table.
+        summarize_it (bool): Whether the items were summarized or not.
+        on_processed (Callable): A function called without argument once the items are stored and notified.
+    """
+    # Initialize the ouput list of dictionaries
+    new_items_with_summary = new_items.copy()
+    
+    # 4. Update each item with its summary
+    for item, summary in zip(new_items, summaries):
+        if summarize_it and summary != None:
+            summary.replace("\n", " ")
+            # If Hugging Face Papers, update link and delete temporary PDF files
+            if config["key.json.hf.source.name"] in source_name:
+                item[config["key.json.link"]].replace("https://arxiv.org/abs/", "https://huggingface.co/papers/")
+                if os.path.exists(item[config["key.json.pdf.path"]]):
+                    os.remove(item[config["key.json.pdf.path"]])
         
-        try:
-            # 4a. Try using primary model to summarize the item's content
-            summary = call_LLM_to_get_summary(item = item,
-                                              source_format = source_format,
-                                              model_name = primary_model)
-        except Exception:
-            try:
-                # 4b. Fallback to secondary model on summarization failure
-                print(f"Failed to summarize item {item[config['key.json.title']]}. Trying with a different model.")
-                summary = call_LLM_to_get_summary(item = item,
-                                                  source_format = source_format,
-                                                  model_name = secondary_model)
-            except Exception as e:
-                print(f"Failed to summarize content for the item '{item[config['key.json.title']]}' with both models.")
-                print(f"Due to {e}")
-                # If both models fail, set a specific message instead of None
-                summary = "ERROR: The summary could not be generated for this item."
-        finally:
-            if summary != None:
-                summary.replace("\n", " ")
-                # If Hugging Face Papers, update link and delete temporary PDF files
-                if config["key.json.hf.source.name"] in source_name:
-                    item[config["key.json.link"]].replace("https://arxiv.org/abs/", "https://huggingface.co/papers/")
-                    # hf_link = item[config["key.json.link"]].replace("https://arxiv.org/abs/", "https://huggingface.co/papers/")
-                    # print(f"=> Hugging Face Paper hf_link: {hf_link}") # For Debug Only
-                    if os.path.exists(item[config["key.json.pdf.path"]]):
-                        os.remove(item[config["key.json.pdf.path"]])
-            
-            # print(f"=> summary: {summary}")
-            # Update the relevant dictionary item with the computed summary and store
-            # new_items_with_summary.append({**item, config["key.json.summary"]: summary})
-            # Use filter to find the dictionary with the matching title and update the summary
-            matching_dictionary = next(filter(lambda d: d[config["key.json.link"]] == item[config["key.json.link"]], new_items_with_summary))
-            matching_dictionary["summary"] = summary
-            
-            # Introduce a delay to avoid rate limiting
-            time.sleep(config["google.genai.sleep.time"])
-        # if iter_item > 2: # For Debug Only
-        #     break # For Debug Only
-        # iter_item += 1 # For Debug Only
+        # Use filter to find the dictionary with the matching link and update the summary
+        matching_dictionary = next(filter(lambda d: d[config["key.json.link"]] == item[config["key.json.link"]], new_items_with_summary))
+        matching_dictionary["summary"] = summary
     
     # Add new items with summary to the list of already known items and export it to the json data file
     # print(f"Updating data to Json file {data_file_path}") # For Debug Only
     # all_items.insert(0,
     #                  new_items_with_summary)
     # all_items.extend(new_items_with_summary) # Concatenates at the end instead of beginning
-    all_items = new_items_with_summary + all_items
-    with open(data_file_path, "w") as f:
-        json.dump(all_items, f, indent=2)
-    print(f"=> Saved {len(all_items)} items' information for '{source_name}'")
+    # Append the new items to the store, without rewriting the already known ones
+    saved_items = item_store.add_items(source = store_source,
+                                       key_field = known_items_json_key,
+                                       items = new_items_with_summary)
+    print(f"=> Saved {saved_items} new items' information for '{source_name}' ({item_store.count(store_source)} in total)")
     
     # Send an email notification if new articles were found
     # Before sending email, test if there are any non-ASCII character in the Json data
@@ -1444,16 +2267,31 @@ def process_list_of_items(source_name: str,
     # Ignore key 'content' from the HTML to generate
     # keys_to_ignore = [config["key.json.content"],
     #               config["key.json.link"]]
-    # Add body to email details by converting Json data to HTML
-    email_details[config["key.json.email.detail.body"]] = \
-        json_to_html(new_items_with_summary,
-                     keys_to_ignore)
-    # Send email
-    send_email(email_details = email_details,
-               # recipients = recipients,
-               # subject = email_subject,
-               # body = email_body,
-               smtp_server_details = smtp_server_details)
+    # In digest mode, the notification becomes a section of the daily digest of each recipient
+    # The token counts of the summaries are kept in the item store, not shown in the notification
+    keys_to_ignore = keys_to_ignore + [config["key.json.summary.input.tokens"],
+                                       config["key.json.summary.chunks"]]
+    smtp_server_details_key = get_smtp_server_details_key(smtp_server_details)
+    if config["email.digest.enabled"] and smtp_server_details_key is not None:
+        email_digest.add(recipients = email_details[config["key.json.email.detail.recipients"]],
+                         smtp_server_details_key = smtp_server_details_key,
+                         section = {"title": email_details[config["key.json.email.detail.subject"]],
+                                    "items": new_items_with_summary,
+                                    "keys_to_ignore": keys_to_ignore})
+    else:
+        # Add body to email details by converting Json data to HTML
+        email_details[config["key.json.email.detail.body"]] = \
+            json_to_html(new_items_with_summary,
+                         keys_to_ignore)
+        # Queue the email, sent in the background by the outbox
+        queue_email(email_details = email_details,
+                    # recipients = recipients,
+                    # subject = email_subject,
+                    # body = email_body,
+                    smtp_server_details = smtp_server_details)
+    
+    if on_processed:
+        on_processed()
     
     # Returns list of items (dictionaries) including attribute 'summary'
     # return new_items_with_summary
\ No newline at end of file
@@ -6,23 +6,26 @@ websites_specific.py
 
 # Standard library imports
 import os
-import json
 import re
+import threading
+from functools import partial
 # import time
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Callable
 
 # Third party imports
-import requests
-from bs4 import BeautifulSoup
 # import html2text
 
 # Local resources imports
+from html_parsing import parse_html, make_strainer, select_by_class_sets
 from utils import config
-from utils import extract_node_values
+from utils import item_store
+from utils import http_client
+from utils import listing_http_cache
+from utils import get_item_store_source
 # from utils import json_to_html
 # from utils import send_email
-from utils import download_pdf
+from utils import download_pdfs
 # from utils import filter_unknown_items
 # from utils import summarize_from_pdf_file
 # from utils import summarize_from_text_content
@@ -43,6 +46,340 @@ os.makedirs(
     config["json.key.tmp.raw.sources.dir"], exist_ok=True
 )
 
+# Strainer restricting the construction of the Hugging Face listing's tree to the papers' containers
+hf_listing_strainer = make_strainer("div", ["w-full"])
+
+# Declarative specs of the article scrapers, run by `pull_new_articles`. A selector is a path of
+# (tag name, class attribute) steps, each one searched in the element found by the previous one
+# (an empty class attribute matches the tags without class). A field is extracted with the first
+# selector that finds an element, from its text (stripped of the `remove` characters) or its `attribute`.
+scraper_specs: Dict[str, Dict] = {
+    "actuia": {
+        "name": "ActuIA",
+        "headers": {},
+        # The article containers in the listing, matched on their exact class attribute
+        "listing.tag": "div",
+        "listing.class.sets": ["td_module_16 td_module_wrap td-animation-stack"],
+        # <a href="https://www.actuia.com/actualite/my-article-URL/" rel="bookmark" title="my_article_title">
+        "link.selector": [("a", "")],
+        "link.regex": r"^(https:\/\/www\.actuia\.com\/.*\/)$",
+        "listing.fields": {
+            config["key.json.title"]: {"selectors": [[("a", "")]]},
+            config["key.json.author"]: {"selectors": [[("span", "td-post-author-name")]], "remove": "-"},
+            # <img width="150" height="85" class="entry-thumb webpexpress-processed" src="https://my-thumbnailUrl" alt="" title="my_article_title">
+            config["key.json.thumbnail.url"]: {"selectors": [[("img", "entry-thumb webpexpress-processed")],
+                                                             [("img", "entry-thumb")]],
+                                               "attribute": "src"},
+            config["key.json.date"]: {"selectors": [[("span", "td-post-date")]]},
+        },
+        "article.fields": {
+            # <div class="entry-content">
+            config["key.json.content"]: {"selectors": [[("div", "entry-content")],
+                                                       [("div", "tdb-block-inner td-fix-index")]]},
+        },
+        # An article whose page could not be fetched is kept, without content
+        "skip.failed.articles": False,
+    },
+    "insurance.times.uk": {
+        "name": "Insurance Times UK",
+        # Use headers so that the requests are not seen as a robot
+        "headers": {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+        },
+        "listing.tag": "div",
+        "listing.class.sets": [
+            "spinLayout thumb onecol left item-first hasPicture",
+            "spinLayout thumb onecol left item-first item-penultimate hasPicture",
+            "spinLayout thumb onecol left item-first item-last hasPicture",
+            "spinLayout thumb onecol right item-second item-last hasPicture",
+            "spinLayout thumb onecol right item-second hasPicture",
+            "spinLayout thumb onecol right item-second item-penultimate hasPicture"],
+        # <a href="https://www.insurancetimes.co.uk/news/intersys-opens-new-london-office/1453257.article">Intersys opens new London office</a>
+        "link.selector": [("a", "")],
+        "link.regex": r"^(https:\/\/www\.insurancetimes\.co\.uk\/.*)$",
+        "listing.fields": {
+            config["key.json.title"]: {"selectors": [[("a", "")]]},
+            # <span class="author">By <a rel="author" href="https://www.insurancetimes.co.uk/clare-ruel/2216.bio">Clare Ruel</a></span>
+            # <span class="author">By <span class="noLink">Harry Weeks</span></span>
+            config["key.json.author"]: {"selectors": [[("span", "author"), ("a", "")],
+                                                      [("span", "author"), ("span", "noLink")]]},
+            # <img alt="Leadenhall market" class="lazyloaded" loading="lazy" src="https://d17mj6xr9uykrr.cloudfront.net/Pictures/100x67/6/9/7/111697_leadenhallmarket_502804.jpg" />
+            config["key.json.thumbnail.url"]: {"selectors": [[("img", "lazyloaded")]], "attribute": "src"},
+            # <span class="date" data-date-timezone="{&quot;publishdate&quot;: &quot;2024-10-07T07:00:00&quot;}">2024-10-07T07:00:00+01:00</span>
+            config["key.json.date"]: {"selectors": [[("span", "date")]]},
+        },
+        # The article's page completes the details missing from the listing
+        "article.fields": {
+            config["key.json.author"]: {"selectors": [[("span", "author"), ("a", "")],
+                                                      [("span", "author"), ("span", "noLink")]]},
+            config["key.json.date"]: {"selectors": [[("span", "date")]]},
+            # <div class="articleContent">, whose paragraphs are joined
+            config["key.json.content"]: {"selectors": [[("div", "articleContent")]],
+                                         "paragraphs": True,
+                                         "skip.prefixes": ("<p><strong>Read:", "<p><strong>Explore")},
+        },
+        # An article whose page could not be fetched or parsed is skipped
+        "skip.failed.articles": True,
+    },
+}
+
+def compile_scraper_spec(scraper_spec: Dict) -> Dict:
+    """
+    Compiles a scraper spec once: its regexes, and the strainers restricting the trees of the listing
+    and article pages to the elements its selectors start from.
+
+    **Args:**
+        scraper_spec (Dict): The declarative spec of the scraper (see `scraper_specs`).
+
+    **Returns:**
+        A copy of the spec, with the compiled `link.pattern`, `listing.strainer` and `article.strainer`.
+    """
+    compiled_spec = dict(scraper_spec)
+    compiled_spec["link.pattern"] = re.compile(scraper_spec["link.regex"])
+    compiled_spec["listing.strainer"] = make_strainer(
+        scraper_spec["listing.tag"],
+        list(dict.fromkeys(class_set.split()[0] for class_set in scraper_spec["listing.class.sets"])))
+    first_steps = [selector[0] for field_spec in scraper_spec["article.fields"].values()
+                   for selector in field_spec["selectors"]]
+    # A first step without class can't be strained, the whole article page is then built
+    compiled_spec["article.strainer"] = None if any(not class_attribute for _, class_attribute in first_steps) else make_strainer(
+        list(dict.fromkeys(tag_name for tag_name, _ in first_steps)),
+        list(dict.fromkeys(class_attribute.split()[0] for _, class_attribute in first_steps)))
+    return compiled_spec
+
+# Registry of the compiled scrapers, by name
+scrapers: Dict[str, Dict] = {scraper_name: compile_scraper_spec(scraper_spec)
+                             for scraper_name, scraper_spec in scraper_specs.items()}
+
+def select_element(element, selector: List[tuple]):
+    """
+    **Args:**
+        element: The element (or tree) to search.
+        selector (List[tuple]): A path of (tag name, class attribute) steps.
+
+    **Returns:**
+        The element found at the end of the path, or None.
+    """
+    for tag_name, class_attribute in selector:
+        if class_attribute:
+            element = element.find(tag_name, class_ = class_attribute)
+        else:
+            # Explicit match of the tags without class (the meaning of class_="" differs across bs4 versions)
+            element = element.find(lambda tag: tag.name == tag_name and not tag.get("class"))
+        if element is None:
+            return None
+    return element
+
+def extract_field(element, field_spec: Dict) -> str:
+    """
+    Extracts a field of an article with the first of its selectors that finds an element.
+
+    **Args:**
+        element: The element (or tree) to search.
+        field_spec (Dict): The spec of the field (selectors, and optionally attribute, remove, paragraphs, skip.prefixes).
+
+    **Returns:**
+        The value of the field, or None if none of its selectors finds an element.
+    """
+    for selector in field_spec["selectors"]:
+        found = select_element(element, selector)
+        if found is None:
+            continue
+        if field_spec.get("attribute"):
+            return found.get(field_spec["attribute"])
+        if field_spec.get("paragraphs"):
+            skip_prefixes = field_spec.get("skip.prefixes", ())
+            return "".join([p.text.strip() for p in found.find_all("p")
+                            if p and not p.text.startswith(skip_prefixes)])
+        text = found.text
+        for character in field_spec.get("remove", ""):
+            text = text.replace(character, "")
+        return text.strip()
+    return None
+
+def parse_listing(scraper: Dict, markup: bytes) -> List:
+    """
+    Collects the article containers of a listing page in a single pass.
+
+    **Args:**
+        scraper (Dict): The compiled scraper spec.
+        markup (bytes): The listing page.
+
+    **Returns:**
+        The article containers, in the listing's order.
+    """
+    soup = parse_html(markup, parse_only = scraper["listing.strainer"])
+    return select_by_class_sets(soup, scraper["listing.tag"], scraper["listing.class.sets"])
+
+def parse_article_page(scraper: Dict, article_url: str, response_article) -> Dict:
+    """
+    Extracts the article fields of a scraper from an article's page.
+
+    **Args:**
+        scraper (Dict): The compiled scraper spec.
+        article_url (str): The URL of the article.
+        response_article (requests.Response): The response to the request of the article's page.
+
+    **Returns:**
+        A dictionary with the article fields (each one None if it could not be recognized).
+    """
+    if response_article.status_code != 200:
+        print(f"Error: {response_article.status_code}")
+    soup_article = parse_html(response_article.content, parse_only = scraper["article.strainer"])
+    article_page = {field: extract_field(soup_article, field_spec)
+                    for field, field_spec in scraper["article.fields"].items()}
+    if article_page.get(config["key.json.content"]) is None:
+        print(f"Could not recognize post content for article at URL: {article_url}")
+    return article_page
+
+def pull_new_articles(scraper: Dict,
+                      domain_name: str,
+                      listing_url: str,
+                      data_file_path: str) -> List[Dict]:
+    """
+    Fetches the new articles of a website's domain, as described by a scraper spec.
+
+    This function performs the following tasks:
+
+    1. Fetches the domain's listing page (skipped if unchanged since the last run) and collects its article containers.
+    2. Extracts the link and the listing fields of each article, skipping the articles already processed.
+    3. Fetches concurrently the new articles' pages (unless already parsed for another domain during this run)
+       and extracts the article fields, which complete the listing ones.
+
+    **Args:**
+        scraper (Dict): The compiled scraper spec (see `scrapers`).
+        domain_name (str): The name of the domain.
+        listing_url (str): The URL of the domain's listing page.
+        data_file_path (str): The path to the json data file identifying the domain's articles in the item store.
+
+    **Returns:**
+        A list of dictionaries (latest first). Each dictionary is an article that contains the following attributes:
+            * `title (str)`: The title of the article,
+            * `author (str)`: The author of the article,
+            * `thumbnailUrl (str)`: The URL of the thumbnail image to illustrate the article,
+            * `date (str)`: The date of the article,
+            * `link (str)`: The URL of the article,
+            * `content (str)`: The content of the article.
+    """
+    # Print information about processing the website's articles
+    print(f"Retrieving new articles from {scraper['name']} website for the domain: '{domain_name}'")
+    # Fetch the listing page of the domain, unless it is unchanged since the last run
+    response, unchanged = http_client.get_conditional(listing_url, listing_http_cache, headers = scraper["headers"])
+    if unchanged:
+        print(f"=> {scraper['name']} page for the domain '{domain_name}' unchanged since the last run, skipped")
+        return []
+    if response.status_code != 200:
+        print(f"Error: {response.status_code}")
+        return []
+    my_resultset = parse_listing(scraper, response.content)
+    print(f"=> Retrieved {len(my_resultset)} articles in the HTML code for domain {domain_name}")
+    
+    ## Local variables
+    # Initialize empty list to store article details and sets to track seen articles
+    articles: List[Dict] = []
+    pending_articles: List[Dict] = [] # New articles whose page remains to be fetched
+    seen_urls = set() # Set to track the article URLs already seen in this listing
+    # Retrieve the item store source of the previously processed articles (identified by their URL)
+    store_source = get_item_store_source(data_file_path = data_file_path,
+                                         key_field = config["key.json.link"])
+    
+    # Loop through the articles in reverse order (latest first)
+    for article_div in reversed(my_resultset):
+        try:
+            # Extract the URL, and check for duplicates
+            link_tag = select_element(article_div, scraper["link.selector"])
+            if not link_tag:
+                print(f"Title not found for an article in {scraper['name']}")
+                continue
+            article_url_match = scraper["link.pattern"].search(link_tag.get("href", ""))
+            if article_url_match:
+                article_url = article_url_match.group(1)
+            else:
+                print(f"Could not recognize {scraper['name']} URL from link: {link_tag.get('href')}")
+                continue
+            if article_url in seen_urls or item_store.is_known(store_source, article_url):
+                # print(f"Duplicate article detected with URL {article_url}, skipping.") # For Debug Only
+                continue
+            seen_urls.add(article_url) # Add unique URL to seen URLs
+            
+            # Extract the listing fields; the article's page is fetched once the whole listing has been parsed
+            article = {field: extract_field(article_div, field_spec)
+                       for field, field_spec in scraper["listing.fields"].items()}
+            article[config["key.json.link"]] = article_url
+            article[config["key.json.content"]] = None
+            pending_articles.append(article)
+        
+        except Exception as e:
+            print(f"🚨 An error occurred while processing an article!")
+            print(f"Error details: {e}")
+            continue # Skip to the next article
+    
+    # Fetch the new articles' pages (unless already parsed for another domain) and complete their details
+    article_pages = fetch_article_pages(
+        urls = [article[config["key.json.link"]] for article in pending_articles],
+        parse_article_page = lambda article_url, response_article: parse_article_page(scraper, article_url, response_article),
+        headers = scraper["headers"])
+    for article in pending_articles:
+        article_page = article_pages[article[config["key.json.link"]]]
+        if article_page is None and scraper["skip.failed.articles"]:
+            continue # Skip the article
+        # The listing's fields take precedence over the ones of the article's page
+        for field, value in (article_page or {}).items():
+            if not article.get(field):
+                article[field] = value
+        for field in article:
+            if article[field] is None and field != config["key.json.content"]:
+                print(f"Could not recognize post {field} for article at URL: {article[config['key.json.link']]}")
+        # Add the article details to the output list (latest first, as in the listing)
+        articles.insert(0, article)
+    
+    # Return the list of articles with extracted details
+    return articles
+
+# Run-scoped memo of the parsed article pages, keyed by article URL: an article listed on several
+# overlapping domains (e.g. Insurance Times UK home and /news) is only fetched and parsed once
+article_pages_memo: Dict[str, Dict] = {}
+article_pages_memo_lock = threading.Lock()
+
+def fetch_article_pages(urls: List[str],
+                        parse_article_page: Callable,
+                        **kwargs) -> Dict[str, Dict]:
+    """
+    Fetches concurrently and parses the article pages that were not parsed yet during this run.
+
+    **Args:**
+        urls (List[str]): The URLs of the articles.
+        parse_article_page (Callable): A function (article URL, response) -> dictionary of the details parsed
+            from the page. Any exception it raises marks the article as failed.
+        **kwargs: Any argument accepted by `requests.Session.request` (headers, timeout, etc.).
+
+    **Returns:**
+        A dictionary article URL -> parsed details, or None if the page could not be fetched or parsed.
+    """
+    with article_pages_memo_lock:
+        missing_urls = [url for url in dict.fromkeys(urls) if url not in article_pages_memo]
+    
+    # Parse each page as its response lands
+    for url_index, response_article, error in http_client.get_many(
+            urls = missing_urls,
+            max_workers = config["http.client.max.workers"],
+            max_per_host = config["http.client.max.per.host"],
+            **kwargs):
+        article_url = missing_urls[url_index]
+        try:
+            if error:
+                raise error
+            article_page = parse_article_page(article_url, response_article)
+        except Exception as e:
+            print(f"🚨 An error occurred while fetching the article at URL: {article_url}")
+            print(f"Error details: {e}")
+            article_page = None
+        with article_pages_memo_lock:
+            article_pages_memo[article_url] = article_page
+    
+    with article_pages_memo_lock:
+        return {url: article_pages_memo[url] for url in urls}
+
 def pull_new_hf_papers(data_file_path: str) -> List[Dict]:
     """
     Fetches information about daily papers from Hugging Face's papers page and downloads their PDFs.
@@ -63,24 +400,22 @@ def pull_new_hf_papers(data_file_path: str) -> List[Dict]:
             * `pdf_path (str)`: The local path where the PDF is saved (if downloaded).
     """
     
-    # Fetch the Hugging Face papers page content
-    response = requests.get(config["key.json.hf.url"])
-    soup = BeautifulSoup(response.content, "html.parser")
+    # Fetch the Hugging Face papers page content, unless it is unchanged since the last run
+    response, unchanged = http_client.get_conditional(config["key.json.hf.url"], listing_http_cache)
+    if unchanged:
+        print(f"=> Hugging Face papers page unchanged since the last run, skipped")
+        return []
+    soup = parse_html(response.content, parse_only = hf_listing_strainer)
 
     # Initialize empty list to store paper details and set to track seen arXiv IDs
     hf_papers: List[Dict[str, str, str, str]] = []
-    seen_ids = set()  # Set to track seen arXiv IDs
+    pending_papers: List[Dict] = [] # New papers whose PDF remains to be downloaded
+    seen_ids = set()  # Set to track arXiv IDs already seen in this listing
     arxiv_id = None
     
-    # Check if an existing JSON file stores previously processed Hugging Face Papers
-    # print(f"data_file_path: {data_file_path}") # For Debug Only
-    if os.path.isfile(data_file_path) is True:
-        # Load list of previously processed articles from the JSON file
-        with open(data_file_path) as fp:
-            # Extract and store a set of IDs from previously processed papers
-            seen_ids = extract_node_values(json.load(fp),
-                                           config["key.json.id"]) # Set to track seen HF Papers IDs
-        # print(f"Already seen IDs: {', '.join(seen_ids)}") # For Debug Only
+    # Retrieve the item store source of the previously processed Hugging Face Papers (identified by their link)
+    store_source = get_item_store_source(data_file_path = data_file_path,
+                                         key_field = config["key.json.link"])
     
     # Define directory for storing downloaded PDFs (using configuration key)
     hf_pdfs_dir = config["json.key.tmp.raw.sources.dir"] + "/hf_pdfs"
@@ -110,8 +445,11 @@ def pull_new_hf_papers(data_file_path: str) -> List[Dict]:
             print(f"Could not extract arXiv ID from link: {link}")
             continue
 
-        # Check for duplicate papers based on arXiv ID
-        if arxiv_id in seen_ids:
+        # Construct the full link to the paper on arXiv.org
+        full_link = f"https://arxiv.org/abs/{arxiv_id}"
+
+        # Check for duplicate papers based on arXiv ID, then on the already processed papers
+        if arxiv_id in seen_ids or item_store.is_known(store_source, full_link):
             # print(f"Duplicate paper detected with ID {arxiv_id}, skipping.") # For Debug Only
             continue
         seen_ids.add(arxiv_id)  # Add ID to set of seen IDs
@@ -123,28 +461,30 @@ def pull_new_hf_papers(data_file_path: str) -> List[Dict]:
             if author:
                 authors.append(author)
 
-        # Construct the full link to the paper on arXiv.org
-        full_link = f"https://arxiv.org/abs/{arxiv_id}"
-
-        # Attempt to download the PDF and store details if successful
-        pdf_path = os.path.join(hf_pdfs_dir, f"{arxiv_id}.pdf")
-        if download_pdf(arxiv_id, pdf_path):
-            hf_papers.append(
-                {
-                    config["key.json.id"]: arxiv_id,
-                    config["key.json.title"]: title,
-                    config["key.json.authors"]: ", ".join(authors),
-                    config["key.json.link"]: full_link,
-                    config["key.json.pdf.path"]: pdf_path,
-                }
-            )
-        else:
-            print(f"Failed to download PDF for {arxiv_id}")
+        # Keep the paper details, its PDF is downloaded once the whole page has been parsed
+        pending_papers.append(
+            {
+                config["key.json.id"]: arxiv_id,
+                config["key.json.title"]: title,
+                config["key.json.authors"]: ", ".join(authors),
+                config["key.json.link"]: full_link,
+                config["key.json.pdf.path"]: os.path.join(hf_pdfs_dir, f"{arxiv_id}.pdf"),
+            }
+        )
     
         # if iter == 1:   # For Debug Only
         #     break       # For Debug Only
         # iter = iter + 1 # For Debug Only
     
+    # Download the PDFs in parallel and store the details of the papers successfully downloaded
+    downloaded = download_pdfs([(paper[config["key.json.id"]], paper[config["key.json.pdf.path"]])
+                                for paper in pending_papers])
+    for paper, is_downloaded in zip(pending_papers, downloaded):
+        if is_downloaded:
+            hf_papers.append(paper)
+        else:
+            print(f"Failed to download PDF for {paper[config['key.json.id']]}")
+    
     # Return the list of dictionaries containing paper details
     return hf_papers
 
@@ -191,7 +531,9 @@ def process_hf_daily() -> None:
         smtp_server_details = config["smtp.server.details.gmail"],
         email_details = email_details,
         keys_to_ignore = [config["key.json.id"], config["key.json.pdf.path"],], # Ignore key 'pdf_path' from the HTML to generate
-        summarize_it = True
+        summarize_it = True,
+        # Once the papers are processed, keep the page's validators for the next run
+        on_processed = partial(listing_http_cache.commit, config["key.json.hf.url"])
     )
 
 def pull_new_actuia_articles(domain_name: str,
@@ -199,13 +541,7 @@ def pull_new_actuia_articles(domain_name: str,
     """
     Fetches new articles from ActuIA for a specific domain and sends notifications.
 
-    This function performs the following tasks:
-
-    1. Scrapes ActuIA's website for articles related to the provided domain.
-    2. Extracts information from each article, including title, author, thumbnail URL,
-       date, content, and summary (using a large language model).
-    3. Saves the extracted information for new articles to a JSON file.
-    4. Sends an email notification to recipients if new articles are found.
+    The articles are scraped by the generic engine `pull_new_articles`, driven by the ActuIA scraper spec.
 
     **Args:**
         domain_name (str): The name of the domain to be considered when scraping ActuIA articles.
@@ -220,140 +556,10 @@ def pull_new_actuia_articles(domain_name: str,
             * `link (str)`: The URL of the article,
             * `content (str)`: The content of the article.
     """
-    # Print information about processing ActuIA articles
-    print(f"Retrieving new articles from ActuIA website for the domain: '{domain_name}'")
-    # Fetch the ActuIA website content for the specified domain
-    response = requests.get(config["key.json.actuia.url"]+domain_name+"/")
-    soup = BeautifulSoup(response.content, "html.parser")
-    
-    # Initialise the list of articles to store with their paramaters:
-    # - title
-    # - author
-    # - image_url
-    # - date
-    # - link
-    # - content
-    # - summary (filled in later)
-    
-    ## Local variables
-    # Initialize empty list to store article details and sets to track seen articles
-    actuia_articles: List[Dict[str, str, str, str, str, str]] = []
-    seen_urls = set() # Set to track already seen ActuIA article URLs
-    # Check if an existing JSON file stores previously processed ActuIA articles
-    # print(f"data_file_path: {data_file_path}") # For Debug Only
-    if os.path.isfile(data_file_path) is True:
-        # Load list of previously processed articles from the JSON file
-        with open(data_file_path) as fp:
-            # Extract and store a set of URLs from previously processed articles
-            seen_urls = extract_node_values(json.load(fp),
-                                            config["key.json.link"]) # Set to track seen ActuIA articles URLs
-        # print(f"Already seen URLs: {', '.join(seen_urls)}") # For Debug Only
-    
-    # Loop through ActuIA articles in reverse order (latest first)
-    # Locate the relevant div elements
-    # <div class="td_module_16 td_module_wrap td-animation-stack">
-    # iter = 1 # For Debug Only
-    # for actuia_article_div in soup.find_all("div", class_="td_module_16 td_module_wrap td-animation-stack"):
-    # Start from the end of the list of articles
-    my_resultset = soup.find_all("div", class_="td_module_16 td_module_wrap td-animation-stack")
-    # for current_div_index in range(len(my_resultset))[::-1]:
-    #     actuia_article_div = my_resultset[current_div_index]
-    for current_div_index in range(len(my_resultset)): # Reverse loop for latest first
-        # print(f"Length of the list of articles: {len(my_resultset)}") # For Debug Only
-        # print(f"Current index: {len(my_resultset)-1-current_div_index}") # For Debug Only
-        # print(f"Dealing with ActuIA article of index #{len(my_resultset)-1-current_div_index}") # For Debug Only
-        actuia_article_div = my_resultset[len(my_resultset)-1-current_div_index]
-        
-        # Extract title, URL, and check for duplicates
-        # <a href="https://www.actuia.com/actualite/my-article-URL/" rel="bookmark" title="my_article_title">
-        title_tag = actuia_article_div.find("a", class_="")
-        post_title = ""
-        if title_tag:
-            post_title = title_tag.text.strip()
-        else:
-            print("Title not found for an article in ActuIA")
-            continue
-        # print(f"=> ActuIA article title: {post_title}") # For Debug Only
-        
-        # Extract the paper ID from the link
-        article_url_match = re.search(r"^(https:\/\/www\.actuia\.com\/.*\/)$", title_tag["href"])
-        if article_url_match:
-            article_url = article_url_match.group(1)
-        else:
-            print(f"Could not recognize ActuIA URL from link: {title_tag['href']}")
-            continue
-        # print(f"=> ActuIA article URL: {article_url}") # For Debug Only
-        
-        # Check for duplicates using ActuIA article URL
-        if article_url in seen_urls:
-            # print(f"Duplicate article detected with URL {article_url}, skipping.") # For Debug Only
-            continue
-        seen_urls.add(article_url) # Add unique URL to seen URLs
-        
-        # Extract additional information (image URL, author, date)
-        # <img width="150" height="85" class="entry-thumb webpexpress-processed" src="https://my-thumbnailUrl" alt="" title="my_article_title">
-        # <img width="150" height="85" class="entry-thumb" src="https://my-thumbnailUrl" alt="" title="my_article_title"/>
-        image_url = actuia_article_div.find("img", class_="entry-thumb webpexpress-processed")
-        if image_url:
-            image_url = image_url['src']
-        else:
-            image_url = actuia_article_div.find("img", class_="entry-thumb")
-            if image_url:
-                image_url = image_url['src']
-            else:
-                print(f"Could not recognize image URL: {image_url}")
-        # print(f"ActuIA article image URL: {image_url}") # For Debug Only
-        post_author = actuia_article_div.find("span", class_="td-post-author-name")
-        if post_author:
-            post_author = post_author.text.replace("-","").strip()
-        else:
-            print(f"Could not recognize post author: {post_author}")
-        # print(f"ActuIA article author: {post_author}") # For Debug Only
-        post_date = actuia_article_div.find("span", class_="td-post-date")
-        if post_date:
-            post_date = post_date.text.strip()
-        else:
-            print(f"Could not recognize post date: {post_date}")
-        # print(f"ActuIA article date: {post_date}") # For Debug Only
-        
-        # Extract article content
-        response_article = requests.get(article_url)
-        soup_article = BeautifulSoup(response_article.content, "html.parser")
-        # print(f"ActuIA article content: {soup_article}")
-        # Locate the relevant div element
-        # <div class="entry-content">
-        post_content = soup_article.find("div", class_="entry-content")
-        # post_content = html2text.html2text(soup_article.find("div", class_="entry-content"))
-        if not post_content:
-            post_content = soup_article.find("div", class_="tdb-block-inner td-fix-index")
-        if post_content:
-            post_content = post_content.text.strip()
-        else:
-            print(f"Could not recognize post content: {article_url}")
-        
-        # if post_content:
-        #     post_content = post_content.text.strip()
-        # else:
-        #     # <div class="tdb-block-inner td-fix-index">
-        #     post_content = soup_article.find("div", class_="tdb-block-inner td-fix-index")
-        #     if post_content:
-        #         post_content = post_content.text.strip()
-        #     else:
-        #         print(f"Could not recognize post content: {post_content}")
-        # print(f"ActuIA article content: {post_content}")
-        
-        # Add article details to the list 'actuia_articles'
-        actuia_articles.insert(0, {
-            config["key.json.title"]: post_title,
-            config["key.json.author"]: post_author,
-            config["key.json.thumbnail.url"]: image_url,
-            config["key.json.date"]: post_date,
-            config["key.json.link"]: article_url,
-            config["key.json.content"]: post_content
-            })
-        
-    # Return the list of articles from ActuIA website with extracted details
-    return actuia_articles
+    return pull_new_articles(scraper = scrapers["actuia"],
+                             domain_name = domain_name,
+                             listing_url = config["key.json.actuia.url"]+domain_name+"/",
+                             data_file_path = data_file_path)
 
 def process_actuia_daily() -> None:
     """
@@ -405,7 +611,9 @@ def process_actuia_daily() -> None:
             new_items = articles,
             smtp_server_details = domain["smtp.server.details"],
             email_details = email_details,
-            keys_to_ignore = [config["key.json.content"], config["key.json.link"]])
+            keys_to_ignore = [config["key.json.content"], config["key.json.link"]],
+            # Once the articles are processed, keep the domain page's validators for the next run
+            on_processed = partial(listing_http_cache.commit, config["key.json.actuia.url"]+domain["name"]+"/"))
 
 def pull_new_insurance_times_uk_articles(domain_name: str,
                                          domain_link: str,
@@ -413,13 +621,7 @@ def pull_new_insurance_times_uk_articles(domain_name: str,
     """
     Fetches new articles from Insurance Times UK for a specific domain and sends notifications.
 
-    This function performs the following tasks:
-
-    1. Scrapes Insurance Times UK's website for articles related to the provided domain.
-    2. Extracts information from each article, including title, author, thumbnail URL,
-       date, content, and summary (using a large language model).
-    3. Saves the extracted information for new articles to a JSON file.
-    4. Sends an email notification to recipients if new articles are found.
+    The articles are scraped by the generic engine `pull_new_articles`, driven by the Insurance Times UK scraper spec.
 
     **Args:**
         domain_name (str): The name of the domain to be considered when scraping Insurance Times UK articles.
@@ -435,217 +637,10 @@ def pull_new_insurance_times_uk_articles(domain_name: str,
             * `link (str)`: The URL of the article,
             * `content (str)`: The content of the article.
     """
-    # Print information about processing Insurance Times UK articles
-    print(f"Retrieving new articles from Insurance Times UK website for the domain: '{domain_name}'")
-    # Fetch the Insurance Times UK website content for the specified domain
-    # Use headers so that the request is not seen as a robot
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
-    }
-    response = requests.get(domain_link+"/", headers = headers)
-    if response.status_code != 200:
-        print(f"Error: {response.status_code}")
-        response = None
-    
-    soup = BeautifulSoup(response.content, "html.parser")
-    # print(f"HTML page of Insurance Times UK website, domain {domain_name}: {soup.text}")
-    
-    # Initialise the list of articles to store with their paramaters:
-    # - title
-    # - author
-    # - image_url
-    # - date
-    # - link
-    # - content
-    # - summary (filled in later)
-    
-    ## Local variables
-    # Initialize empty list to store article details and sets to track seen articles
-    insurance_times_uk_articles: List[Dict[str, str, str, str, str, str]] = []
-    seen_urls = set() # Set to track already seen Insurance Times UK article URLs
-    # Check if an existing JSON file stores previously processed Insurance Times UK articles
-    # print(f"data_file_path: {data_file_path}") # For Debug Only
-    if os.path.isfile(data_file_path) is True:
-        # Load list of previously processed articles from the JSON file
-        with open(data_file_path) as fp:
-            # Extract and store a set of URLs from previously processed articles
-            seen_urls = extract_node_values(json.load(fp),
-                                            config["key.json.link"]) # Set to track seen Insurance Times UK articles URLs
-        # print(f"Already seen URLs: {', '.join(seen_urls)}") # For Debug Only
-    
-    # Loop through Insurance Times UK articles in reverse order (latest first)
-    # Locate the relevant div elements
-    # Start from the end of the list of articles
-    # Find all div elements with the first class
-    resultset1 = soup.find_all("div", class_="spinLayout thumb onecol left item-first hasPicture")
-    # Find all div elements with the second class
-    resultset2 = soup.find_all("div", class_="spinLayout thumb onecol left item-first item-penultimate hasPicture")
-    # Find all div elements with the third class
-    resultset3 = soup.find_all("div", class_="spinLayout thumb onecol left item-first item-last hasPicture")
-    # Find all div elements with the fourth class
-    resultset4 = soup.find_all("div", class_="spinLayout thumb onecol right item-second item-last hasPicture")
-    # Find all div elements with the fifth class
-    resultset5 = soup.find_all("div", class_="spinLayout thumb onecol right item-second hasPicture")
-    # Find all div elements with the sixth class
-    resultset6 = soup.find_all("div", class_="spinLayout thumb onecol right item-second item-penultimate hasPicture")
-    # Merge the results into a single list
-    my_resultset = resultset1 + resultset2 + resultset3 + resultset4 + resultset5 + resultset6
-    
-    print(f"=> Retrieved {len(my_resultset)} articles in the HTML code for domain {domain_name}")
-    # for current_div_index in range(len(my_resultset))[::-1]:
-    #     insurance_times_uk_article_div = my_resultset[current_div_index]
-    for current_div_index in range(len(my_resultset)): # Reverse loop for latest first
-        # print(f"Length of the list of articles: {len(my_resultset)}") # For Debug Only
-        # print(f"Current index: {len(my_resultset)-1-current_div_index}") # For Debug Only
-        # print(f"Dealing with Insurance Times UK article of index #{len(my_resultset)-1-current_div_index}") # For Debug Only
-        insurance_times_uk_article_div = my_resultset[len(my_resultset)-1-current_div_index]
-        
-        try:
-            # Extract title, URL, and check for duplicates
-            # <a href="https://www.insurancetimes.co.uk/news/intersys-opens-new-london-office/1453257.article">Intersys opens new London office</a>
-            title_tag = insurance_times_uk_article_div.find("a", class_ = "")
-            post_title = ""
-            if title_tag:
-                post_title = title_tag.text.strip()
-            else:
-                print("Title not found for an article in Insurance Times UK")
-                continue
-            # print(f"=> Insurance Times UK article title: {post_title}") # For Debug Only
-            
-            # Extract the paper ID from the link
-            article_url_match = re.search(r"^(https:\/\/www\.insurancetimes\.co\.uk\/.*)$", title_tag["href"])
-            if article_url_match:
-                article_url = article_url_match.group(1)
-            else:
-                print(f"Could not recognize Insurance Times UK URL from link: {title_tag['href']}")
-                continue
-            # print(f"=> Insurance Times UK article URL: {article_url}") # For Debug Only
-            
-            # Check for duplicates using Insurance Times UK article URL
-            if article_url in seen_urls:
-                # print(f"Duplicate article detected with URL {article_url}, skipping.") # For Debug Only
-                continue
-            seen_urls.add(article_url) # Add unique URL to seen URLs
-            
-            # Extract additional information (image URL, author, date)
-            # <img alt="Leadenhall market" class="lazyloaded" loading="lazy" sizes="(max-width: 1179px) 100px, 220px"
-            # src="https://d17mj6xr9uykrr.cloudfront.net/Pictures/100x67/6/9/7/111697_leadenhallmarket_502804.jpg"
-            # srcset="https://d17mj6xr9uykrr.cloudfront.net/Pictures/100x67/6/9/7/111697_leadenhallmarket_502804.jpg 100w,
-            # https://d17mj6xr9uykrr.cloudfront.net/Pictures/220x147/6/9/7/111697_leadenhallmarket_502804.jpg 220w" width="100" height="67" />
-            image_url = insurance_times_uk_article_div.find("img", class_="lazyloaded")
-            if image_url:
-                image_url = image_url['src']
-            else:
-                print(f"Could not recognize image URL: {image_url}")
-                # image_url = insurance_times_uk_article_div.find("img", class_="entry-thumb")
-                # if image_url:
-                #     image_url = image_url['src']
-                # else:
-                #     print(f"Could not recognize image URL: {image_url}")
-            # print(f"=> Insurance Times UK article image URL: {image_url}") # For Debug Only
-            # post_author = insurance_times_uk_article_div.find("a", rel_="author")
-            # if post_author:
-            #     post_author = post_author.text.replace("-","").strip()
-            # else:
-            #     print(f"Could not recognize post author.")
-            post_author = None
-            # Find the span element with class "author"
-            # <span class="author">By <a rel="author" href="https://www.insurancetimes.co.uk/clare-ruel/2216.bio">Clare Ruel</a></span>
-            author_span = insurance_times_uk_article_div.find("span", class_="author")
-            # Extract the text content from the anchor tag within the span
-            if author_span:  # Check if author_span is not None (element found)
-                post_author = author_span.find("a", class_ = "")
-                if post_author:
-                    post_author = post_author.text.strip()
-                else:
-                    # <span class="author">By <span class="noLink">Harry Weeks</span></span>
-                    author_span = insurance_times_uk_article_div.find("span", class_="noLink")
-                    post_author = author_span.text.strip()
-            else:
-                print("Could not recognize post author.")
-            # print(f"=> Insurance Times UK article author: {post_author}") # For Debug Only
-            
-            # Find the span element with class "author"
-            # <span class="date" data-date-timezone="{&quot;publishdate&quot;: &quot;2024-10-07T07:00:00&quot;}">2024-10-07T07:00:00+01:00</span>
-            post_date = insurance_times_uk_article_div.find("span", class_="date")
-            if post_date:
-                post_date = post_date.text.strip()
-            else:
-                print("Could not recognize post date.")
-            # print(f"=> Insurance Times UK article date: {post_date}") # For Debug Only
-            
-            # Extract article content
-            response_article = requests.get(article_url, headers = headers)
-            if response_article.status_code != 200:
-                print(f"Error: {response_article.status_code}")
-                response = None
-            soup_article = BeautifulSoup(response_article.content, "html.parser")
-            # print(f"Insurance Times UK article content: {soup_article}")
-            if not post_author:
-                author_span = soup_article.find("span", class_="author")
-                # Extract the text content from the anchor tag within the span
-                if author_span:  # Check if author_span is not None (element found)
-                    post_author = author_span.find("a", class_ = "")
-                    if post_author:
-                        post_author = post_author.text.strip()
-                    else:
-                        # <span class="author">By <span class="noLink">Harry Weeks</span></span>
-                        author_span = soup_article.find("span", class_="noLink")
-                        post_author = author_span.text.strip()
-                else:
-                    print("Could not recognize post author.")
-                # print(f"=> Insurance Times UK article author: {post_author}") # For Debug Only
-            if not post_date:
-                post_date = soup_article.find("span", class_="date")
-                if post_date:
-                    post_date = post_date.text.strip()
-                else:
-                    print("Could not recognize post date.")
-                # print(f"=> Insurance Times UK article date: {post_date}") # For Debug Only
-            # Locate the relevant div element
-            # <div class="articleContent">
-            post_content_div = soup_article.find("div", class_="articleContent")
-            post_content = None
-            if not post_content_div:
-                print(f"Could not recognize post content for article at URL: {article_url}")
-            else:
-                # Find all paragraphs
-                paragraphs = post_content_div.find_all("p")
-                # for p in paragraphs:
-                #     print(f"{type(p)} 'p' content: {p}")
-                # Extract the text content from the paragraphs
-                post_content = "".join([p.text.strip() for p in paragraphs if p and not p.text.startswith("<p><strong>Read:") and not p.text.startswith("<p><strong>Explore")])
-                # print(f"'p' content: {paragraphs[0]}")
-                # Remove unexpected content
-                # Find all paragraphs that don't start with "<p><strong>Read:&nbsp;<a href="
-                # paragraphs = post_content_div.find_all(
-                #     "p",
-                #     # lambda p: ((p and not isinstance(p, str)) or (p and not p.startswith("<p><strong>Read:") and not p.startswith("<p><strong>Explore")))
-                #     lambda p: p and isinstance(p, str)
-                #     )
-                # Extract the text content from the paragraphs
-                # post_content = "".join([p.text.strip() for p in paragraphs])
-            # print(f"=> Insurance Times UK article content: {post_content}")
-            
-            # Add article details to the list 'insurance_times_uk_articles'
-            insurance_times_uk_articles.insert(0, {
-                config["key.json.title"]: post_title,
-                config["key.json.author"]: post_author,
-                config["key.json.thumbnail.url"]: image_url,
-                config["key.json.date"]: post_date,
-                config["key.json.link"]: article_url,
-                config["key.json.content"]: post_content
-                })
-        
-        except Exception as e:
-            print(f"🚨 An error occurred while processing an article!")
-            print(f"Error details: {e}")
-            # Optional: print the HTML snippet that caused the error to inspect it
-            # print(f"Problematic HTML: {insurance_times_uk_article_div}") 
-            continue # Skip to the next article
-    
-    # Return the list of articles from Insurance Times UK website with extracted details
-    return insurance_times_uk_articles
+    return pull_new_articles(scraper = scrapers["insurance.times.uk"],
+                             domain_name = domain_name,
+                             listing_url = domain_link+"/",
+                             data_file_path = data_file_path)
 
 def process_insurance_times_uk_daily() -> None:
     
@@ -691,7 +686,9 @@ def process_insurance_times_uk_daily() -> None:
             new_items = articles,
             smtp_server_details = domain["smtp.server.details"],
             email_details = email_details,
-            keys_to_ignore = [config["key.json.content"], config["key.json.link"]])
+            keys_to_ignore = [config["key.json.content"], config["key.json.link"]],
+            # Once the articles are processed, keep the domain page's validators for the next run
+            on_processed = partial(listing_http_cache.commit, domain["link"]+"/"))
     
 def extract_article_details_from_websites() -> None:
     """
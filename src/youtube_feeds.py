@@ -0,0 +1,66 @@
+"""
+youtube_feeds.py
+
+Public Atom feeds of the YouTube channels: the latest videos of a channel without authentication nor
+API quota, parsed as a stream into the shape of the uploads playlist items of the YouTube Data API.
+"""
+
+# Standard library imports
+import io
+import xml.etree.ElementTree as ElementTree
+from typing import Dict, List, Union
+
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+# Number of entries of a feed (the latest videos of the channel)
+FEED_MAX_ENTRIES = 15
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+YT = "{http://www.youtube.com/xml/schemas/2015}"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+
+
+def get_feed_url(channel_id: str) -> str:
+    """
+    **Returns:**
+        The URL of the Atom feed of a channel.
+    """
+    return FEED_URL.format(channel_id = channel_id)
+
+
+def parse_channel_feed(content: Union[bytes, str]) -> List[Dict]:
+    """
+    Parses the Atom feed of a channel, entry by entry, releasing each entry once converted.
+
+    **Args:**
+        content (Union[bytes, str]): The feed document.
+
+    **Returns:**
+        The entries as uploads playlist items ({"snippet": {"resourceId": {"videoId"}, "title",
+        "description", "publishedAt", "thumbnails"}}), newest first as in the feed.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is not well-formed.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    playlist_items = []
+    for _, element in ElementTree.iterparse(io.BytesIO(content), events = ("end",)):
+        if element.tag != f"{ATOM}entry":
+            continue
+        video_id = element.findtext(f"{YT}videoId")
+        published_at = element.findtext(f"{ATOM}published")
+        # The API reports the dates in UTC with a "Z" suffix, the feed with "+00:00"
+        if published_at and published_at.endswith("+00:00"):
+            published_at = published_at[:-len("+00:00")] + "Z"
+        playlist_items.append({
+            "snippet": {
+                "resourceId": {"videoId": video_id},
+                "title": element.findtext(f"{ATOM}title"),
+                "description": element.findtext(f"{MEDIA}group/{MEDIA}description"),
+                "publishedAt": published_at,
+                # Same thumbnail as the "default" one of the API (the feed links to the larger "hqdefault" one)
+                "thumbnails": {"default": {"url": f"https://i.ytimg.com/vi/{video_id}/default.jpg"}} if video_id else {}
+            }
+        })
+        element.clear()
+    return playlist_items
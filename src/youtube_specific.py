@@ -6,19 +6,20 @@ youtube_specific.py
 
 # Standard library imports
 import os
-# import time
+import time
+import threading
 from datetime import datetime
-import json
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party imports
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import List, Dict, Callable
 # Import Youtube API libraries
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.service_account import Credentials
+from google.oauth2.credentials import Credentials as UserCredentials
 
 # Local resources imports
 from utils import config
@@ -26,15 +27,71 @@ from utils import config
 from utils import get_value2_on_key2_from_value1_on_key1_in_channels_list
 # from utils import filter_unknown_items
 # from utils import json_to_html
-from utils import extract_node_values
+from utils import item_store
+from utils import http_client
+from utils import listing_http_cache
+from utils import transcript_service
+from utils import get_item_store_source
 # from utils import send_email
 from utils import process_list_of_items
+from youtube_feeds import FEED_MAX_ENTRIES, get_feed_url, parse_channel_feed
+
+# YouTube Data API quota units consumed during the run, per API method
+youtube_quota_usage: Dict[str, int] = {}
+youtube_quota_lock = threading.Lock()
+
+def save_youtube_credentials(creds) -> None:
+    """
+    Saves the user credentials to token.json, so that the next runs load them without user interaction.
+
+    **Args:**
+        creds: The OAuth user credentials.
+    """
+    with open(config["youtube.api.service.token.file"], 'w') as token:
+        token.write(creds.to_json())
+
+def build_youtube_service(creds):
+    """
+    Builds the YouTube API client from the locally cached discovery document, fetching the document
+    only when it is missing or older than the configured max age.
+
+    **Args:**
+        creds: The credentials of the client.
+
+    **Returns:**
+        A YouTube API client instance.
+    """
+    discovery_cache_file = config["youtube.api.discovery.cache.file"]
+    max_age_seconds = config["youtube.api.discovery.cache.max.age.days"] * 24 * 3600
+    if not os.path.isfile(discovery_cache_file) or time.time() - os.path.getmtime(discovery_cache_file) > max_age_seconds:
+        discovery_url = (f"https://www.googleapis.com/discovery/v1/apis/{config["youtube.api.service.name"]}/"
+                         f"{config["youtube.api.service.version"]}/rest")
+        try:
+            response = http_client.get(discovery_url)
+            response.raise_for_status()
+            os.makedirs(os.path.dirname(discovery_cache_file) or ".", exist_ok=True)
+            tmp_path = f"{discovery_cache_file}.tmp"
+            with open(tmp_path, 'w') as fp:
+                fp.write(response.text)
+            os.replace(tmp_path, discovery_cache_file)
+        except Exception as e:
+            print(f"Could not refresh the YouTube API discovery document: {e}")
+
+    if os.path.isfile(discovery_cache_file):
+        with open(discovery_cache_file) as fp:
+            return build_from_document(fp.read(), credentials=creds)
+    # No local discovery document at all, let the client library retrieve it
+    return build(config["youtube.api.service.name"],
+                 config["youtube.api.service.version"],
+                 credentials=creds)
 
 def get_youtube_client():
     """
     Retrieves a YouTube Data API client instance.
 
-    This function handles authentication and token management.
+    This function handles authentication and token management: the user credentials cached in token.json
+    are loaded and refreshed without user interaction, the OAuth flow only runs when no usable credentials
+    exist.
 
     Returns:
         A YouTube API client instance.
@@ -45,17 +102,18 @@ def get_youtube_client():
     if os.path.exists(config["youtube.api.service.token.file"]):
         try:
             print("Try to get the Youtube service credentials from the Youtube API credentials file, token.json.") # For Debug Only
-            flow = InstalledAppFlow.from_client_secrets_file(
-                config["youtube.api.service.credentials.file"],
+            creds = UserCredentials.from_authorized_user_file(
+                config["youtube.api.service.token.file"],
                 config["youtube.api.service.scopes"])
-            # Load token from file
-            creds = flow.run_local_server(port=0)  # This will open a browser window for authentication
-            # Save the credentials for the next run
-            with open(config["youtube.api.service.token.file"], 'w') as token:
-                token.write(creds.to_json())
+            if not creds.valid and creds.refresh_token:
+                print("Credentials have expired, must refresh them.") # For Debug Only
+                creds.refresh(Request())
+                # Save the refreshed credentials for the next run
+                save_youtube_credentials(creds)
             print(f"Successfully loaded credentials from the Youtube API credentials file, token.json.")
         except Exception as e:
             print(f"Error loading Youtube service credentials from the Youtube API credentials file: {e}")
+            creds = None
     
     # Handle the case where credentials are invalid or missing, try using service account json file if exists.
     if not creds or not creds.valid:
@@ -69,64 +127,266 @@ def get_youtube_client():
                     scopes=config["youtube.api.service.scopes"])
             except Exception as e:
                 print(f"Error loading service account credentials: {e}")
+                creds = None
     
     # Handle the case where credentials are invalid or missing, let the user log in.
     if not creds or not creds.valid:
-        print("Credentials are invalid or missing.") # For Debug Only
-        if creds and creds.expired and creds.refresh_token:
-            print("Credentials have expired, must refresh them.") # For Debug Only
-            creds.refresh(Request())
-        else:
-            print("Load flow fromclient secrets file.") # For Debug Only
-            flow = InstalledAppFlow.from_client_secrets_file(
-                config["youtube.api.service.credentials.file"],
-                config["youtube.api.service.scopes"])
-            creds = flow.run_local_server(port=0)
-        
+        print("Credentials are invalid or missing, load flow from client secrets file.") # For Debug Only
+        flow = InstalledAppFlow.from_client_secrets_file(
+            config["youtube.api.service.credentials.file"],
+            config["youtube.api.service.scopes"])
+        creds = flow.run_local_server(port=0)  # This will open a browser window for authentication
         # Save the credentials for the next run
-        with open(config["youtube.api.service.token.file"], 'w') as token:
-            token.write(creds.to_json())
+        save_youtube_credentials(creds)
     # Proceed with using the YouTube API
     else:
         print("Credentials are valid!")
         
     # Create a YouTube API client instance using the obtained credentials
-    youtube = build(config["youtube.api.service.name"],
-                    config["youtube.api.service.version"],
-                    credentials=creds)
+    return build_youtube_service(creds)
 
-    return youtube
-
-def extract_youtube_transcript(video_id:str) -> str:
+class LazyYoutubeClient:
+    """
+    YouTube API client authenticated (OAuth flow, discovery document) on its first use only, so that
+    a run whose channels are all served by their feeds never builds it.
     """
-    Extracts the transcript from a YouTube video using web scraping.
 
-    Args:
-        video_id (str): The ID of the YouTube video.
+    def __init__(self) -> None:
+        self.client = None
+        self.lock = threading.Lock()
 
-    Returns:
-        str: The extracted transcript, or None if no transcript is found.
+    def __getattr__(self, name: str):
+        if self.client is None:
+            with self.lock:
+                if self.client is None:
+                    self.client = get_youtube_client()
+        return getattr(self.client, name)
+
+def record_youtube_quota(method: str, calls: int = 1) -> None:
     """
+    Records the quota units consumed by calls to a YouTube Data API method.
 
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    response = requests.get(url)
-    response.raise_for_status()  # Raise an exception for bad status codes
+    **Args:**
+        method (str): The API method (e.g. "playlistItems.list").
+        calls (int): The number of calls made to the method.
+    """
+    with youtube_quota_lock:
+        youtube_quota_usage[method] = youtube_quota_usage.get(method, 0) + calls * config["youtube.api.quota.costs"].get(method, 1)
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+def get_uploads_playlist_id(youtube_service, channel_id: str) -> str:
+    """
+    Retrieves the ID of the "uploads" playlist of a channel. The ID never changes, so it is
+    persisted in the item store and the YouTube API is only called the first time.
 
-    # Find the transcript element (this may vary depending on YouTube's HTML structure)
-    transcript_element = soup.find('div', class_='ytp-transcript-text')
+    **Args:**
+        youtube_service: A YouTube API client instance.
+        channel_id (str): The ID of the channel.
 
-    if transcript_element:
-        transcript = transcript_element.get_text(separator='\n')
-        return transcript
-    else:
+    **Returns:**
+        The ID of the uploads playlist, or None if the channel doesn't exist.
+    """
+    state_key = f"youtube.uploads.playlist.id.{channel_id}"
+    uploads_playlist_id = item_store.get_state(state_key)
+    if uploads_playlist_id:
+        return uploads_playlist_id
+
+    channel_response = youtube_service.channels().list(
+        part = "contentDetails",
+        id = channel_id
+    ).execute()
+    record_youtube_quota("channels.list")
+    if not channel_response or not channel_response.get("items"):
         return None
+    uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+    item_store.set_state(state_key, uploads_playlist_id)
+    return uploads_playlist_id
+
+def get_high_water_mark(channel_id: str) -> Dict:
+    """
+    **Args:**
+        channel_id (str): The ID of the channel.
+
+    **Returns:**
+        The newest video of the channel already processed ({"publishedAt", "videoId"}), or None if unknown yet.
+    """
+    return item_store.get_state(f"youtube.high.water.mark.{channel_id}")
+
+def advance_high_water_mark(channel_id: str, published_at: str, video_id: str) -> None:
+    """
+    Records the newest video of a channel processed so far, unless a newer one is already recorded.
+    To be called once the videos up to this one are stored, so that none is skipped after a failure.
+
+    **Args:**
+        channel_id (str): The ID of the channel.
+        published_at (str): The publication date of the video (ISO 8601, as returned by the YouTube API).
+        video_id (str): The ID of the video.
+    """
+    high_water_mark = get_high_water_mark(channel_id)
+    if published_at and (not high_water_mark or published_at >= high_water_mark["publishedAt"]):
+        item_store.set_state(f"youtube.high.water.mark.{channel_id}",
+                             {"publishedAt": published_at, "videoId": video_id})
+
+def get_first_page_size(channel_id: str) -> int:
+    """
+    **Returns:**
+        The size of the first uploads playlist page of a channel: small once its high-water mark is known,
+        as a channel usually has no or few new videos since the previous run.
+    """
+    if get_high_water_mark(channel_id):
+        return config["youtube.api.playlist.first.page.size"]
+    return config["youtube.api.playlist.page.size"]
+
+def is_before_high_water_mark(playlist_item: Dict, high_water_mark: Dict) -> bool:
+    """
+    **Returns:**
+        True if the playlist item is the video of the high-water mark, or an older one.
+    """
+    if playlist_item["snippet"]["resourceId"].get("videoId") == high_water_mark["videoId"]:
+        return True
+    published_at = playlist_item["snippet"].get("publishedAt")
+    return bool(published_at) and published_at < high_water_mark["publishedAt"]
+
+def resolve_uploads_playlist_ids(youtube_service, channel_ids: List[str]) -> Dict[str, str]:
+    """
+    Retrieves the uploads playlist IDs of many channels, resolving the ones not persisted yet
+    with a single `channels().list` call per chunk of comma-separated channel IDs.
+
+    **Args:**
+        youtube_service: A YouTube API client instance.
+        channel_ids (List[str]): The IDs of the channels.
+
+    **Returns:**
+        A dictionary channel ID -> uploads playlist ID (channels that don't exist are missing).
+    """
+    uploads_playlist_ids = {}
+    unresolved_channel_ids = []
+    for channel_id in dict.fromkeys(channel_ids):
+        uploads_playlist_id = item_store.get_state(f"youtube.uploads.playlist.id.{channel_id}")
+        if uploads_playlist_id:
+            uploads_playlist_ids[channel_id] = uploads_playlist_id
+        else:
+            unresolved_channel_ids.append(channel_id)
+
+    batch_size = config["youtube.api.batch.max.size"]
+    for start in range(0, len(unresolved_channel_ids), batch_size):
+        channel_response = youtube_service.channels().list(
+            part = "contentDetails",
+            id = ",".join(unresolved_channel_ids[start:start + batch_size]),
+            maxResults = batch_size
+        ).execute()
+        record_youtube_quota("channels.list")
+        for channel in channel_response.get("items", []):
+            uploads_playlist_ids[channel["id"]] = channel['contentDetails']['relatedPlaylists']['uploads']
+            item_store.set_state(f"youtube.uploads.playlist.id.{channel['id']}",
+                                 uploads_playlist_ids[channel["id"]])
+    return uploads_playlist_ids
+
+def fetch_uploads_playlists_in_batch(youtube_service, uploads_playlist_ids: Dict[str, str]) -> Dict[str, Dict]:
+    """
+    Downloads the first (latest) page of the uploads playlist of many channels, sending the
+    `playlistItems().list` calls through batch HTTP requests.
+
+    **Args:**
+        youtube_service: A YouTube API client instance.
+        uploads_playlist_ids (Dict[str, str]): A dictionary channel ID -> uploads playlist ID.
+
+    **Returns:**
+        A dictionary channel ID -> playlist response (channels whose call failed are missing).
+    """
+    playlist_responses = {}
+
+    def on_response(request_id: str, response: Dict, exception: Exception) -> None:
+        if exception is not None:
+            print(f"Failed to download the list of video from channel {request_id}")
+            print(f"With error {exception}")
+        else:
+            playlist_responses[request_id] = response
+
+    channel_ids = list(uploads_playlist_ids)
+    batch_size = config["youtube.api.batch.max.size"]
+    for start in range(0, len(channel_ids), batch_size):
+        batch = youtube_service.new_batch_http_request(callback = on_response)
+        for channel_id in channel_ids[start:start + batch_size]:
+            batch.add(youtube_service.playlistItems().list(
+                          playlistId = uploads_playlist_ids[channel_id],
+                          part = "snippet,contentDetails",
+                          maxResults = get_first_page_size(channel_id)),
+                      request_id = channel_id)
+        batch.execute()
+        record_youtube_quota("playlistItems.list", len(channel_ids[start:start + batch_size]))
+    return playlist_responses
+
+def get_channel_data_file_path(channel: Dict) -> str:
+    """
+    **Returns:**
+        The path of the json data file of a channel's videos.
+    """
+    return os.path.join(config["json.key.data.dir"], f"EVER_{channel["name"].replace(' ', '_')}_videos.json")
+
+def is_feed_sufficient(channel_id: str, data_file_path: str, playlist_items: List[Dict]) -> bool:
+    """
+    Tells whether the latest videos listed by the feed of a channel include all its new videos, i.e. whether
+    the feed reaches back to the channel's high-water mark (or to a video already known).
+
+    **Args:**
+        channel_id (str): The ID of the channel.
+        data_file_path (str): Path including the file name for json data file.
+        playlist_items (List[Dict]): The entries of the feed, as uploads playlist items.
+
+    **Returns:**
+        True if the feed is enough, False if the uploads playlist must be listed through the API.
+    """
+    # A feed shorter than its maximum length lists all the videos of the channel
+    if len(playlist_items) < FEED_MAX_ENTRIES:
+        return True
+    high_water_mark = get_high_water_mark(channel_id)
+    if high_water_mark:
+        return any(is_before_high_water_mark(playlist_item, high_water_mark) for playlist_item in playlist_items)
+    store_source = get_item_store_source(data_file_path = data_file_path,
+                                         key_field = config["key.json.id"])
+    return any(item_store.is_known(store_source, playlist_item["snippet"]["resourceId"].get("videoId"))
+               for playlist_item in playlist_items)
+
+def fetch_channel_feeds(channels: List[Dict]) -> Dict[str, Dict]:
+    """
+    Downloads concurrently the Atom feeds of channels, with conditional GET requests.
+
+    **Args:**
+        channels (List[Dict]): The channels (as configured in "youtube.api.list.channels").
+
+    **Returns:**
+        A dictionary channel ID -> {"url": feed URL, "unchanged": True if the feed is unchanged since the last run,
+        "playlist_response": the feed as a playlist page, or None if it doesn't reach back to the last seen video}.
+        The channels whose feed could not be downloaded are missing.
+    """
+    def fetch_channel_feed(channel: Dict) -> Dict:
+        feed_url = get_feed_url(channel["id"])
+        try:
+            response, unchanged = http_client.get_conditional(feed_url, listing_http_cache)
+            if unchanged:
+                return {"url": feed_url, "unchanged": True, "playlist_response": None}
+            response.raise_for_status()
+            playlist_items = parse_channel_feed(response.content)
+        except Exception as e:
+            print(f"Failed to read the feed of Youtube channel {channel['name']}, falling back to the API: {e}")
+            return None
+        if not is_feed_sufficient(channel_id = channel["id"],
+                                  data_file_path = get_channel_data_file_path(channel),
+                                  playlist_items = playlist_items):
+            print(f"The feed of Youtube channel {channel['name']} doesn't reach back to its last seen video, falling back to the API")
+            return {"url": feed_url, "unchanged": False, "playlist_response": None}
+        return {"url": feed_url, "unchanged": False, "playlist_response": {"items": playlist_items}}
+
+    with ThreadPoolExecutor(max_workers = config["http.client.max.workers"]) as executor:
+        feed_results = dict(zip([channel["id"] for channel in channels],
+                                executor.map(fetch_channel_feed, channels)))
+    return {channel_id: feed_result for channel_id, feed_result in feed_results.items() if feed_result is not None}
 
 def pull_new_videos_from_channel(youtube_service: str,
                                  channel_id: str,
                                  channel_name: str,
-                                 data_file_path: str) -> List[Dict]:
+                                 data_file_path: str,
+                                 playlist_response: Dict = None) -> List[Dict]:
     """
     
     **Args:**
@@ -134,6 +394,10 @@ def pull_new_videos_from_channel(youtube_service: str,
         channel_id (str): The ID of the channel to retrieve videos from.
         channel_name (str): The name of the Youtube channel.
         data_file_path (str): Path including the file name for json data file.
+        playlist_response (Dict): The first uploads playlist page already downloaded in batch mode, if any.
+        
+    The playlist pages are downloaded, newest videos first, until the channel's high-water mark is reached,
+    so that no video is missed after a downtime. Without high-water mark, only the first page is downloaded.
         
     **Returns:**
         A list of dictionaries. Each dictionary is a video that contains the following attributes:
@@ -166,27 +430,7 @@ def pull_new_videos_from_channel(youtube_service: str,
     #     print(f"Description: {description}")
     #     print(f"Published at: {publish_date}\n")
     
-    # First, get the channel's "uploads" playlist ID
-    try:
-        channel_response = youtube_service.channels().list(
-            part = "contentDetails",
-            id = channel_id
-        ).execute()
-    
-    except Exception as e:
-        print(f"🚨 An error occurred while processing an article!")
-        print(f"Error details: {e}")
-        # Optional: print the HTML snippet that caused the error to inspect it
-        # print(f"Problematic HTML: {insurance_times_uk_article_div}") 
-        return # Skip to the next article
-
-    if channel_response and "items" in channel_response:
-        uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-    else:
-        return
-    
     # Initialize local variables
-    playlist_response = None
     # channel_videos: A list of dictionaries, each representing a video with the following details to store:
     #         - channelName: The name of the Youtube channel where the video was published.
     #         - title: The video's title.
@@ -198,47 +442,83 @@ def pull_new_videos_from_channel(youtube_service: str,
     #         - transcript: The video's transcript (if available).
     #         - summary: The video's summary (if available).
     channel_videos: List[Dict[str, str, str, str, str, str, str, str, str]] = []
-    seen_video_ids = set() # Set to track previously seen Youtube channel's videos IDs
+    seen_video_ids = set() # Set to track Youtube channel's videos IDs already seen in this playlist page
     # original_known_ids = set() # Track originally known video IDs for comparison
     # length_seen_video_ids = 0 # Set to compare the new videos with the already known
     
-    # Check if an existing json data file exists and load previously seen videos (if any)
-    # print(f"data_file_path: {data_file_path}") # For Debug Only
-    if os.path.isfile(data_file_path) is True:
-        # Read JSON file and load the list of videos already treated
-        with open(data_file_path) as fp:
-            # Extract the list of IDs for the videos already treated
-            seen_video_ids = extract_node_values(json.load(fp), config["key.json.id"]) # Set to track seen videos IDs
-        # print(f"Already seen IDs: {', '.join(seen_ids)}") # For Debug Only
-        # original_known_ids = seen_video_ids.copy()
-        # print(f"Already known IDs: {', '.join(original_known_ids)}") # For Debug Only
-        # Calculate the number of videos already treated
-        # length_seen_video_ids = len(seen_video_ids)
-        # Print the list of IDs for the videos already treated
-        # print(f"List of videos already treated: {seen_ids}") # For Debug Only
+    # Retrieve the item store source of the videos already treated (identified by their ID)
+    store_source = get_item_store_source(data_file_path = data_file_path,
+                                         key_field = config["key.json.id"])
     
-    # Download the list of videos from the channel's "uploads" playlist
-    try:
+    # Unless already downloaded in batch mode, download the first page of the channel's "uploads" playlist
+    uploads_playlist_id = None
+    if playlist_response is None:
+        # First, get the channel's "uploads" playlist ID
+        try:
+            uploads_playlist_id = get_uploads_playlist_id(youtube_service = youtube_service,
+                                                          channel_id = channel_id)
+    
+        except Exception as e:
+            print(f"🚨 An error occurred while processing an article!")
+            print(f"Error details: {e}")
+            # Optional: print the HTML snippet that caused the error to inspect it
+            # print(f"Problematic HTML: {insurance_times_uk_article_div}") 
+            return # Skip to the next article
+
+        if not uploads_playlist_id:
+            return
+    
+        # Download the list of videos from the channel's "uploads" playlist
+        try:
+            playlist_response = youtube_service.playlistItems().list(
+                playlistId = uploads_playlist_id,
+                part = "snippet,contentDetails",
+                maxResults = get_first_page_size(channel_id)
+            ).execute()
+            record_youtube_quota("playlistItems.list")
+        except Exception as e:
+            print(f"Failed to download the list of video from channel {channel_name}")
+            print(f"With error {e}")
+            raise(e)
+    
+    # Walk the playlist pages (newest videos first) back to the high-water mark
+    high_water_mark = get_high_water_mark(channel_id)
+    playlist_items = []
+    pages = 1
+    while True:
+        reached_high_water_mark = False
+        for playlist_item in playlist_response.get('items', []):
+            if high_water_mark and is_before_high_water_mark(playlist_item, high_water_mark):
+                reached_high_water_mark = True
+                break
+            playlist_items.append(playlist_item)
+        if reached_high_water_mark or not high_water_mark or not playlist_response.get("nextPageToken"):
+            break
+        if pages >= config["youtube.api.playlist.max.pages"]:
+            print(f"Stopped listing the videos of channel {channel_name} after {pages} pages, before its last seen video")
+            break
+        if uploads_playlist_id is None:
+            uploads_playlist_id = get_uploads_playlist_id(youtube_service = youtube_service,
+                                                          channel_id = channel_id)
         playlist_response = youtube_service.playlistItems().list(
             playlistId = uploads_playlist_id,
             part = "snippet,contentDetails",
-            maxResults = 50
+            maxResults = config["youtube.api.playlist.page.size"],
+            pageToken = playlist_response["nextPageToken"]
         ).execute()
-    except Exception as e:
-        print(f"Failed to download the list of video from channel {channel_name}")
-        print(f"With error {e}")
-        raise(e)
+        record_youtube_quota("playlistItems.list")
+        pages += 1
     
     # Process videos in reverse order (latest first)
     # iter_video = 1 # For Debug Only
     # Start from the end of the list of videos
-    # for current_video_index in range(len(playlist_response['items']) - 1, -1, -1):
-    #     curr_video = playlist_response['items'][current_video_index]
-    for current_video_index in range(len(playlist_response['items'])):
-        # print(f"Length of the list of videos: {len(playlist_response['items'])}") # For Debug Only
-        # print(f"Current index: {len(playlist_response['items'])-1-current_div_index}") # For Debug Only
-        # print(f"Dealing with video of index #{len(playlist_response['items'])-1-current_div_index}") # For Debug Only
-        curr_video = playlist_response['items'][len(playlist_response['items'])-1-current_video_index]
+    # for current_video_index in range(len(playlist_items) - 1, -1, -1):
+    #     curr_video = playlist_items[current_video_index]
+    for current_video_index in range(len(playlist_items)):
+        # print(f"Length of the list of videos: {len(playlist_items)}") # For Debug Only
+        # print(f"Current index: {len(playlist_items)-1-current_div_index}") # For Debug Only
+        # print(f"Dealing with video of index #{len(playlist_items)-1-current_div_index}") # For Debug Only
+        curr_video = playlist_items[len(playlist_items)-1-current_video_index]
         
         # Extract video ID and URL
         video_id = curr_video["snippet"]["resourceId"].get("videoId")
@@ -259,7 +539,7 @@ def pull_new_videos_from_channel(youtube_service: str,
         # print(f"=> Video URL: {video_url}") # For Debug Only
         
         # Skip duplicates based on video ID
-        if video_id in seen_video_ids:
+        if video_id in seen_video_ids or item_store.is_known(store_source, video_id):
             # print(f"Duplicate video detected with ID {video_id}, skipping.") # For Debug Only
             continue
         seen_video_ids.add(video_id) # Add ID to set of seen IDs
@@ -293,21 +573,17 @@ def pull_new_videos_from_channel(youtube_service: str,
             config["key.json.link"]: video_url
         }
         
-        # Try to get the transcript
-        try:
-            # DOESN'T WORK AS THE TRANSCRIPT IS NOT POPULATED THROUGH THE YOUTUBE API
-            # transcript_response = youtube_service.captions().list(
-            #     videoId=video['id'],
-            #     part='snippet').execute()
-            # 
-            # if transcript_response['items']:
-            #     video[config["key.json.transcript"]] = transcript_response['items'][0]['snippet']['text']
-            # else:
-            #     video[config["key.json.transcript"]] = None  # Indicate that no transcript is available
-            video[config["key.json.transcript"]] = extract_youtube_transcript(video['id'])
-        except Exception as e:
-            print(f"Error getting transcript for video {video['id']}: {e}")
-            video[config["key.json.transcript"]] = None
+        # The transcript is fetched in the background by the transcript service (see process_videos_from_channel)
+        # DOESN'T WORK AS THE TRANSCRIPT IS NOT POPULATED THROUGH THE YOUTUBE API
+        # transcript_response = youtube_service.captions().list(
+        #     videoId=video['id'],
+        #     part='snippet').execute()
+        # 
+        # if transcript_response['items']:
+        #     video[config["key.json.transcript"]] = transcript_response['items'][0]['snippet']['text']
+        # else:
+        #     video[config["key.json.transcript"]] = None  # Indicate that no transcript is available
+        video[config["key.json.transcript"]] = None
         
         # Add the current video details to the output list of videos information
         channel_videos.insert(0, video)
@@ -316,6 +592,13 @@ def pull_new_videos_from_channel(youtube_service: str,
         #     break # For Debug Only
         # iter_video += 1 # For Debug Only
         
+    # Without new video, nothing is pending: the newest listed video becomes the high-water mark right away
+    # (otherwise it is advanced once the new videos are processed, see process_videos_from_channel)
+    if not channel_videos and playlist_items:
+        advance_high_water_mark(channel_id = channel_id,
+                                published_at = playlist_items[0]["snippet"].get("publishedAt"),
+                                video_id = playlist_items[0]["snippet"]["resourceId"].get("videoId"))
+    
     # Returns the built list of videos (dictionaries)
     return channel_videos
     
@@ -329,7 +612,9 @@ def process_videos_from_channel(youtube_service: str,
                                 # smtp_server: str,
                                 # smtp_port: str,
                                 data_file_path: str,
-                                summarize_it: bool = True) -> None:
+                                summarize_it: bool = True,
+                                playlist_response: Dict = None,
+                                on_processed: Callable = None) -> None:
     """
     Retrieves and processes a list of videos from a YouTube channel.
 
@@ -344,6 +629,8 @@ def process_videos_from_channel(youtube_service: str,
         smtp_server_details (Dict): Details of the SMTP server in order to send email notification.
         data_file_path (str): Path including the file name for json data file.
         summarize_it (bool): Whether the summarizing function leveragin GenAI must be called or not.
+        playlist_response (Dict): The uploads playlist page already downloaded in batch mode (or read from the channel's feed), if any.
+        on_processed (Callable): A function called without argument once the new videos are stored and notified.
     """
     
     # Retrieve Youtube channel's videos
@@ -352,7 +639,8 @@ def process_videos_from_channel(youtube_service: str,
             youtube_service = youtube_service,
             channel_id = channel_id,
             channel_name = channel_name,
-            data_file_path = data_file_path)
+            data_file_path = data_file_path,
+            playlist_response = playlist_response)
     
     except Exception as e:
         print(f"🚨 An error occurred while processing an article!")
@@ -362,6 +650,9 @@ def process_videos_from_channel(youtube_service: str,
         return # Skip to the next article
     
     if channel_videos:
+        # Only the summarized videos need their transcript: start fetching them while the channel loop goes on
+        if summarize_it:
+            transcript_service.prefetch([video[config["key.json.id"]] for video in channel_videos])
         print(f"""
         {datetime.now().strftime("%Y-%m-%d")} - {len(channel_videos)} new videos for Youtube channel '{channel_name}':""") # For Debug Only
         print(f"""{''.join(f"""
@@ -369,6 +660,8 @@ def process_videos_from_channel(youtube_service: str,
                Title: {curr_video[config['key.json.title']]}""" for curr_video in channel_videos)}""") # For Debug Only
     else:
         print(f"Channel '{channel_name}' has no video or doesn't exist. Please verify its id ('{channel_id}')")
+        if on_processed:
+            on_processed()
         return
     
     # Create email subject
@@ -389,6 +682,14 @@ def process_videos_from_channel(youtube_service: str,
                       config["key.json.transcript"],
                       config["key.json.link"]]
     
+    def on_videos_processed() -> None:
+        # Once the new videos are stored, the next run only lists the videos published after the newest one
+        advance_high_water_mark(channel_id = channel_id,
+                                published_at = channel_videos[0][config["key.json.date"]],
+                                video_id = channel_videos[0][config["key.json.id"]])
+        if on_processed:
+            on_processed()
+    
     process_list_of_items(source_name = f"{config["key.json.youtube.source.name"]} - {channel_name}",
                           source_format = config["key.json.source.format.youtube.video"],
                           data_file_path = data_file_path,
@@ -397,7 +698,8 @@ def process_videos_from_channel(youtube_service: str,
                           smtp_server_details = smtp_server_details,
                           email_details = email_details,
                           keys_to_ignore = keys_to_ignore,
-                          summarize_it = summarize_it)
+                          summarize_it = summarize_it,
+                          on_processed = on_videos_processed)
 
 def extract_video_details_from_youtube_channels() -> None:
     """
@@ -410,14 +712,45 @@ def extract_video_details_from_youtube_channels() -> None:
     # Extract Youtube videos for a list of channels
     list_youtube_channels = config["youtube.api.list.channels"]
     
-    # Retrieve Youtube authenticated service
-    youtube_service = get_youtube_client()
+    # Retrieve Youtube authenticated service, built on first use only
+    youtube_service = LazyYoutubeClient()
+    
+    # Read the feeds of the channels without summary: the API is only needed when a feed is not enough
+    feed_results = {}
+    if config["youtube.feeds.enabled"]:
+        feed_results = fetch_channel_feeds([channel for channel in list_youtube_channels if not channel["summarize.it"]])
+    api_channels = [channel for channel in list_youtube_channels
+                    if channel["id"] not in feed_results
+                    or (not feed_results[channel["id"]]["unchanged"] and feed_results[channel["id"]]["playlist_response"] is None)]
+    print(f"=> Youtube channels: {len(feed_results)} read from their feed "
+          f"({sum(feed_result['unchanged'] for feed_result in feed_results.values())} unchanged), {len(api_channels)} through the API")
+    
+    # In batch mode, download the uploads playlists of all the channels in a few round-trips
+    playlist_responses = {}
+    if config["youtube.api.batch.mode"] and api_channels:
+        try:
+            uploads_playlist_ids = resolve_uploads_playlist_ids(
+                youtube_service = youtube_service,
+                channel_ids = [channel["id"] for channel in api_channels])
+            playlist_responses = fetch_uploads_playlists_in_batch(
+                youtube_service = youtube_service,
+                uploads_playlist_ids = uploads_playlist_ids)
+        except Exception as e:
+            print(f"Batched download of the Youtube playlists failed, falling back to one channel at a time: {e}")
     # iter_channel = 1 # For Debug Only
     for channel in list_youtube_channels:
         # Skip this channel for debugging (uncomment for testing specific channel)
         # if channel["name"] != "your_channel_name":
         #     continue
         # break # For Debug Only
+        feed_result = feed_results.get(channel["id"])
+        if feed_result and feed_result["unchanged"]:
+            print(f"=> Feed of Youtube channel {channel["name"]} unchanged since the last run, skipped")
+            continue
+        if feed_result and feed_result["playlist_response"]:
+            playlist_response = feed_result["playlist_response"]
+        else:
+            playlist_response = playlist_responses.get(channel["id"])
         print(f"Looking at Youtube channel {channel["name"]}")
         process_videos_from_channel(
             youtube_service = youtube_service,
@@ -430,10 +763,15 @@ def extract_video_details_from_youtube_channels() -> None:
             # smtp_server = channel["smtp.server"],
             # smtp_port = channel["smtp.port"],
             # Data file path for storing video information
-            data_file_path = os.path.join(config["json.key.data.dir"],
-                                          f"EVER_{channel["name"].replace(' ', '_')}_videos.json"),
-            summarize_it = channel["summarize.it"]
+            data_file_path = get_channel_data_file_path(channel),
+            summarize_it = channel["summarize.it"],
+            playlist_response = playlist_response,
+            # The feed's validators are committed once its new videos are processed
+            on_processed = partial(listing_http_cache.commit, feed_result["url"]) if feed_result else None
         )
         # if iter_channel > 2: # For Debug Only
         #     break # For Debug Only
         # iter_channel += 1 # For Debug Only
+    
+    print(f"=> Youtube Data API quota: {sum(youtube_quota_usage.values())} units "
+          f"({', '.join(f'{method}: {units}' for method, units in sorted(youtube_quota_usage.items()))})")